@@ -1,7 +1,38 @@
+import numpy as np
 from vispy import scene
-from vispy.io import imread
-from vispy.gloo import clear as gloo_clear, Texture2D
+from vispy.gloo import clear as gloo_clear, gl, Texture2D
 from vispy.scene import Widget, Node
+from vispy.visuals.filters import TextureFilter
+from ars_3d_engine.logic.texture_cache import texture_cache
+
+
+class Mipmaps(Node):
+    """Drawn right after the background quad: builds the mipmaps of its texture and
+    switches it to linear_mipmap_linear minification, so a large image fitted into
+    the viewport doesn't shimmer. gloo only knows nearest/linear filtering, so this
+    is GL on the texture object gloo created. Set `texture` again after new data."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.texture = None  # Texture2D whose mipmaps are out of date
+
+    def draw(self):
+        if self.texture is None:
+            return
+        context = self.canvas.context
+        context.flush_commands()
+        glir_texture = context.shared.parser.get_object(self.texture.id)
+        if glir_texture is None:
+            return  # not on the GPU yet, try again on the next frame
+        self.texture = None
+        try:
+            glir_texture.activate()
+            gl.glGenerateMipmap(gl.GL_TEXTURE_2D)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR_MIPMAP_LINEAR)
+            glir_texture.deactivate()
+            self.canvas.update()  # the mipmaps are used from the next frame on
+        except Exception as e:
+            print(f"Background mipmaps unavailable: {e}")
 
 
 class Background(Widget):
@@ -11,6 +42,10 @@ class Background(Widget):
         self._last = None
         self.bg_view = None
         self.bg_image = None
+        self._texture_key = None  # texture cache entry shown (file-backed images)
+        self._own_texture = None  # texture of in-memory images (previews), reused when the size matches
+        self._shown = None  # texture of bg_image
+        self._mipmaps = None
         super().__init__(*args, **kwargs)
         self.order = float("-inf")
         self._last = self.ClearDepth(parent=self)
@@ -19,47 +54,68 @@ class Background(Widget):
         
         # Background view and camera
         self.bg_view = self.add_view(camera=scene.cameras.PanZoomCamera())
+        self._mipmaps = Mipmaps(parent=self.bg_view.scene)
+        self._mipmaps.order = 1  # after the quad
         
         # Load image only if image_path is provided
         if image_path:
-            image_data = imread(image_path)[::-1, :, :]  # Flip vertically to correct orientation
-            texture_format = 'rgba' if image_data.shape[-1] == 4 else 'rgb'
-            texture = Texture2D(image_data, format=texture_format, wrapping='clamp_to_edge', interpolation='linear')
-            texture.min_filter = 'linear_mipmap_linear'
-            texture.mag_filter = 'linear'
-            self.bg_image = scene.visuals.Image(data=image_data, texture=texture, parent=self.bg_view.scene)
-            self._adjust_camera(image_data)
+            self.set_image(image_path)
     
     @property
     def children(self):
         return super().children + [self._last] if self._last is not None else super().children
     
     def set_image(self, image_path):
-        # Load new image data
+        # The GPU texture comes from the texture cache, shared with objects showing the same file
         try:
-            image_data = imread(image_path)[::-1, :, :]  # Flip vertically to correct orientation
+            key, texture = texture_cache().acquire(image_path)
         except Exception as e:
             print(f"Error loading image {image_path}: {e}")
             return
-        
-        # Determine texture format based on number of channels
-        texture_format = 'rgba' if image_data.shape[-1] == 4 else 'rgb'
-        # Create a new texture
-        texture = Texture2D(image_data, format=texture_format, wrapping='clamp_to_edge', interpolation='linear')
-        texture.min_filter = 'linear_mipmap_linear'
-        texture.mag_filter = 'linear'
+        self._show(texture)
+        self._texture_key = key
+
+    def set_image_data(self, image_data):
+        """Show an already decoded image (rows top-down, as read from disk)."""
+        image_data = np.ascontiguousarray(image_data[::-1])  # Flip vertically to correct orientation
+        if image_data.ndim == 2: image_data = image_data[..., np.newaxis]
+
+        texture = self._own_texture
+        if texture is not None and texture is self._shown and texture.shape == image_data.shape:
+            texture.set_data(image_data)  # same size: upload into the texture shown
+            self._mipmaps.texture = texture
+            self.bg_image.update()
+            return
+        texture = self._own_texture = Texture2D(image_data, wrapping='clamp_to_edge', interpolation='linear')
+        self._show(texture)
+
+    def _show(self, texture):
+        # Textured quad over (0, 0)-(width, height), the frame _adjust_camera fits
+        height, width = texture.shape[:2]
+        vertices = np.array([[0, 0, 0], [width, 0, 0], [width, height, 0], [0, height, 0]], dtype=np.float32)
+        faces = np.array([[0, 1, 2], [0, 2, 3]], dtype=np.uint32)
+        texcoords = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
+
         # Remove the old image visual if it exists
-        if self.bg_image is not None:
-            self.bg_image.parent = None  # Detach from scene
-        # Create a new Image visual
-        self.bg_image = scene.visuals.Image(data=image_data, texture=texture, parent=self.bg_view.scene)
-        self._adjust_camera(image_data)
-    
+        self.clear_image()
+        quad = scene.visuals.Mesh(vertices=vertices, faces=faces, color=(1, 1, 1, 1), parent=self.bg_view.scene)
+        flt = TextureFilter(np.zeros((1, 1, 4), dtype=np.float32), texcoords)
+        flt.fshader['u_texture'] = texture
+        quad.attach(flt)
+        self.bg_image = quad
+        self._shown = texture
+        self._mipmaps.texture = texture
+        self._adjust_camera(texture)
+
     def clear_image(self):
         # Remove the current image visual if it exists
         if self.bg_image is not None:
             self.bg_image.parent = None  # Detach from scene
             self.bg_image = None
+            self._shown = None
+        if self._texture_key is not None:
+            texture_cache().release(self._texture_key)
+            self._texture_key = None
     
     def _adjust_camera(self, image_data):
         # Get image dimensions
@@ -42,6 +42,13 @@ class ArsFlyCamera(vispy.scene.cameras.FlyCamera):
             self.update_callback()
 
 
+    def get_near_far(self):
+        # Clip planes as set by PerspectiveCamera._update_projection_transform (they follow fov, canvas height and depth_value)
+        m = self._projection.matrix
+        a, b = float(m[2, 2]), float(m[3, 2])
+        return b / (a - 1.0), b / (a + 1.0)
+
+
     def on_timer(self, event):
         # Call the parent's on_timer to handle standard updates
         super().on_timer(event)
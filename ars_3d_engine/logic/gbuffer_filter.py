@@ -0,0 +1,128 @@
+import numpy as np
+from vispy.gloo import VertexBuffer
+from vispy.visuals.filters import Filter
+from vispy.visuals.shaders import Function, Varying
+
+UV_BITS = 12  # u and v are packed into one float channel, 12 bits each (exact in float32)
+
+
+class GBufferFilter(Filter):
+    """Replaces a mesh's color with G-buffer data while enabled.
+
+    Written into a float RGBA target in one draw as
+    (view normal x, view normal y, packed uv, object id). The view normal
+    faces the camera, so z is recovered as sqrt(1 - x^2 - y^2). Normals go to
+    view space through the mesh's normal matrix, see set_view_rotation.
+    Like PickingFilter, it needs blending disabled.
+    """
+
+    def __init__(self, id_):
+        vfunc = Function("""
+            void gbuffer_vertex() {
+                $v_normal = $normal;
+                $v_uv = $uv;
+            }
+        """)
+        ffunc = Function("""
+            void gbuffer_filter() {
+                if ($enabled == 0)
+                    return;
+                if (gl_FragColor.a == 0.0)
+                    discard;
+                vec3 n = vec3(dot($view_x, $v_normal), dot($view_y, $v_normal), dot($view_z, $v_normal));
+                n = normalize(gl_FrontFacing ? n : -n);
+                vec2 uv = floor(clamp($v_uv, 0.0, 1.0) * $uv_max + 0.5);
+                gl_FragColor = vec4(n.x, n.y, uv.x * ($uv_max + 1.0) + uv.y, $id);
+            }
+        """)
+        normal_varying = Varying('v_gbuffer_normal', 'vec3')
+        uv_varying = Varying('v_gbuffer_uv', 'vec2')
+        vfunc['v_normal'] = normal_varying
+        vfunc['v_uv'] = uv_varying
+        ffunc['v_normal'] = normal_varying
+        ffunc['v_uv'] = uv_varying
+
+        self._normals = VertexBuffer(np.zeros((0, 3), dtype=np.float32))
+        self._uvs = VertexBuffer(np.zeros((0, 2), dtype=np.float32))
+        vfunc['normal'] = self._normals
+        vfunc['uv'] = self._uvs
+        super().__init__(vcode=vfunc, vhook='pre', fcode=ffunc, fpos=10)
+
+        self.fshader['id'] = float(id_)
+        self.fshader['uv_max'] = float((1 << UV_BITS) - 1)
+        self.set_view_rotation(np.eye(3))
+        self.enabled = False
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, e):
+        self._enabled = e
+        self.fshader['enabled'] = 1 if e is True else 0
+
+    def set_view_rotation(self, rotation):
+        """Rows of the scene -> view rotation used to express normals in view space.
+        Combined with the normal matrix of the mesh's current transform, so call it
+        again after the mesh moves (render_gbuffer does, before every draw)."""
+        rotation = np.asarray(rotation, dtype=np.float64)
+        if self._attached:
+            rotation = rotation @ normal_matrix(self._visual.transforms.get_transform('visual', 'scene'))
+        rotation = rotation.astype(np.float32)
+        self.fshader['view_x'] = rotation[0]
+        self.fshader['view_y'] = rotation[1]
+        self.fshader['view_z'] = rotation[2]
+
+    def _update_data(self):
+        if not self._attached or self._visual is None:
+            return
+        md = self._visual.mesh_data
+        faces = md.get_faces()
+        if faces is None or len(faces) == 0:
+            return
+        self._normals.set_data(md.get_vertex_normals(indexed='faces'), convert=True)
+        texcoords = getattr(md, '_vertex_tex_coords', None)
+        if texcoords is None or len(texcoords) != md.n_vertices:
+            uv = np.zeros((faces.size, 2), dtype=np.float32)
+        else:
+            uv = texcoords[:, :2][faces].reshape(-1, 2)
+        self._uvs.set_data(uv, convert=True)
+
+    def on_mesh_data_updated(self, event):
+        self._update_data()
+
+    def _attach(self, visual):
+        super()._attach(visual)
+        visual.events.data_updated.connect(self.on_mesh_data_updated)
+        self._update_data()
+
+    def _detach(self, visual):
+        visual.events.data_updated.disconnect(self.on_mesh_data_updated)
+        super()._detach(visual)
+
+
+def normal_matrix(transform) -> np.ndarray:
+    """Inverse transpose of the linear part of an affine visual -> scene transform
+    (column vectors): keeps normals perpendicular to surfaces under non-uniform scale."""
+    points = np.asarray(transform.map(np.vstack([np.zeros(3), np.eye(3)])), dtype=np.float64)
+    if points.shape[1] == 4:
+        points = points[:, :3] / points[:, 3:4]
+    linear = (points[1:] - points[0]).T
+    return np.linalg.pinv(linear).T  # pinv: a mesh scaled to zero gets no NaNs
+
+
+def unpack_gbuffer(data: np.ndarray):
+    """Split a float RGBA G-buffer read back from the GPU.
+    Returns (normals HxWx3, uvs HxWx2, ids HxW int) with ids 0 for background."""
+    nx, ny = data[..., 0], data[..., 1]
+    nz = np.sqrt(np.clip(1.0 - nx * nx - ny * ny, 0.0, 1.0))
+    normals = np.stack([nx, ny, nz], axis=-1)
+
+    uv_max = (1 << UV_BITS) - 1
+    packed = np.rint(data[..., 2]).astype(np.int64)
+    uvs = np.stack([packed >> UV_BITS, packed & uv_max], axis=-1).astype(np.float32) / uv_max
+
+    ids = np.rint(data[..., 3]).astype(np.int64)
+    normals[ids == 0] = 0.0
+    return normals, uvs, ids
@@ -0,0 +1,148 @@
+import os
+from contextlib import contextmanager
+from typing import Optional
+import numpy as np
+from vispy import scene
+from core.mesh_importer import mesh_importer
+from ..mesh_objects.obj_mesh_loader import CMesh, mesh_data_from_arrays
+
+
+class CLODManager:
+    """ Distance based level of detail for heavy imported meshes.
+
+    Meshes above MIN_FACES get decimated levels built in the mesh worker pool
+    (stored next to the mesh in the mesh cache). On camera moves each mesh shows
+    the level that matches its projected size on screen; clones sharing one vertex
+    buffer switch together, to the finest level any of them needs. Render passes
+    (and picking, when asked) wrap their draws in full_resolution()."""
+
+    MIN_FACES = 50_000
+    PIXELS = (400.0, 150.0, 50.0)  # projected diameter (px) under which level 1, 2, 3 are shown
+    HYSTERESIS = 0.15  # a threshold must be passed by this fraction before switching back
+
+    def __init__(self, view: scene.widgets.ViewBox, canvas: scene.SceneCanvas):
+        self._view = view
+        self._canvas = canvas
+        self._levels: dict[int, list] = {}  # id(obj) -> [MeshData], finest first
+        self._objects: dict[int, object] = {}
+        self._current: dict[int, int] = {}  # id(obj) -> level shown
+        self._bounds: dict[int, tuple[np.ndarray, float]] = {}  # id(obj) -> (center, radius) in mesh space
+        self._forced = 0
+        self.enabled = True
+
+    def track(self, obj) -> None:
+        """Build levels for a heavy mesh; clones of a tracked mesh reuse its levels."""
+        md = getattr(obj._visual, 'mesh_data', None)
+        if not isinstance(obj, CMesh) or md is None or md.get_faces() is None:
+            return
+        for levels in self._levels.values():
+            for index, level in enumerate(levels):
+                if level is md:
+                    self._adopt(obj, levels, index)
+                    return
+        if len(md.get_faces()) < self.MIN_FACES:
+            return
+
+        self._objects[id(obj)] = obj
+        vertices = md.get_vertices()
+        source = {'vertices': vertices, 'faces': md.get_faces()}
+        texcoords = getattr(md, '_vertex_tex_coords', None)
+        if texcoords is not None:
+            source['texcoords'] = texcoords
+        filename = getattr(vertices, 'filename', None)  # mapped from the mesh cache: levels are kept there
+        if filename:
+            source = os.path.dirname(filename)
+        mesh_importer().build_lods(source, callback=lambda results: self._levels_ready(obj, md, results))
+
+    def untrack(self, obj) -> None:
+        key = id(obj)
+        for d in (self._levels, self._objects, self._current, self._bounds):
+            d.pop(key, None)
+
+    def _levels_ready(self, obj, md, results: list) -> None:
+        # Dropped, or its mesh replaced, while the worker was busy
+        if self._objects.get(id(obj)) is not obj or obj._visual.mesh_data is not md:
+            return
+        self._adopt(obj, [md] + [mesh_data_from_arrays(arrays) for arrays in results], 0)
+        self.update()
+
+    def _adopt(self, obj, levels: list, current: int) -> None:
+        key = id(obj)
+        vertices = levels[0].get_vertices()
+        lo, hi = np.min(vertices, axis=0), np.max(vertices, axis=0)
+        self._objects[key] = obj
+        self._levels[key] = levels
+        self._current[key] = current
+        self._bounds[key] = ((lo + hi) / 2.0, float(np.linalg.norm(hi - lo)) / 2.0)
+
+    def _projected_size(self, key: int) -> float:
+        obj = self._objects[key]
+        center, radius = self._bounds[key]
+        camera = self._view.camera
+        world = obj._visual.get_transform('visual', 'scene').map(center)
+        world = world[:3] / world[3]
+        distance = float(np.linalg.norm(world - np.asarray(camera.center, dtype=float)))
+        radius *= float(np.max(np.linalg.norm(obj._visual.transform.matrix[:3, :3], axis=1)))
+        if distance <= radius:
+            return float('inf')
+        return radius * self._canvas.size[1] / (distance * np.tan(np.radians(camera.fov) / 2.0))
+
+    def _level_for(self, size: float, current: int, count: int) -> int:
+        coarser = sum(size < t * (1.0 - self.HYSTERESIS) for t in self.PIXELS)
+        finer = sum(size < t * (1.0 + self.HYSTERESIS) for t in self.PIXELS)
+        level = coarser if coarser > current else finer if finer < current else current
+        return min(level, count - 1)
+
+    def _groups(self) -> list:
+        """Keys of the tracked meshes with levels, grouped by shared vertex buffer."""
+        groups = {}
+        for key in self._levels:
+            visual = self._objects[key]._visual
+            group = visual._share_group if getattr(visual, 'is_shared', False) else None
+            groups.setdefault(key if group is None else id(group), []).append(key)
+        return list(groups.values())
+
+    def update(self, event=None) -> None:
+        """Pick the level of every tracked mesh for the current camera."""
+        if self._forced or not self.enabled:
+            return
+        for keys in self._groups():
+            level = min(self._level_for(self._projected_size(key), self._current[key], len(self._levels[key]))
+                        for key in keys)
+            if any(self._current[key] != level for key in keys):
+                for key in keys:
+                    self._current[key] = level
+                self._show(keys, level)
+
+    def _show(self, keys: list, level: int) -> None:
+        # One switch per share group: the members keep drawing from one buffer
+        md = self._levels[keys[0]][level]
+        visual = self._objects[keys[0]]._visual
+        if hasattr(visual, 'set_shared_data'):
+            visual.set_shared_data(md)
+        else:
+            visual.set_data(meshdata=md)
+        texcoords = getattr(md, '_vertex_tex_coords', None)
+        for key in keys:
+            texture_filter = getattr(self._objects[key], 'texture_filter', None)
+            if texture_filter is not None and texcoords is not None:
+                texture_filter.texcoords = texcoords[:, :2]  # indexed by the new faces
+
+    def level_of(self, obj) -> Optional[int]:
+        return self._current.get(id(obj))
+
+    @contextmanager
+    def full_resolution(self):
+        """Every tracked mesh at its original resolution inside the block."""
+        self._forced += 1
+        lowered = [keys for keys in self._groups() if self._current[keys[0]]]
+        for keys in lowered:
+            self._show(keys, 0)
+        try:
+            yield
+        finally:
+            self._forced -= 1
+            for keys in lowered:
+                keys = [key for key in keys if key in self._levels]
+                if keys:
+                    self._show(keys, self._current[keys[0]])
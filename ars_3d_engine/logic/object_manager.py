@@ -1,7 +1,9 @@
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Iterable, List, Optional
 from vispy import scene
 from ..mesh_objects.scene_objects import CGeometry
 from .picking_manager import CPickingManager
+from .lod_manager import CLODManager
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer
 
 class CObjectManager(QObject):
@@ -9,6 +11,8 @@ class CObjectManager(QObject):
     object_removed = pyqtSignal(int, CGeometry)
     active_changed = pyqtSignal(int)
     selection_changed = pyqtSignal()
+    hovered_changed = pyqtSignal(int)
+    objects_changed = pyqtSignal(list, list)  # added, removed; once per transaction
 
     def __init__(self, view: scene.widgets.ViewBox
                  , canvas: scene.SceneCanvas
@@ -20,10 +24,21 @@ class CObjectManager(QObject):
         self._canvas = canvas
         self._mover = mover
         self._picking = picking
+        self._picking.set_object_source(lambda: self._objects)
+        self._lod = CLODManager(view, canvas)
+        self._picking.set_lod(self._lod)
         self._objects: List[CGeometry] = []
         self._active_idx = -1
         self._selected_indices: List[int] = []
         self._selected_set: set[int] = set()
+        self._hovered_idx = -1
+
+        # Pending work of an open transaction()
+        self._batch_depth = 0
+        self._batch_added: List[CGeometry] = []
+        self._batch_removed: List[CGeometry] = []
+        self._batch_selection: List[CGeometry] = []
+        self._batch_active: Optional[CGeometry] = None
 
     #used by camera
     def update_lights(self, light_dir):
@@ -33,11 +48,69 @@ class CObjectManager(QObject):
                     obj.update_light_dir(light_dir)
 
 
+    @contextmanager
+    def transaction(self):
+        """Batch scene edits. Inside, add/remove skip per-object signals, picking
+        registration and selection timers; on exit everything is applied at once,
+        announced with a single objects_changed and drawn with one canvas update."""
+        if self._batch_depth == 0:
+            self._batch_selection = self.get_selected_objects()
+            self._batch_active = self.active_object()
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        added, removed = self._batch_added, self._batch_removed
+        self._batch_added, self._batch_removed = [], []
+        for obj in removed:
+            self._picking.unregister_object(obj)
+            self._lod.untrack(obj)
+        for obj in added:
+            self._picking.register_object(obj)
+            self._lod.track(obj)
+        self._picking.order_changed()
+
+        if added or removed:
+            self.objects_changed.emit(added, removed)
+
+        if added:
+            # Same delayed select as add_object, but one timer for the whole batch
+            self.set_selection_state([], None)
+            def select_added():
+                position = {id(o): i for i, o in enumerate(self._objects)}
+                indices = [position[id(o)] for o in added if id(o) in position]
+                self.set_selection_state(indices, indices[-1] if indices else None)
+            QTimer.singleShot(250, select_added)
+        else:
+            position = {id(o): i for i, o in enumerate(self._objects)}
+            indices = [position[id(o)] for o in self._batch_selection if id(o) in position]
+            self.set_selection_state(indices, position.get(id(self._batch_active), indices[-1] if indices else None))
+        self._batch_selection, self._batch_active = [], None
+        self._canvas.update()
+
+    def add_objects(self, objs: Iterable[CGeometry]) -> None:
+        with self.transaction():
+            for obj in objs:
+                self.add_object(obj)
+
+    def remove_objects(self, indices: Iterable[int]) -> List[CGeometry]:
+        with self.transaction():
+            return [obj for obj in (self.remove_object_at(i) for i in sorted(set(indices), reverse=True)) if obj]
+
     def add_object(self, obj: CGeometry) -> None:
         index = len(self._objects)
         self._objects.append(obj)
         obj.visual.parent = self._view.scene
-        self._picking.register_visual(index=index, visual=obj.visual)
+        if self._batch_depth:
+            self._batch_added.append(obj)
+            return
+        self._picking.register_object(obj)
+        self._lod.track(obj)
         self.object_added.emit(index, obj)
         # Immediately deselect current selection
         self.set_selection_state([], None)
@@ -50,19 +123,17 @@ class CObjectManager(QObject):
         if not selected:
             return  # Nothing to duplicate
 
-        new_indices = []
+        clones = []
         for obj in selected:
             clone = obj.clone()
             # Optionally offset the position slightly to avoid perfect overlap
             if offset:
                 current_pos = clone.get_position()
                 clone.set_position(current_pos[0] + offset[0], current_pos[1] + offset[1], current_pos[2] + offset[2])
-            
-            self.add_object(clone)
-            new_indices.append(len(self._objects) - 1)  # Clone was added at the end
+            clones.append(clone)
 
-        # Select the new clones (deselect originals)
-        self.set_selection_state(new_indices, new_indices[-1] if new_indices else None)
+        # One batch: the clones get selected together once it is applied (originals deselected)
+        self.add_objects(clones)
 
 
     def remove_object_at(self, index: int) -> Optional[CGeometry]:
@@ -74,7 +145,14 @@ class CObjectManager(QObject):
         obj._children = []
         obj._parent = None
         obj.visual.parent = None
-        self._rebuild_picking()
+        if self._batch_depth:
+            if obj in self._batch_added:
+                self._batch_added.remove(obj)  # never registered
+            else:
+                self._batch_removed.append(obj)
+            return obj
+        self._picking.unregister_object(obj)
+        self._lod.untrack(obj)
         self._selected_indices = [i for i in self._selected_indices if i != index]
         self._selected_set = set(self._selected_indices)
         self.object_removed.emit(index, obj)
@@ -85,10 +163,9 @@ class CObjectManager(QObject):
             self._active_idx = -1
         return obj
 
-    def _rebuild_picking(self) -> None:
-        self._picking = CPickingManager(self._canvas)
-        for idx, o in enumerate(self._objects):
-            self._picking.register_visual(index=idx, visual=o.visual)
+    def order_changed(self) -> None:
+        """Call after `_objects` was reordered in place or replaced; picking ids stay with the objects."""
+        self._picking.order_changed()
 
     def set_active(self, index: int) -> None:
         if 0 <= index < len(self._objects):
@@ -107,9 +184,20 @@ class CObjectManager(QObject):
     def count(self) -> int:
         return len(self._objects)
 
+    def set_hovered(self, index: int) -> None:
+        if index != self._hovered_idx:
+            self._hovered_idx = index
+            self.hovered_changed.emit(index)
+
+    def hovered_index(self) -> int:
+        return self._hovered_idx
+
     def picking(self) -> CPickingManager:
         return self._picking
 
+    def lod(self) -> CLODManager:
+        return self._lod
+
     def selected_indices(self) -> List[int]:
         return list(self._selected_indices)
 
@@ -1,14 +1,37 @@
 import numpy as np
+from contextlib import nullcontext
 from vispy import scene
 from vispy.visuals.filters.picking import PickingFilter
-from typing import Optional
+from .gbuffer_filter import GBufferFilter
+from typing import Callable, Optional
 
 class CPickingManager:
-    def __init__(self, canvas: scene.SceneCanvas):
+    """ Picking reads from an ID buffer rendered once into an offscreen target.
+    The buffer is re-rendered lazily, only after the camera, the canvas size or
+    a registered object (transform, visibility, mesh data) changed; plain redraws
+    such as texture previews keep it.
+
+    Every object keeps the picking id it got when registered, independent of its
+    position in the manager's list; ids map to list indices through a lookup
+    that is rebuilt lazily after add/remove/reorder (no filter is touched)."""
+
+    def __init__(self, canvas: scene.SceneCanvas, view: Optional[scene.widgets.ViewBox] = None):
         self._canvas = canvas
+        self._view = view
+        self._objects: Callable[[], list] = lambda: []  # current object order, owned by CObjectManager
+        self._id_buffer: Optional[np.ndarray] = None  # HxW picking ids, rows top-down
+        self._buffer_key = None
+        self._rendering = False
+        self._excluded: list = []  # helper nodes (grid, gizmo) kept out of the ID buffer
         self._next_id: int = 1
-        self._entries: list[tuple[object, PickingFilter]] = []
-        self._id_to_index: dict[int, int] = {}
+        self._pid_of: dict[int, int] = {}  # id(obj) -> picking id
+        self._entries: dict[int, list[tuple[object, PickingFilter]]] = {}
+        self._gbuffer_entries: dict[int, list[tuple[object, GBufferFilter]]] = {}
+        self._watched: dict[int, list] = {}
+        self._node_state: dict[int, list] = {}  # id(node) -> [watched transform, visibility]
+        self._lut: Optional[np.ndarray] = None  # picking id -> list index
+        self._lod = None
+        self.full_resolution = False  # render the ID buffer from the original meshes instead of the shown LOD levels
 
     def _iter_leaf_visuals(self, node):
         stack = [node]
@@ -20,47 +43,205 @@ class CPickingManager:
             else:
                 yield n
 
-    def register_visual(self, index: int, visual) -> None:
+    def set_lod(self, lod) -> None:
+        self._lod = lod
+
+    def exclude(self, *nodes) -> None:
+        self._excluded.extend(nodes)
+        self.invalidate()
+
+    def invalidate(self, event=None) -> None:
+        if not self._rendering:
+            self._id_buffer = None
+
+    def _node_events(self, node) -> list:
+        # Node tree changes and new mesh data make the ID buffer stale
+        events = node.events
+        watched = [events.parent_change, events.children_change]
+        if 'data_updated' in events.emitters:
+            watched.append(events.data_updated)
+        return watched
+
+    def _watch(self, node) -> None:
+        # Transforms are watched on the nodes themselves (the canvas transforms change
+        # with every offscreen render); plain updates such as texture previews are not
+        for event in self._node_events(node):
+            event.connect(self.invalidate)
+        node.events.transform_change.connect(self._on_transform_replaced)
+        node.events.update.connect(self._on_node_update)
+        node.transform.changed.connect(self.invalidate)
+        self._node_state[id(node)] = [node.transform, node.visible]
+
+    def _unwatch(self, node) -> None:
+        for event in self._node_events(node):
+            event.disconnect(self.invalidate)
+        node.events.transform_change.disconnect(self._on_transform_replaced)
+        node.events.update.disconnect(self._on_node_update)
+        state = self._node_state.pop(id(node), None)
+        if state is not None:
+            state[0].changed.disconnect(self.invalidate)
+
+    def _on_transform_replaced(self, event) -> None:
+        node = event.source
+        state = self._node_state.get(id(node))
+        if state is not None and state[0] is not node.transform:
+            state[0].changed.disconnect(self.invalidate)
+            node.transform.changed.connect(self.invalidate)
+            state[0] = node.transform
+        self.invalidate()
+
+    def _on_node_update(self, event) -> None:
+        # A plain update only matters when it toggled the node's visibility
+        state = self._node_state.get(id(event.source))
+        if state is not None and state[1] != event.source.visible:
+            state[1] = event.source.visible
+            self.invalidate()
+
+    def set_object_source(self, objects: Callable[[], list]) -> None:
+        self._objects = objects
+        self._lut = None
+
+    def order_changed(self) -> None:
+        """The object list was reordered or shrunk; ids stay, only the index lookup is redone."""
+        self._lut = None
+
+    def register_object(self, obj) -> int:
+        """Attach picking (and G-buffer) filters to the object's own leaves. Returns its stable id."""
         pid = self._next_id
         self._next_id += 1
-        for leaf in self._iter_leaf_visuals(visual):
+        self._pid_of[id(obj)] = pid
+
+        nodes = []
+        stack = [obj.visual]
+        while stack:
+            n = stack.pop()
+            self._watch(n)
+            nodes.append(n)
+            stack.extend(n.children)
+        self._watched[pid] = nodes
+
+        entries, gbuffer_entries = [], []
+        for leaf in self._iter_leaf_visuals(obj.visual):
             flt = PickingFilter(id_=pid)
             leaf.attach(flt)
+            flt.enabled = False
+            entries.append((leaf, flt))
+            if getattr(leaf, 'mesh_data', None) is not None:
+                gflt = GBufferFilter(id_=pid)
+                leaf.attach(gflt)
+                gbuffer_entries.append((leaf, gflt))
+        self._entries[pid] = entries
+        self._gbuffer_entries[pid] = gbuffer_entries
+
+        self._lut = None
+        self.invalidate()
+        return pid
+
+    def unregister_object(self, obj) -> None:
+        """Detach the object's filters and stop watching its nodes."""
+        pid = self._pid_of.pop(id(obj), None)
+        if pid is None:
+            return
+        for leaf, flt in self._entries.pop(pid, []) + self._gbuffer_entries.pop(pid, []):
             try:
-                flt.enabled = False
-            except Exception:
+                leaf.detach(flt)
+            except ValueError:
                 pass
-            self._entries.append((leaf, flt))
-        self._id_to_index[pid] = index
+        for n in self._watched.pop(pid, []):
+            self._unwatch(n)
+        self._lut = None
+        self.invalidate()
+
+    def id_of(self, obj) -> Optional[int]:
+        return self._pid_of.get(id(obj))
+
+    def has_gbuffer(self, obj) -> bool:
+        return bool(self._gbuffer_entries.get(self._pid_of.get(id(obj))))
 
     def _set_enabled(self, enabled: bool) -> None:
-        for leaf, flt in self._entries:
-            try:
+        for entries in self._entries.values():
+            for leaf, flt in entries:
                 flt.enabled = enabled
-            except Exception:
-                pass
+                try:
+                    leaf.update_gl_state(blend=not enabled)
+                except Exception:
+                    pass
+
+    def _set_gbuffer_enabled(self, enabled: bool, view_rotation=None) -> None:
+        # Leaves without mesh data (markers) have no G-buffer filter, the caller hides them
+        for entries in self._gbuffer_entries.values():
+            for leaf, flt in entries:
+                if view_rotation is not None:
+                    flt.set_view_rotation(view_rotation)
+                flt.enabled = enabled
+                try:
+                    leaf.update_gl_state(blend=not enabled)
+                except Exception:
+                    pass
+
+    def _index_lut(self) -> np.ndarray:
+        if self._lut is None or len(self._lut) < self._next_id:
+            lut = np.full(self._next_id, -1, dtype=np.int32)
+            for index, obj in enumerate(self._objects()):
+                pid = self._pid_of.get(id(obj))
+                if pid is not None:
+                    lut[pid] = index
+            self._lut = lut
+        return self._lut
+
+    def indices_from_pids(self, pids: np.ndarray) -> np.ndarray:
+        # Picking ids -> object indices, -1 where nothing was hit
+        lut = self._index_lut()
+        return np.where((pids > 0) & (pids < len(lut)), lut[np.clip(pids, 0, len(lut) - 1)], -1)
+
+    def indices_from_ids(self, id_image: np.ndarray) -> np.ndarray:
+        # Picking ids (RGBA read as uint32) -> object indices
+        return self.indices_from_pids(id_image.view(np.uint32)[..., 0].astype(np.int64))
+
+    def _view_key(self):
+        key = (tuple(self._canvas.physical_size),)
+        camera = getattr(self._view, 'camera', None)
+        if camera is not None:
+            key += (camera.transform.matrix.tobytes(), camera._projection.matrix.tobytes())
+        return key
+
+    def id_buffer(self) -> np.ndarray:
+        """Picking id per framebuffer pixel (0 for none), re-rendered only when stale."""
+        key = self._view_key()
+        if self._id_buffer is None or key != self._buffer_key:
+            self._rendering = True
+            hidden = [node for node in self._excluded if node.visible]
+            for node in hidden:
+                node.visible = False
+            self._set_enabled(True)
             try:
-                leaf.update_gl_state(blend=not enabled)
-            except Exception:
-                pass
+                # Inside the try: swapping levels back must not invalidate the fresh buffer
+                with self._lod.full_resolution() if self._lod and self.full_resolution else nullcontext():
+                    img = self._canvas.render(bgcolor=(0, 0, 0, 0), alpha=True)
+                self._id_buffer = np.ascontiguousarray(img).view(np.uint32)[..., 0].astype(np.int64)
+                self._buffer_key = key
+            finally:
+                self._set_enabled(False)
+                for node in hidden:
+                    node.visible = True
+                self._rendering = False
+        return self._id_buffer
+
+    def _to_pixel(self, x: float, y: float) -> tuple[int, int]:
+        ps = float(self._canvas.pixel_scale or 1.0)
+        return int(round(x * ps)), int(round(y * ps))
 
     def pick_at(self, x: float, y: float) -> Optional[int]:
-        self._set_enabled(True)
-        try:
-            ps = float(self._canvas.pixel_scale or 1.0)
-            fb_w, fb_h = int(self._canvas.size[0] * ps), int(self._canvas.size[1] * ps)
-            px = int(round(x * ps))
-            py = int(round(fb_h - (y * ps)))
-            if px < 0 or py < 0 or px >= fb_w or py >= fb_h:
-                return None
-            img = self._canvas.render(
-                crop=(px, py, 1, 1),
-                bgcolor=(0, 0, 0, 0),
-                alpha=True,
-            )
-            obj_id = int(img.view(np.uint32)[0, 0, 0])
-            if obj_id < 0:
-                return None
-            return self._id_to_index.get(obj_id, None)
-        finally:
-            self._set_enabled(False)
\ No newline at end of file
+        buffer = self.id_buffer()
+        px, py = self._to_pixel(x, y)
+        if px < 0 or py < 0 or px >= buffer.shape[1] or py >= buffer.shape[0]:
+            return None
+        index = int(self.indices_from_pids(buffer[py, px]))
+        return index if index >= 0 else None
+
+    def pick_rect(self, x0: float, y0: float, x1: float, y1: float) -> list[int]:
+        """Indices of all objects visible inside the rectangle (canvas coordinates)."""
+        buffer = self.id_buffer()
+        (px0, py0), (px1, py1) = self._to_pixel(min(x0, x1), min(y0, y1)), self._to_pixel(max(x0, x1), max(y0, y1))
+        pids = np.unique(buffer[max(py0, 0):py1 + 1, max(px0, 0):px1 + 1])
+        return sorted(int(i) for i in self.indices_from_pids(pids) if i >= 0)
@@ -0,0 +1,114 @@
+import os
+from collections import OrderedDict
+import numpy as np
+from vispy.gloo import Texture2D
+from vispy.io import imread
+
+
+class CTextureCache:
+    """ GPU textures of image files, shared by every object (and the background)
+    showing the same file. Keyed by path and modification time, so an image that
+    is overwritten on disk is read again.
+
+    Users acquire() a texture and release() it when they stop showing it. Entries
+    nobody uses stay cached as long as the budget allows and go least recently
+    used first. Dropping an entry only drops the cache's reference; a filter that
+    still holds the texture keeps it alive."""
+
+    def __init__(self, budget_mb: float = 512.0):
+        self._entries: OrderedDict = OrderedDict()  # key -> [Texture2D, nbytes, refs]
+        self._size = 0
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(path: str):
+        path = os.path.abspath(path)
+        return (path, os.stat(path).st_mtime_ns)
+
+    def contains(self, path: str) -> bool:
+        try:
+            return self.key(path) in self._entries
+        except OSError:
+            return False
+
+    def acquire(self, path: str, image: np.ndarray = None):
+        """(key, Texture2D) of `path`, counted as one more user. `image` is the already
+        decoded file (rows bottom-up) to use on a miss; otherwise the file is read here.
+        Raises FileNotFoundError / OSError like imread."""
+        key = self.key(path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self.misses += 1
+            if image is None:
+                image = np.ascontiguousarray(imread(path)[::-1])
+            if image.ndim == 2: image = image[..., np.newaxis]
+            texture = Texture2D(image, interpolation='linear', wrapping='clamp_to_edge')
+            entry = self._entries[key] = [texture, image.nbytes, 0]
+            self._size += image.nbytes
+        entry[2] += 1
+        self._trim()
+        return key, entry[0]
+
+    def retain(self, key) -> None:
+        """One more user of an entry already acquired by someone else."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[2] += 1
+
+    def release(self, key) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry[2] = max(0, entry[2] - 1)
+        self._trim()
+
+    def set_budget(self, budget_mb: float) -> None:
+        self.budget = int(budget_mb * 1024 * 1024)
+        self._trim()
+
+    def clear(self) -> None:
+        """Drop every unused entry."""
+        for key in [k for k, e in self._entries.items() if e[2] == 0]:
+            self._drop(key)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'in_use': sum(1 for e in self._entries.values() if e[2]),
+            'mb': self._size / (1024 * 1024),
+            'budget_mb': self.budget / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+    def _drop(self, key) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def _trim(self) -> None:
+        # Textures in use are never dropped, the budget may be exceeded by them alone
+        for key in [k for k, e in self._entries.items() if e[2] == 0]:
+            if self._size <= self.budget:
+                break
+            self._drop(key)
+            self.evictions += 1
+
+
+_cache = None
+
+
+def texture_cache() -> CTextureCache:
+    """Return the process-wide :class:`CTextureCache`, creating it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = CTextureCache()
+    return _cache
@@ -3,19 +3,33 @@ from vispy import scene
 from vispy.io import read_mesh
 from vispy.geometry import MeshData  
 from ars_3d_engine.mesh_objects.scene_objects import CGeometry
- 
+from ars_3d_engine.mesh_objects.shared_mesh import SharedMesh
+
+
+def mesh_data_from_arrays(arrays: dict) -> MeshData:
+    """Arrays already in float32 are used as they are, memory-mapped cache arrays included."""
+    md = MeshData(vertices=arrays['vertices'], faces=arrays['faces'])
+    normals = arrays.get('normals')
+    texcoords = arrays.get('texcoords')
+    if normals is not None:
+        md._vertex_normals = np.asarray(normals, dtype=np.float32)
+    if texcoords is not None:
+        md._vertex_tex_coords = np.asarray(texcoords, dtype=np.float32)  # Add this to set texcoords
+    return md
+
 
 class CMesh(CGeometry):
 
     @classmethod
     def create(cls, file_path: str, color=(102/255, 108/255, 120/255, 1.0), translate=(0.0, 0.0, 0.0), name="Mesh"):
         vertices, faces, normals, texcoords = read_mesh(file_path)  # Changed _ to texcoords
-        md = MeshData(vertices=vertices, faces=faces)
-        if normals is not None:
-            md._vertex_normals = normals.astype(np.float32)
-        if texcoords is not None:
-            md._vertex_tex_coords = texcoords.astype(np.float32)  # Add this to set texcoords
-        v = scene.visuals.Mesh(meshdata=md, color=color, shading=None)
+        return cls.from_arrays({'vertices': vertices, 'faces': faces, 'normals': normals, 'texcoords': texcoords},
+                               color=color, translate=translate, name=name)
+
+    @classmethod
+    def from_arrays(cls, arrays: dict, color=(102/255, 108/255, 120/255, 1.0), translate=(0.0, 0.0, 0.0), name="Mesh"):
+        """Build from already parsed arrays (vertices, faces, optional normals/texcoords), e.g. from the mesh importer."""
+        v = SharedMesh(meshdata=mesh_data_from_arrays(arrays), color=color, shading=None)
         obj = cls(v, name=name)
         obj.set_position(translate[0], translate[1], translate[2])
         return obj
@@ -1,13 +1,74 @@
 import numpy as np
+from collections import OrderedDict
 from vispy import scene
 
 from ars_3d_engine.mesh_objects.scene_objects import CGeometry
-import pyvista as pv
+from ars_3d_engine.mesh_objects.shared_mesh import SharedMesh
+from ars_3d_engine.mesh_objects import primitive_mesh
 from vispy.geometry import MeshData
 from theme.fonts import font_icons as ic
 
 
+class MeshCache:
+    """LRU of generated MeshData, bounded by the bytes of its arrays.
+    Entries are handed out shared, so a cached MeshData must never be edited in place."""
+
+    def __init__(self, budget_mb: float = 256.0):
+        self._entries: OrderedDict = OrderedDict()  # key -> (MeshData, nbytes)
+        self._size = 0
+        self.budget = int(budget_mb * 1024 * 1024)
+
+    @staticmethod
+    def _nbytes(md) -> int:
+        arrays = (md._vertices, md._faces, getattr(md, '_vertex_normals', None), getattr(md, '_vertex_tex_coords', None))
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, md) -> None:
+        size = self._nbytes(md)
+        if size > self.budget:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= old[1]
+        self._entries[key] = (md, size)
+        self._size += size
+        self._trim()
+
+    def set_budget(self, budget_mb: float) -> None:
+        self.budget = int(budget_mb * 1024 * 1024)
+        self._trim()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _trim(self) -> None:
+        while self._size > self.budget and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._size -= size
+
+
 class CPrimitive(CGeometry):
+    mesh_cache = MeshCache()
+    PREVIEW_LOD = 16  # cap for rebuilds while a slider is held
+
+    # Size parameters that are a pure scale of the built mesh, per primitive (local axes, Y = direction)
+    _SCALE_AXES = {
+        'sphere': {'radius': (0, 1, 2)},
+        'cube': {'width': (0,), 'height': (1,), 'depth': (2,)},
+        'plane': {'width': (0,), 'height': (2,)},
+        'cylinder': {'radius': (0, 2), 'height': (1,)},
+        'cone': {'radius': (0, 2), 'height': (1,)},
+        'pyramid': {'radius': (0, 2), 'height': (1,)},
+    }
+
     def __init__(self, visual, **params):
         super().__init__(visual)
         
@@ -23,6 +84,7 @@ class CPrimitive(CGeometry):
         self.slice_start = params.get('slice_start', 0)
         self.radius_inner = params.get('radius_inner', 0.0)
         self.symbol = self._get_symbol_for_type(self.primitive_type)
+        self._preview_base = None  # (params the mesh was built with, transform matrix) during a slider drag
     
     def _get_symbol_for_type(self, ptype):
         return {'sphere': ic.ICON_OBJ_SPHERE, 'cube': ic.ICON_OBJ_BOX, 'plane': ic.ICON_OBJ_PLANE, 
@@ -42,7 +104,7 @@ class CPrimitive(CGeometry):
             **params: Additional parameters like radius, width, height, depth, lod, direction, slice_start
         """
         md = cls._generate_mesh(primitive_type, **params)
-        v = scene.visuals.Mesh(meshdata=md, color=color, shading=None)
+        v = SharedMesh(meshdata=md, color=color, shading=None)
         
         obj = cls(v, primitive_type=primitive_type, **params)
         obj.set_position(*translate)
@@ -99,6 +161,48 @@ class CPrimitive(CGeometry):
         self._visual.set_data(meshdata=md)
         
 
+    def preview_primitive(self, **params):
+        """
+        Cheap stand-in for set_primitive_type while a slider is held.
+        Size changes that only scale the built mesh go to the transform; anything else
+        is rebuilt at PREVIEW_LOD (the LOD slider itself previews its own value).
+        The stored parameters stay untouched until commit_primitive.
+        """
+        if self._preview_base is None:
+            self._preview_base = (self.get_params(), self._visual.transform.matrix.copy())
+        built, matrix = self._preview_base
+        target = dict(built, **params)
+        changed = [k for k in params if target[k] != built[k]]
+
+        axes = self._SCALE_AXES.get(self.primitive_type, {})
+        if self.primitive_type == 'cylinder' and self.radius_inner >= 0.005:
+            axes = {'height': (1,)}  # hollow: the inner radius would scale along
+        if changed and all(k in axes and built[k] > 0 for k in changed):
+            scale = np.ones(3)
+            for k in changed:
+                scale[list(axes[k])] = target[k] / built[k]
+            rot = np.eye(3) if self.primitive_type == 'cube' else primitive_mesh.axis_rotation(self.direction)
+            pre = np.eye(4)
+            pre[:3, :3] = rot @ np.diag(scale) @ rot.T
+            self._visual.transform.matrix = pre @ matrix
+            return
+
+        if 'lod' not in changed:
+            target['lod'] = min(target['lod'], self.PREVIEW_LOD)
+        self._visual.transform.matrix = matrix
+        self._visual.set_data(meshdata=self._generate_mesh(self.primitive_type, **target))
+
+    def commit_primitive(self, **params):
+        """End of a slider drag: restore the transform and rebuild once at full resolution."""
+        if self._preview_base is None:
+            if any(getattr(self, k) != v for k, v in params.items()):
+                self.set_primitive_type(self.primitive_type, **params)
+            return
+        _, matrix = self._preview_base
+        self._preview_base = None
+        self._visual.transform.matrix = matrix
+        self.set_primitive_type(self.primitive_type, **params)
+
     def get_params(self):
         """Provide CPrimitive-specific parameters for cloning."""
         return {
@@ -115,13 +219,38 @@ class CPrimitive(CGeometry):
 
     @staticmethod
     def _generate_mesh(primitive_type='sphere', **params):
+        """Cached mesh data for the primitive type and parameters (see _build_mesh)."""
+        key = (primitive_type, float(params.get('radius', 1.0)), float(params.get('width', 2.0)),
+               float(params.get('height', 2.0)), float(params.get('depth', 2.0)), int(params.get('lod', 30)),
+               tuple(float(c) for c in params.get('direction', (0, 1, 0))), float(params.get('slice_start', 0)),
+               float(params.get('radius_inner', 0.0)))
+        md = CPrimitive.mesh_cache.get(key)
+        if md is None:
+            md = CPrimitive._build_mesh(primitive_type, **params)
+            CPrimitive.mesh_cache.put(key, md)
+        return md
+
+    @staticmethod
+    def _build_mesh(primitive_type='sphere', **params):
+        """Generate mesh data with the NumPy generators in primitive_mesh."""
+        vertices, faces, normals, texcoords = primitive_mesh.generate(primitive_type, **params)
+        md = MeshData(vertices=vertices, faces=faces)
+        md._vertex_normals = normals
+        md._vertex_tex_coords = texcoords
+        return md
+
+    @staticmethod
+    def _build_mesh_pyvista(primitive_type='sphere', **params):
         """
-        Generate mesh data based on primitive type and parameters.
+        Generate mesh data through PyVista/VTK. Reference path, kept for comparison
+        (see tests/bench_primitives.py).
         
         Args:
             primitive_type: Type of primitive to generate
             **params: radius, width, height, depth, lod, etc.
         """
+        import pyvista as pv
+
         # Extract common parameters with defaults
         radius = params.get('radius', 1.0)
         width = params.get('width', 2.0)
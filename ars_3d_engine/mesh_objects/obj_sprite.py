@@ -5,9 +5,11 @@ from vispy.geometry import MeshData
 
 from PIL import Image
 import os
+import time
 
 
 from ars_3d_engine.mesh_objects.scene_objects import CGeometry
+from ars_3d_engine.mesh_objects.shared_mesh import SharedMesh
 from theme.fonts import font_icons as ic
 
 
@@ -70,7 +72,7 @@ class CSprite(CGeometry):
         md = CSprite._create_quad_meshdata(size)
         
         # Create visual
-        v = scene.visuals.Mesh(meshdata=md, color=color, shading=None)
+        v = SharedMesh(meshdata=md, color=color, shading=None)
         
         # Create sprite object with custom attributes
         obj = cls(v, name=name, cfg=cfg)
@@ -111,92 +113,66 @@ class CSprite(CGeometry):
         
         self._visual.update()
 
-    def cutout(self):
+    def cutout(self, mode="contour", tolerance=1.0, grid_step=8, threshold=0.5):
         """
         Modifies the sprite's geometry based on the alpha channel of its texture.
         This will replace the existing quad with a mesh matching the
         opaque pixels of the texture.
+
+        mode="contour" traces the alpha outline (marching squares at `threshold`),
+        simplifies it to `tolerance` pixels and triangulates the polygons with
+        their holes. mode="grid" keeps every `grid_step` x `grid_step` block that
+        has an opaque pixel (also used when the contour can't be built).
+        `threshold` is in raw alpha units (0-255): pixels with a larger alpha are
+        opaque, so the default 0.5 keeps everything that is not fully transparent.
+        Returns the mesh stats (vertices, faces, GPU bytes, ms), None on error.
         """
         if self.texture_path is None:
             print("Error: No texture_path set. Call set_texture() first.")
             return
 
+        start = time.perf_counter()
         try:
             img = Image.open(self.texture_path)
         except Exception as e:
             print(f"Error opening image {self.texture_path}: {e}")
             return
         
-        # Get image pixels
+        # Only the alpha channel is needed
         if img.mode != 'RGBA':
             img = img.convert('RGBA')
-        pixels = np.asarray(img)
-        height_px, width_px = pixels.shape[:2]
+        alpha = np.asarray(img.getchannel('A'))
+        height_px, width_px = alpha.shape
         if width_px == 0 or height_px == 0:
              print("Error: Texture image has zero dimensions.")
              return
              
-        mask = pixels[:, :, 3] > 0
-        
-        if not mask.any():
+        if not (alpha > threshold).any():
             print("Warning: Texture is fully transparent. Clearing geometry.")
             self._visual.set_data(meshdata=MeshData())
             self._visual.update()
             return
-            
-        # Get target mesh size from sprite
+
+        points = None
+        if mode == "contour":
+            try:
+                points, faces = _contour_mesh(alpha, threshold, tolerance)
+            except Exception as e:
+                print(f"Contour cutout failed, using the grid: {e}")
+        if points is None or len(faces) == 0:
+            points, faces = _grid_mesh(alpha > threshold, max(1, int(grid_step)))
+
+        # Pixel space (x right, y down, pixel edges on integers) to the quad's
+        # size and UVs, so the cut mesh lines up with the uncut texture
         width_units, height_units = self.sprite_size
-        scale_x = width_units / width_px
-        scale_y = height_units / height_px
-        
-        # Build index mapping for valid pixels
-        indices = np.zeros((height_px, width_px), dtype=np.int32)
-        num_vertices = mask.sum()
-        indices[mask] = np.arange(num_vertices)  # 0-indexed
-        
-        # Get coordinates of valid pixels
-        ys, xs = np.nonzero(mask)
-        
-        # Compute vertices
-        vx = (xs - width_px * 0.5) * scale_x
-        vy = -(ys - height_px * 0.5) * scale_y # Flipped Y to match vispy coords
-        vz = np.zeros(num_vertices, dtype=np.float32)
-        vertices = np.stack([vx, vy, vz], axis=-1).astype(np.float32)
-        
-        # Compute UVs
-        u = xs / (width_px - 1.0)
-        v = 1.0 - ys / (height_px - 1.0) # Flipped Y for texture mapping
+        u = points[:, 0] / width_px
+        v = 1.0 - points[:, 1] / height_px # Flipped Y for texture mapping
+        vertices = np.stack([(u - 0.5) * width_units, (v - 0.5) * height_units, np.zeros_like(u)], axis=-1).astype(np.float32)
         texcoords = np.stack([u, v], axis=-1).astype(np.float32)
-        
-        # Compute normals
-        normals = np.zeros_like(vertices, dtype=np.float32)
+        normals = np.zeros_like(vertices)
         normals[:, 2] = 1.0  # Pointing +Z
-        
-        # Find valid quads (cells where all 4 corners are opaque)
-        mask_down = mask[1:, :]
-        mask_right = mask[:, 1:]
-        mask_diag = mask[1:, 1:]
-        mask_tl = mask[:-1, :-1]
-        
-        valid_quads = mask_tl & mask_right[:-1, :] & mask_down[:, :-1] & mask_diag
-        qy, qx = np.nonzero(valid_quads)
-
-        if qy.size == 0:
-            print("Warning: No valid quads found. Result will be a point cloud (no faces).")
-            faces = np.empty((0, 3), dtype=np.uint32)
-        else:
-            # Get vertex indices for the top-left corner of each quad
-            idx = indices
-            v1 = idx[qy, qx]          # Top-left
-            v2 = idx[qy, qx + 1]      # Top-right
-            v3 = idx[qy + 1, qx + 1]  # Bottom-right
-            v4 = idx[qy + 1, qx]      # Bottom-left
-            
-            # Create two triangles per quad
-            tri1 = np.stack([v1, v2, v3], axis=-1)
-            tri2 = np.stack([v1, v3, v4], axis=-1)
-            faces = np.concatenate([tri1, tri2], axis=0).astype(np.uint32)
-        
+        faces = faces.astype(np.uint32)
+
         # Create new MeshData
         new_md = MeshData(vertices=vertices, faces=faces)
         new_md._vertex_normals = normals
@@ -211,3 +187,66 @@ class CSprite(CGeometry):
         
         self._visual.update()
 
+        # The mesh is drawn unindexed: every face uploads 3 positions, normals
+        # (shading filter) and texcoords (texture filter) as float32
+        stats = {
+            'vertices': len(vertices),
+            'faces': len(faces),
+            'bytes': len(faces) * 3 * (12 + 12 + 8),
+            'ms': (time.perf_counter() - start) * 1000.0,
+        }
+        print(f"Cutout ({mode}): {stats['vertices']} vertices, {stats['faces']} triangles, "
+              f"{stats['bytes'] / 1024:.0f} KB, {stats['ms']:.0f} ms")
+        return stats
+
+
+def _contour_mesh(alpha, threshold, tolerance):
+    """Alpha outline as triangulated polygons: (N x 2 points in pixels, M x 3 faces)."""
+    import contourpy
+    import mapbox_earcut as earcut
+    from shapely.geometry import Polygon
+
+    # Transparent border so every outline closes; marching squares runs on pixel centers
+    z = np.pad(alpha.astype(np.float32), 1)
+    gen = contourpy.contour_generator(z=z, fill_type=contourpy.FillType.OuterOffset)
+    polygons, offsets = gen.filled(threshold, 256.0)
+
+    all_points, all_faces, count = [], [], 0
+    for points, offset in zip(polygons, offsets):
+        rings = [points[a:b] for a, b in zip(offset[:-1], offset[1:])]
+        shape = Polygon(rings[0], rings[1:]).simplify(tolerance, preserve_topology=True)
+        for poly in getattr(shape, 'geoms', [shape]):
+            if poly.is_empty or poly.area < 1.0:  # specks under a pixel
+                continue
+            rings = [np.asarray(poly.exterior.coords[:-1])] + [np.asarray(r.coords[:-1]) for r in poly.interiors]
+            flat = np.vstack(rings)
+            ring_ends = np.cumsum([len(r) for r in rings]).astype(np.uint32)
+            triangles = np.asarray(earcut.triangulate_float64(flat, ring_ends)).reshape(-1, 3)
+            all_points.append(flat)
+            all_faces.append(triangles + count)
+            count += len(flat)
+
+    if not all_points:
+        return None, np.empty((0, 3), dtype=np.uint32)
+    # Undo the padding, then move from pixel centers to pixel edges
+    return np.vstack(all_points) - 0.5, np.vstack(all_faces)
+
+
+def _grid_mesh(mask, step):
+    """Two triangles per step x step block holding an opaque pixel, sharing corner vertices."""
+    height_px, width_px = mask.shape
+    rows, cols = -(-height_px // step), -(-width_px // step)
+    blocks = np.zeros((rows * step, cols * step), dtype=bool)
+    blocks[:height_px, :width_px] = mask
+    cells = blocks.reshape(rows, step, cols, step).any(axis=(1, 3))
+    qy, qx = np.nonzero(cells)
+
+    # Corner (y, x) -> index, for the corners that are used only
+    corner = lambda y, x: y * (cols + 1) + x
+    v1, v2 = corner(qy, qx), corner(qy, qx + 1)  # Top-left, Top-right
+    v3, v4 = corner(qy + 1, qx + 1), corner(qy + 1, qx)  # Bottom-right, Bottom-left
+    faces = np.concatenate([np.stack([v1, v2, v3], axis=-1), np.stack([v1, v3, v4], axis=-1)])
+    used, faces = np.unique(faces, return_inverse=True)
+    cy, cx = np.divmod(used, cols + 1)
+    points = np.stack([np.minimum(cx * step, width_px), np.minimum(cy * step, height_px)], axis=-1).astype(np.float64)
+    return points, faces.reshape(-1, 3)
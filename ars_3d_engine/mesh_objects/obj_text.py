@@ -2,6 +2,8 @@ import numpy as np
 from vispy import scene
 
 from ars_3d_engine.mesh_objects.scene_objects import CGeometry
+from ars_3d_engine.mesh_objects.shared_mesh import SharedMesh
+from ars_3d_engine.mesh_objects.obj_primitive import MeshCache
 import pyvista as pv
 from vispy.geometry import MeshData
 from matplotlib import font_manager
@@ -13,6 +15,11 @@ from theme.fonts import font_icons as ic
 
 
 class CText3D(CGeometry):
+    glyph_cache = MeshCache(64.0)  # (font, char, depth, angle) -> extruded glyph at pen 0
+    _advances = {}  # (font, char) -> pen advance
+    _blank = set()  # (font, char) without an outline
+    _faces = {}  # font name -> freetype.Face
+
     def __init__(self, visual, name="Text3D", text="text", depth=0.5, angle=30.0, font_name="Dosis"):
         super().__init__(visual, name)
         self._text = text
@@ -25,7 +32,7 @@ class CText3D(CGeometry):
     @classmethod
     def create(cls, text="text", depth=0.5, color=(102/255, 108/255, 120/255, 1.0), translate=(0.0, 0.0, 0.0), name="Text3D", angle=30.0, font_name="Dosis"):
         md = CText3D._generate_mesh_data_with_breaking_angle(text, depth, angle, font_name)
-        v = scene.visuals.Mesh(meshdata=md, color=color, shading=None)
+        v = SharedMesh(meshdata=md, color=color, shading=None)
         
         obj = cls(v, name=name, text=text, depth=depth, angle=angle, font_name=font_name)
         obj.set_position(*translate)
@@ -41,141 +48,99 @@ class CText3D(CGeometry):
         }
 
     @staticmethod
-    def _generate_mesh_data_with_breaking_angle(text, depth, angle, font_name="Dosis"):
-        if not text or text.isspace():
-            return MeshData()
+    def _font_face(font_name):
+        face = CText3D._faces.get(font_name)
+        if face is None:
+            # Find font file and load it with freetype once per font
+            font_prop = font_manager.FontProperties(family=font_name)
+            face = freetype.Face(font_manager.findfont(font_prop))
+            face.set_char_size(48*2)  # default was 48*64
+            CText3D._faces[font_name] = face
+        return face
 
-        pv_mesh = None
-        
-        # Try custom font with freetype
-        if font_name:
+    @staticmethod
+    def _glyph(font_name, char, depth, angle):
+        """Extruded mesh of one character at pen position 0 (None for blanks) and its advance."""
+        key = (font_name, char, depth, angle)
+        advance = CText3D._advances.get(key[:2])
+        md = CText3D.glyph_cache.get(key)
+        if advance is not None and (md is not None or key[:2] in CText3D._blank):
+            return md, advance
+
+        face = CText3D._font_face(font_name)
+        face.load_char(char, freetype.FT_LOAD_NO_BITMAP)
+        outline = face.glyph.outline
+        advance = CText3D._advances[key[:2]] = face.glyph.advance.x / 64.0
+        md = CText3D._glyph_mesh(outline, depth, angle) if outline.n_points else None
+        if md is None:
+            CText3D._blank.add(key[:2])
+        else:
+            CText3D.glyph_cache.put(key, md)
+        return md, advance
+
+    @staticmethod
+    def _glyph_mesh(outline, depth, angle):
+        # Get contours from outline
+        points = np.array(outline.points, dtype=np.float64) / 64.0
+
+        # Collect contours for this character
+        char_contours = []
+        start = 0
+        for end in outline.contours:
+            contour_points = points[start:end+1]
+            if len(contour_points) >= 3:
+                char_contours.append(contour_points)
+            start = end + 1
+
+        # Build polygon with holes for this character
+        # Determine which contours are holes based on containment
+        # The largest contour is usually the exterior
+        contours_with_area = []
+        for contour in char_contours:
             try:
-                # Find font file
-                font_prop = font_manager.FontProperties(family=font_name)
-                font_path = font_manager.findfont(font_prop)
-                
-                # Load font with freetype
-                face = freetype.Face(font_path)
-                face.set_char_size(48*2)  # default was 48*64
-                
-                # Collect all character outlines
-                pen_x = 0
-                all_char_polys = []  # List of polygons per character
-                
-                for char in text:
-                    face.load_char(char, freetype.FT_LOAD_NO_BITMAP)
-                    outline = face.glyph.outline
-                    
-                    if outline.n_points == 0:
-                        pen_x += face.glyph.advance.x / 64.0
-                        continue
-                    
-                    # Get contours from outline
-                    points = np.array([(p[0]/64.0 + pen_x, p[1]/64.0) for p in outline.points])
-                    
-                    # Collect contours for this character
-                    char_contours = []
-                    start = 0
-                    for end in outline.contours:
-                        contour_points = points[start:end+1]
-                        if len(contour_points) >= 3:
-                            char_contours.append(contour_points)
-                        start = end + 1
-                    
-                    # Build polygon with holes for this character
-                    if char_contours:
-                        # Determine which contours are holes based on containment
-                        # The largest contour is usually the exterior
-                        contours_with_area = []
-                        for contour in char_contours:
-                            try:
-                                poly = ShapelyPolygon(contour)
-                                if poly.is_valid:
-                                    contours_with_area.append((poly.area, poly, contour))
-                            except:
-                                pass
-                        
-                        if contours_with_area:
-                            # Sort by area (largest first)
-                            contours_with_area.sort(key=lambda x: x[0], reverse=True)
-                            
-                            # The largest is the exterior
-                            exterior_contour = contours_with_area[0][2]
-                            exterior_poly = contours_with_area[0][1]
-                            
-                            # Check which other contours are inside (those are holes)
-                            holes = []
-                            for area, poly, contour in contours_with_area[1:]:
-                                # If this contour is inside the exterior, it's a hole
-                                if exterior_poly.contains(poly):
-                                    holes.append(contour)
-                            
-                            # Create polygon with exterior and holes
-                            try:
-                                if holes:
-                                    char_poly = ShapelyPolygon(exterior_contour, holes)
-                                else:
-                                    char_poly = ShapelyPolygon(exterior_contour)
-                                
-                                if char_poly.is_valid:
-                                    all_char_polys.append(char_poly)
-                            except:
-                                pass
-                    
-                    pen_x += face.glyph.advance.x / 64.0
-                
-                if all_char_polys:
-                    # Triangulate each polygon properly with earcut
-                    all_verts = []
-                    all_faces = []
-                    
-                    for poly in all_char_polys:
-                        # Get exterior ring
-                        exterior = np.array(poly.exterior.coords[:-1])
-                        
-                        # Get holes
-                        holes = []
-                        for interior in poly.interiors:
-                            holes.append(np.array(interior.coords[:-1]))
-                        
-                        # Flatten all vertices
-                        all_rings = [exterior] + holes
-                        vertices_flat = np.vstack(all_rings)
-                        
-                        # Create ring end indices (cumulative count of vertices for each ring)
-                        ring_ends = []
-                        cumulative = 0
-                        for ring in all_rings:
-                            cumulative += len(ring)
-                            ring_ends.append(cumulative)
-                        
-                        # Triangulate using earcut
-                        triangles = earcut.triangulate_float64(vertices_flat, ring_ends)
-                        
-                        # Add to global arrays
-                        vert_offset = len(all_verts)
-                        all_verts.extend(vertices_flat)
-                        
-                        triangles_array = np.array(triangles).reshape(-1, 3)
-                        all_faces.extend(triangles_array + vert_offset)
-                    
-                    if all_verts:
-                        verts_array = np.array(all_verts)
-                        verts_3d = np.c_[verts_array, np.zeros(len(verts_array))]
-                        faces_array = np.array(all_faces, dtype=np.int32)
-                        faces_pv = np.hstack([np.full((len(faces_array), 1), 3, dtype=np.int32), faces_array])
-                        
-                        mesh_2d = pv.PolyData(verts_3d, faces_pv)
-                        pv_mesh = mesh_2d.extrude((0, 0, depth), capping=True)
-                    
-                if pv_mesh is None or pv_mesh.n_points == 0:
-                    raise ValueError("Failed to generate mesh")
-                    
-            except Exception as e:
-                print(f"Custom font '{font_name}' failed: {e}")
-                raise  # Re-raise to prevent fallback
-
-        # Compute normals
+                poly = ShapelyPolygon(contour)
+                if poly.is_valid:
+                    contours_with_area.append((poly.area, poly, contour))
+            except:
+                pass
+        if not contours_with_area:
+            return None
+
+        # Sort by area (largest first)
+        contours_with_area.sort(key=lambda x: x[0], reverse=True)
+
+        # The largest is the exterior
+        exterior_contour = contours_with_area[0][2]
+        exterior_poly = contours_with_area[0][1]
+
+        # Check which other contours are inside (those are holes)
+        holes = []
+        for area, poly, contour in contours_with_area[1:]:
+            # If this contour is inside the exterior, it's a hole
+            if exterior_poly.contains(poly):
+                holes.append(contour)
+
+        # Create polygon with exterior and holes
+        try:
+            char_poly = ShapelyPolygon(exterior_contour, holes) if holes else ShapelyPolygon(exterior_contour)
+        except:
+            return None
+        if not char_poly.is_valid:
+            return None
+
+        # Triangulate the polygon with earcut
+        all_rings = [np.array(char_poly.exterior.coords[:-1])] + [np.array(i.coords[:-1]) for i in char_poly.interiors]
+        vertices_flat = np.vstack(all_rings)
+        ring_ends = np.cumsum([len(ring) for ring in all_rings]).astype(np.uint32)  # vertex count up to the end of each ring
+        triangles = np.array(earcut.triangulate_float64(vertices_flat, ring_ends)).reshape(-1, 3)
+        if len(triangles) == 0:
+            return None
+
+        verts_3d = np.c_[vertices_flat, np.zeros(len(vertices_flat))]
+        faces_pv = np.hstack([np.full((len(triangles), 1), 3, dtype=np.int32), triangles.astype(np.int32)])
+        pv_mesh = pv.PolyData(verts_3d, faces_pv).extrude((0, 0, depth), capping=True)
+
+        # Compute normals (glyphs share no vertices, so per glyph is the same as over the whole text)
         pv_mesh.compute_normals(
             cell_normals=False,
             point_normals=True,
@@ -184,16 +149,39 @@ class CText3D(CGeometry):
             inplace=True,
         )
 
-        # Extract data for VisPy
-        vertices = pv_mesh.points.astype(np.float32)
-        faces = pv_mesh.faces.reshape(-1, 4)[:, 1:].astype(np.uint32)
-        normals = pv_mesh.point_normals.astype(np.float32)
+        md = MeshData(vertices=pv_mesh.points.astype(np.float32), faces=pv_mesh.faces.reshape(-1, 4)[:, 1:].astype(np.uint32))
+        md._vertex_normals = pv_mesh.point_normals.astype(np.float32)
+        return md
+
+    @staticmethod
+    def _generate_mesh_data_with_breaking_angle(text, depth, angle, font_name="Dosis"):
+        """Cached glyph meshes placed along the pen; only characters not seen
+        before with this font, depth and angle are triangulated."""
+        if not text or text.isspace():
+            return MeshData()
+
+        try:
+            pen_x = 0.0
+            glyphs = []
+            for char in text:
+                md, advance = CText3D._glyph(font_name, char, depth, angle)
+                if md is not None:
+                    glyphs.append((md, pen_x))
+                pen_x += advance
+            if not glyphs:
+                raise ValueError("Failed to generate mesh")
+        except Exception as e:
+            print(f"Custom font '{font_name}' failed: {e}")
+            raise  # Re-raise to prevent fallback
+
+        offsets = np.cumsum([0] + [len(md.get_vertices()) for md, _ in glyphs[:-1]])
+        vertices = np.concatenate([md.get_vertices() + np.float32((x, 0, 0)) for md, x in glyphs])
+        faces = np.concatenate([md.get_faces() + np.uint32(o) for (md, _), o in zip(glyphs, offsets)])
+        normals = np.concatenate([md._vertex_normals for md, _ in glyphs])
 
         # Create final MeshData
         md = MeshData(vertices=vertices, faces=faces)
-        if normals.shape[0] > 0:
-            md._vertex_normals = normals
-            
+        md._vertex_normals = normals
         return md
 
     def set_text(self, text: str) -> None:
@@ -0,0 +1,225 @@
+import numpy as np
+
+# Vectorized generators for the parametric primitives.
+# Each returns (vertices Nx3, faces Mx3, normals Nx3, uvs Nx2) with the primitive's
+# axis along +Y before `direction` is applied. Seams and hard edges get their own
+# vertices, so normals and UVs never need to be interpolated across them.
+
+TAU = 2.0 * np.pi
+
+
+def _grid_faces(rows: int, cols: int, offset: int = 0) -> np.ndarray:
+    """Two triangles per cell of a (rows + 1) x (cols + 1) vertex grid."""
+    r, c = np.mgrid[0:rows, 0:cols]
+    a = (r * (cols + 1) + c).ravel() + offset
+    b, d = a + 1, a + cols + 1
+    return np.concatenate([np.stack([a, d, b], axis=1), np.stack([b, d, d + 1], axis=1)])
+
+
+def _fan_faces(n: int, offset: int = 0) -> np.ndarray:
+    """Triangles from a center vertex (offset) to a ring of n + 1 vertices after it."""
+    i = np.arange(n) + offset + 1
+    return np.stack([np.full(n, offset), i, i + 1], axis=1)
+
+
+def _ring(n: int, start: float = 0.0, end: float = TAU) -> tuple[np.ndarray, np.ndarray]:
+    t = np.linspace(start, end, n + 1)
+    return np.cos(t), np.sin(t)
+
+
+def _polar_uv(x, z, radius):
+    return np.stack([0.5 + 0.5 * x / radius, 0.5 + 0.5 * z / radius], axis=-1)
+
+
+def _cap(radius: float, y: float, n: int, up: bool) -> tuple:
+    """Flat disc closing a cylinder or cone, facing +Y (up) or -Y."""
+    cx, cz = _ring(n)
+    vertices = np.concatenate([[[0.0, y, 0.0]], np.stack([cx * radius, np.full(n + 1, y), cz * radius], axis=1)])
+    normals = np.tile([0.0, 1.0 if up else -1.0, 0.0], (n + 2, 1))
+    return vertices, _fan_faces(n), normals, _polar_uv(vertices[:, 0], vertices[:, 2], radius)
+
+
+def _annulus(inner: float, outer: float, y: float, n: int, rings: int, up: bool) -> tuple:
+    r, (cx, cz) = np.linspace(inner, outer, rings + 1)[:, None], _ring(n)
+    vertices = np.stack([r * cx, np.full((rings + 1, n + 1), y), r * cz], axis=-1).reshape(-1, 3)
+    normals = np.tile([0.0, 1.0 if up else -1.0, 0.0], (len(vertices), 1))
+    return vertices, _grid_faces(rings, n), normals, _polar_uv(vertices[:, 0], vertices[:, 2], outer)
+
+
+def _merge(*parts) -> tuple:
+    vertices, faces, normals, uvs, offset = [], [], [], [], 0
+    for v, f, n, uv in parts:
+        vertices.append(v)
+        faces.append(f + offset)
+        normals.append(n)
+        uvs.append(uv)
+        offset += len(v)
+    return np.concatenate(vertices), np.concatenate(faces), np.concatenate(normals), np.concatenate(uvs)
+
+
+def axis_rotation(direction) -> np.ndarray:
+    """3x3 rotation taking +Y onto `direction` (shortest arc)."""
+    d = np.asarray(direction, dtype=np.float64)
+    d = d / (np.linalg.norm(d) or 1.0)
+    y = np.array([0.0, 1.0, 0.0])
+    axis, c = np.cross(y, d), float(np.dot(y, d))
+    if np.linalg.norm(axis) < 1e-9:
+        return np.eye(3) if c > 0 else np.diag([1.0, -1.0, -1.0])  # half turn about X
+    k = np.array([[0.0, -axis[2], axis[1]], [axis[2], 0.0, -axis[0]], [-axis[1], axis[0], 0.0]])
+    return np.eye(3) + k + k @ k / (1.0 + c)
+
+
+def _align(vertices, normals, direction) -> tuple:
+    rot = axis_rotation(direction)
+    return vertices @ rot.T, normals @ rot.T
+
+
+def _flat(vertices, faces, uvs) -> tuple:
+    """Unshare vertices so each face gets its own, with the face normal."""
+    tri = vertices[faces]
+    fn = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    fn /= np.maximum(np.linalg.norm(fn, axis=1, keepdims=True), 1e-12)
+    return (tri.reshape(-1, 3), np.arange(faces.size).reshape(-1, 3),
+            np.repeat(fn, 3, axis=0), uvs[faces].reshape(-1, 2))
+
+
+def _finish(vertices, faces, normals, uvs) -> tuple:
+    # Drop the zero-area triangles of collapsed grid rows (poles, apex, disc center)
+    # and wind every face counter-clockwise around its vertex normals.
+    tri = vertices[faces]
+    fn = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    keep = np.linalg.norm(fn, axis=1) > 1e-12
+    faces, fn = faces[keep], fn[keep]
+    flip = np.einsum('ij,ij->i', fn, normals[faces].sum(axis=1)) < 0
+    faces[flip] = faces[flip][:, ::-1]
+    return (vertices.astype(np.float32), faces.astype(np.uint32),
+            normals.astype(np.float32), uvs.astype(np.float32))
+
+
+def sphere(radius=1.0, lod=30, slice_start=0.0, direction=(0, 1, 0)) -> tuple:
+    n = max(int(lod), 3)
+    u, v = np.meshgrid(np.linspace(slice_start / 360.0, 1.0, n + 1), np.linspace(0.0, 1.0, n + 1))
+    lon, lat = (0.5 - u) * TAU, (v - 0.5) * np.pi  # u = 0.5 faces +Z
+    normals = np.stack([np.cos(lat) * np.sin(lon), np.sin(lat), np.cos(lat) * np.cos(lon)], axis=-1).reshape(-1, 3)
+    vertices, normals = _align(normals * radius, normals, direction)
+    return _finish(vertices, _grid_faces(n, n), normals, np.stack([u.ravel(), v.ravel()], axis=-1))
+
+
+def cube(width=2.0, height=2.0, depth=2.0) -> tuple:
+    half = np.array([width, height, depth], dtype=np.float64) / 2.0
+    parts = []
+    # (normal axis, u axis, v axis) per face pair, same box mapping as the UV unwrap
+    for axis, ua, va in ((0, 2, 1), (1, 0, 2), (2, 0, 1)):
+        for sign in (1.0, -1.0):
+            uv = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+            vertices = np.zeros((4, 3))
+            vertices[:, axis] = sign * half[axis]
+            vertices[:, ua] = (uv[:, 0] * 2.0 - 1.0) * half[ua]
+            vertices[:, va] = (uv[:, 1] * 2.0 - 1.0) * half[va]
+            normals = np.zeros((4, 3))
+            normals[:, axis] = sign
+            parts.append((vertices, _grid_faces(1, 1), normals, uv))
+    return _finish(*_merge(*parts))
+
+
+def plane(width=2.0, height=2.0, direction=(0, 1, 0)) -> tuple:
+    u, v = np.meshgrid([0.0, 1.0], [0.0, 1.0])
+    vertices = np.stack([(u - 0.5) * width, np.zeros_like(u), (v - 0.5) * height], axis=-1).reshape(-1, 3)
+    normals = np.tile([0.0, 1.0, 0.0], (4, 1))
+    vertices, normals = _align(vertices, normals, direction)
+    scale = max(width, height) or 1.0  # keep the aspect ratio in UV space
+    return _finish(vertices, _grid_faces(1, 1), normals, np.stack([u.ravel() * width, v.ravel() * height], axis=-1) / scale)
+
+
+def _tube(radius, height, n, inward=False) -> tuple:
+    cx, cz = _ring(n, -np.pi, np.pi)  # u = 0.5 + atan2(z, x) / 2pi
+    vertices = np.concatenate([np.stack([cx * radius, np.full(n + 1, y), cz * radius], axis=1) for y in (-height / 2, height / 2)])
+    normals = np.tile(np.stack([cx, np.zeros(n + 1), cz], axis=1), (2, 1)) * (-1.0 if inward else 1.0)
+    uvs = np.stack([np.tile(np.linspace(0.0, 1.0, n + 1), 2), np.repeat([0.0, 1.0], n + 1)], axis=1)
+    return vertices, _grid_faces(1, n), normals, uvs
+
+
+def cylinder(radius=1.0, height=2.0, lod=30, radius_inner=0.0, direction=(0, 1, 0)) -> tuple:
+    n = max(int(lod), 3)
+    if radius_inner < 0.005:
+        parts = (_tube(radius, height, n), _cap(radius, height / 2, n, True), _cap(radius, -height / 2, n, False))
+    else:
+        parts = (_tube(radius, height, n), _tube(radius_inner, height, n, inward=True),
+                 _annulus(radius_inner, radius, height / 2, n, 1, True), _annulus(radius_inner, radius, -height / 2, n, 1, False))
+    vertices, faces, normals, uvs = _merge(*parts)
+    vertices, normals = _align(vertices, normals, direction)
+    return _finish(vertices, faces, normals, uvs)
+
+
+def _cone_parts(radius, height, n, start=-np.pi) -> tuple:
+    cx, cz = _ring(n, start, start + TAU)
+    ring = np.stack([cx * radius, np.full(n + 1, -height / 2), cz * radius], axis=1)
+    apex = np.tile([0.0, height / 2, 0.0], (n + 1, 1))  # one apex per segment, each with its own normal
+    side_normal = np.stack([cx * height, np.full(n + 1, radius), cz * height], axis=1)
+    side_normal /= np.linalg.norm(side_normal, axis=1, keepdims=True)
+    uvs = np.stack([np.tile(np.linspace(0.0, 1.0, n + 1), 2), np.repeat([0.0, 1.0], n + 1)], axis=1)
+    side = (np.concatenate([ring, apex]), _grid_faces(1, n), np.tile(side_normal, (2, 1)), uvs)
+    return side, _cap(radius, -height / 2, n, False)
+
+
+def cone(radius=1.0, height=2.0, lod=30, direction=(0, 1, 0)) -> tuple:
+    vertices, faces, normals, uvs = _merge(*_cone_parts(radius, height, max(int(lod), 3)))
+    vertices, normals = _align(vertices, normals, direction)
+    return _finish(vertices, faces, normals, uvs)
+
+
+def pyramid(radius=1.0, height=2.0, direction=(0, 1, 0)) -> tuple:
+    # Four-sided cone, corners on the diagonals so the base edges are axis aligned
+    vertices, faces, normals, uvs = _finish(*_merge(*_cone_parts(radius, height, 4, start=np.pi / 4)))
+    vertices, faces, normals, uvs = _flat(vertices, faces.astype(np.int64), uvs)
+    vertices, normals = _align(vertices, normals, direction)
+    return _finish(vertices, faces, normals, uvs)
+
+
+def disc(radius=1.0, radius_inner=0.0, lod=30, direction=(0, 1, 0)) -> tuple:
+    n = max(int(lod), 3)
+    if radius_inner == radius:
+        radius += 0.01  # Avoid zero-area disc
+    vertices, faces, normals, uvs = _annulus(radius_inner, radius, 0.0, n, n, True)
+    vertices, normals = _align(vertices, normals, direction)
+    return _finish(vertices, faces, normals, uvs)
+
+
+def torus(radius=1.0, radius_inner=0.0, lod=30) -> tuple:
+    n = max(int(lod), 3)
+    cross = radius_inner if radius_inner > 0 else 0.01
+    u, v = np.meshgrid(np.linspace(0.0, 1.0, n + 1), np.linspace(0.0, 1.0, n + 1))
+    theta, phi = u * TAU, v * TAU - np.pi  # around the ring axis (Y), around the tube
+    normals = np.stack([np.cos(phi) * np.sin(theta), np.sin(phi), np.cos(phi) * np.cos(theta)], axis=-1).reshape(-1, 3)
+    center = np.stack([np.sin(theta), np.zeros_like(theta), np.cos(theta)], axis=-1).reshape(-1, 3) * radius
+    return _finish(center + normals * cross, _grid_faces(n, n), normals, np.stack([u.ravel(), v.ravel()], axis=-1))
+
+
+def generate(primitive_type='sphere', **params) -> tuple:
+    """(vertices, faces, normals, uvs) for a primitive, same parameters as CPrimitive.create."""
+    radius = params.get('radius', 1.0)
+    width = params.get('width', 2.0)
+    height = params.get('height', 2.0)
+    depth = params.get('depth', 2.0)
+    lod = params.get('lod', 30)
+    direction = params.get('direction', (0, 1, 0))
+    slice_start = params.get('slice_start', 0)
+    radius_inner = params.get('radius_inner', 0.0)
+
+    if primitive_type == 'sphere':
+        return sphere(radius, lod, slice_start, direction)
+    if primitive_type == 'cube':
+        return cube(width, height, depth)
+    if primitive_type == 'plane':
+        return plane(width, height, direction)
+    if primitive_type == 'cylinder':
+        return cylinder(radius, height, lod, radius_inner, direction)
+    if primitive_type == 'cone':
+        return cone(radius, height, lod, direction)
+    if primitive_type == 'pyramid':
+        return pyramid(radius, height, direction)
+    if primitive_type == 'disc':
+        return disc(radius, radius_inner, lod, direction)
+    if primitive_type == 'torus':
+        return torus(radius, radius_inner, lod)
+    raise ValueError(f"Unknown primitive type: {primitive_type}")
@@ -1,13 +1,16 @@
 from abc import ABC
+import weakref
 import numpy as np
 from vispy import scene
 from vispy.scene import transforms
 from vispy.visuals.transforms import NullTransform
 from vispy.visuals.filters import ShadingFilter
 from vispy.geometry import MeshData  
-from vispy.io import imread 
 from vispy.visuals.filters import TextureFilter 
 from theme.fonts import font_icons as ic
+from ars_3d_engine.mesh_objects.shared_mesh import SharedMesh
+from core.texture_loader import texture_loader
+from ars_3d_engine.logic.texture_cache import texture_cache
 
 class CGeometry(ABC):
 
@@ -36,6 +39,10 @@ class CGeometry(ABC):
         self.workflow = None
         self.resolution = (512, 512)
         self.texture_path = None
+        self._texture_shared = False  # texture_filter's GPU texture is also used by a clone
+        self._own_texture = None  # (Texture2D, shape, dtype) written in place by set_texture_data
+        self._texture_ref = None  # releases the texture cache entry shown, see _hold_texture
+        self._texture_key = None
 
         self.symbol = ic.ICON_OBJ_BBOX
 
@@ -204,42 +211,128 @@ class CGeometry(ABC):
 
 
 
-    def set_texture(self, image_path: str) -> None:
-        """Apply a texture to the mesh from an image file path. Requires the mesh to have texture coordinates."""
-        # Use the *new* mesh_data attached to the visual
-        current_mesh_data = self._visual.mesh_data
-        texcoords = getattr(current_mesh_data, '_vertex_tex_coords', None)
-        
+    def set_texture(self, image_path: str, image: np.ndarray = None) -> bool:
+        """Apply a texture to the mesh from an image file path. Requires the mesh to have texture coordinates.
+        The GPU texture comes from the texture cache, shared with everything showing the same file."""
+        texcoords = self._texcoords()
         if texcoords is None:
-            print("Mesh does not have texture coordinates. Cannot apply texture.")
-            return
-        if texcoords.ndim != 2 or texcoords.shape[-1] not in (2, 3):
-            print("Texture coordinates must be a 2D array with last dimension 2 or 3.")
-            return
-        
-        # Remove old texture filter if it exists
-        if hasattr(self, 'texture_filter') and self.texture_filter is not None:
-            self._visual.detach(self.texture_filter)
-            self.texture_filter = None
-        
-        texcoords_to_use = texcoords[:, :2] if texcoords.shape[-1] == 3 else texcoords
-        
+            return False
         try:
-            image = imread(image_path)
+            key, texture = texture_cache().acquire(image_path, image)
         except FileNotFoundError:
             print(f"Error: Texture file not found at {image_path}")
-            return
+            return False
         except Exception as e:
             print(f"Error reading texture file {image_path}: {e}")
+            return False
+
+        self._attach_texture(texture, texcoords)
+        self._hold_texture(key)
+        self.texture_path = image_path  # Store the texture path
+        return True
+
+    def set_texture_async(self, source, callback=None) -> None:
+        """set_texture with the decoding on a worker thread. `source` is a file path
+        (stored as texture_path once applied) or encoded image bytes (a preview).
+        Only the newest pending image of this object gets uploaded."""
+        if isinstance(source, str) and texture_cache().contains(source):
+            texture_loader().cancel(self)
+            if self.set_texture(source) and callback: callback()  # cached, nothing to decode
             return
 
-        image = np.flipud(image) 
+        def apply(image):
+            if isinstance(source, str):
+                applied = self.set_texture(source, image)
+            else:
+                applied = self.set_texture_data(image, bottom_up=True)
+            if applied and callback: callback()
+        texture_loader().load(self, source, apply, flip=True)
+
+    def _texcoords(self):
+        # Use the *new* mesh_data attached to the visual
+        texcoords = getattr(self._visual.mesh_data, '_vertex_tex_coords', None)
+        if texcoords is None:
+            print("Mesh does not have texture coordinates. Cannot apply texture.")
+            return None
+        if texcoords.ndim != 2 or texcoords.shape[-1] not in (2, 3):
+            print("Texture coordinates must be a 2D array with last dimension 2 or 3.")
+            return None
+        return texcoords[:, :2] if texcoords.shape[-1] == 3 else texcoords
+
+    def _attach_texture(self, texture, texcoords) -> None:
+        """Show an existing GPU texture. Nothing is decoded and no second copy of the
+        image goes to the GPU; this mesh uploads only its texcoords (and a 1x1 placeholder)."""
+        if getattr(self, 'texture_filter', None) is not None:
+            self._visual.detach(self.texture_filter)
+
+        # 1x1 placeholder, swapped for the shared Texture2D before the first draw.
+        # flt.texture keeps returning the placeholder; the texture drawn is fshader['u_texture'].value
+        flt = TextureFilter(np.zeros((1, 1, 4), dtype=np.float32), texcoords)
+        flt.fshader['u_texture'] = texture
+        self.texture_filter = flt
+        self._own_texture = None
+        self._texture_shared = True  # never written into in place
+        self._visual.attach(flt)
+        self._visual.update()
+
+    def _hold_texture(self, key) -> None:
+        """Count this object as a user of texture cache entry `key` (None: of no entry)
+        until it shows another texture or is garbage collected."""
+        if self._texture_ref is not None:
+            self._texture_ref()  # releases the previous entry
+        self._texture_ref = weakref.finalize(self, texture_cache().release, key) if key else None
+        self._texture_key = key
+
+    def set_texture_data(self, image: np.ndarray, bottom_up: bool = False) -> bool:
+        """Apply an already decoded image (rows top-down, as read from disk) as the mesh texture.
+        Does not touch texture_path, so in-memory previews never replace the file-backed texture.
+        An image of the same size as the current texture is uploaded into it in place."""
+        texcoords_to_use = self._texcoords()
+        if texcoords_to_use is None:
+            return False
+
+        if not bottom_up: image = np.flipud(image)
         if image.ndim == 2:  image = image[..., np.newaxis]
+
+        flt = getattr(self, 'texture_filter', None)
+        own = self._own_texture
+        if flt is not None and own is not None and not self._texture_shared \
+                and own[1] == image.shape and own[2] == image.dtype:
+            # Same size: glTexSubImage into the existing texture, no new filter or shader rebuild
+            own[0].set_data(image)
+            if not np.may_share_memory(flt.texcoords, texcoords_to_use):
+                flt.texcoords = texcoords_to_use
+            self._visual.update()
+            return True
+
+        # Remove old texture filter if it exists
+        if flt is not None:
+            self._visual.detach(flt)
+            self.texture_filter = None
+
+        self._texture_shared = False
+        self._hold_texture(None)  # its own texture now, not a cached file
         self.texture_filter = TextureFilter(image, texcoords_to_use)
+        self._own_texture = (self.texture_filter.fshader['u_texture'].value, image.shape, image.dtype)
         self._visual.attach(self.texture_filter)
         self._visual.update()
+        return True
 
-        self.texture_path = image_path  # Store the texture path
+    def share_texture(self, other: "CGeometry") -> None:
+        """Draw from `other`'s GPU texture, see _attach_texture."""
+        texcoords = self._texcoords()
+        if texcoords is None:
+            return
+        if other.texture_filter is None:
+            self.set_texture(other.texture_path)
+            return
+
+        self._attach_texture(other.texture_filter.fshader['u_texture'].value, texcoords)
+        if other._texture_key:
+            texture_cache().retain(other._texture_key)
+        self._hold_texture(other._texture_key)
+        self.texture_path = other.texture_path
+        other._texture_shared = True  # neither may write into it in place now
 
     def get_params(self):
         """
@@ -253,30 +346,20 @@ class CGeometry(ABC):
         Create a deep copy of this geometry object.
         Subclasses can override get_params() to provide their specific constructor parameters.
         """
-        # Copy mesh data
-        md = self._visual.mesh_data
-        verts = md.get_vertices().copy() if md.get_vertices() is not None else None
-        faces = md.get_faces().copy() if md.get_faces() is not None else None
-        normals = getattr(md, '_vertex_normals', None)
-        if normals is not None:
-            normals = normals.copy()
-        texcoords = getattr(md, '_vertex_tex_coords', None)
-        if texcoords is not None:
-            texcoords = texcoords.copy()
-
-        # Create new MeshData
-        new_md = MeshData(vertices=verts, faces=faces)
-        if normals is not None:
-            new_md._vertex_normals = normals.astype(np.float32)
-        if texcoords is not None:
-            new_md._vertex_tex_coords = texcoords.astype(np.float32)
-
-        # Create new visual with the new MeshData
-        new_visual = scene.visuals.Mesh(
-            meshdata=new_md,
-            color=self.get_color(),
-            shading=None  # Shading will be set later
-        )
+        new_visual = SharedMesh(color=self.get_color(), shading=None)  # Shading will be set later
+        if isinstance(self._visual, SharedMesh):
+            # Same MeshData and GPU vertex buffer; the first edit on either side splits them
+            new_visual.share_geometry(self._visual)
+        else:
+            md = self._visual.mesh_data
+            new_md = MeshData(vertices=md.get_vertices().copy(), faces=md.get_faces().copy())
+            normals = getattr(md, '_vertex_normals', None)
+            if normals is not None:
+                new_md._vertex_normals = normals.astype(np.float32)
+            texcoords = getattr(md, '_vertex_tex_coords', None)
+            if texcoords is not None:
+                new_md._vertex_tex_coords = texcoords.astype(np.float32)
+            new_visual.set_data(meshdata=new_md)
 
         # Get subclass-specific parameters
         clone_params = self.get_params()
@@ -285,11 +368,9 @@ class CGeometry(ABC):
         # Create new object of the same class type
         new_obj = type(self)(new_visual, **clone_params)
 
-        # Copy texture if applied
+        # Share the texture if applied (same GPU texture: no decode, no second copy of the image)
         if hasattr(self, 'texture_filter') and self.texture_filter is not None and self.texture_path:
-            # We can't just copy the filter, we need to re-apply the texture
-            # using the new mesh's texcoords.
-            new_obj.set_texture(self.texture_path)
+            new_obj.share_texture(self)
         
         # Copy position (translation)
         new_obj.set_position(*self.get_position())
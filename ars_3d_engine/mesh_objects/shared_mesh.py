@@ -0,0 +1,60 @@
+import weakref
+import numpy as np
+from vispy import scene
+from vispy.gloo import VertexBuffer
+
+
+class SharedMesh(scene.visuals.Mesh):
+    """Mesh visual whose geometry can be shared between clones.
+
+    share_geometry() points this visual at another one's MeshData and GPU vertex
+    buffer, so N copies of a mesh keep one set of arrays and one buffer. The first
+    set_data() on any member gives that visual its own buffer again (copy-on-write);
+    the MeshData itself is never edited in place, edits always bring a new one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._share_group = None  # WeakSet of visuals drawing from the same buffer
+        super().__init__(*args, **kwargs)
+
+    @property
+    def is_shared(self) -> bool:
+        return self._share_group is not None and len(self._share_group) > 1
+
+    def share_geometry(self, other: "SharedMesh") -> None:
+        self._unshare()
+        if other._share_group is None:
+            other._share_group = weakref.WeakSet([other])
+        other._share_group.add(self)
+        self._share_group = other._share_group
+        self._vertices = other._vertices
+        super().set_data(meshdata=other.mesh_data)
+
+    def _unshare(self) -> None:
+        if self._share_group is None:
+            return
+        self._share_group.discard(self)
+        self._share_group = None
+        self._vertices = VertexBuffer(np.zeros((0, 3), dtype=np.float32))
+
+    def set_data(self, *args, **kwargs):
+        self._unshare()  # copy-on-write: never upload new geometry into a shared buffer
+        super().set_data(*args, **kwargs)
+
+    def set_shared_data(self, meshdata) -> None:
+        """Replace the geometry of every visual in the share group (LOD switches):
+        one upload into the shared buffer, and the group keeps sharing it."""
+        members = list(self._share_group) if self._share_group is not None else [self]
+        for visual in members:
+            visual._meshdata = meshdata
+            visual._bounds = meshdata.get_bounds()
+        self._update_data()  # uploads into the buffer all members draw from
+        for visual in members:
+            if visual is self:
+                visual.update()
+            elif meshdata.has_vertex_color() or meshdata.has_face_color():
+                visual.mesh_data_changed()  # per-vertex colors live in each visual's own buffer
+            else:
+                # Filters (shading, G-buffer) keep per-face buffers and rebuild them on this event
+                visual.events.data_updated()
+                visual.update()
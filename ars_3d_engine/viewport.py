@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QApplication
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QApplication, QRubberBand
 from PyQt6 import QtCore
 from vispy import scene
 import numpy as np
@@ -33,7 +33,7 @@ class ViewportWidget(QWidget):
         cam.view_changed()
         self.cam = cam
         
-        self._objectManager = CObjectManager(self._view, self._canvas, None, CPickingManager(self._canvas))
+        self._objectManager = CObjectManager(self._view, self._canvas, None, CPickingManager(self._canvas, self._view))
 
         # GIZMO SETUP
         gizmo_node = scene.Node(parent=self._view.scene)
@@ -154,9 +154,17 @@ class ViewportWidget(QWidget):
 
         @self._canvas.events.mouse_move.connect
         def on_mouse_move(event):
+            # Rubber-band selection owns the mouse until release
+            if self._box_origin is not None:
+                self._update_box_select(event.pos)
+                return
+
             # Let the controller update its internal state based on mouse movement
             controller.handle_mouse_move(event)
 
+            if not controller._dragging and not event.buttons:
+                self._update_hover(event.pos)
+
             # If the gizmo is not being dragged, just ensure the camera is interactive and do nothing else.
             if not controller._dragging:
                 self._view.camera.interactive = True
@@ -169,6 +177,10 @@ class ViewportWidget(QWidget):
 
         @self._canvas.events.mouse_release.connect
         def on_mouse_release(event):
+            if self._box_origin is not None:
+                self._finish_box_select(event.pos)
+                return
+
             # If a drag operation was in progress, commit the new scale
             # by updating the baseline scale for the next operation.
             if controller._dragging and controller._drag_mode == 'scale':
@@ -194,7 +206,14 @@ class ViewportWidget(QWidget):
         self.grid.set_y_axis_visible(False)
         cam.update_callback = self._update_grid
 
+        # Helpers never take part in picking
+        self._objectManager.picking().exclude(self.grid_node, self.gizmo_node, self.bg)
+        self._box_origin = None
+        self._rubber_band = None
+        self._objectManager.hovered_changed.connect(self._on_hovered_changed)
+
         self.attach_headlight(self._objectManager)
+        self.attach_lod(self._objectManager)
 
 
         layout = QVBoxLayout()
@@ -232,6 +251,11 @@ class ViewportWidget(QWidget):
                 update_lights()
 
 
+    def attach_lod(self, manager):
+        # Level of detail follows the camera, same hook as the headlight
+        old_callback = self._view.camera.update_callback
+        self._view.camera.update_callback = lambda: (old_callback() if old_callback else None, manager.lod().update())
+
     def remove_object_at(self, index: int):
         obj = self._objectManager.remove_object_at(index)
         self._canvas.update()
@@ -259,6 +283,10 @@ class ViewportWidget(QWidget):
         # If the gizmo didn't handle it, proceed with object picking ONLY for left-clicks.
         if event.button != 1:
             return
+
+        if QApplication.keyboardModifiers() & QtCore.Qt.KeyboardModifier.ControlModifier:
+            self._start_box_select(event.pos)
+            return
             
         x, y = event.pos
         idx = self._objectManager.picking().pick_at(x, y)
@@ -290,6 +318,47 @@ class ViewportWidget(QWidget):
         self._canvas.update()
 
 
+    def _update_hover(self, pos):
+        # Reads the cached ID buffer; it is only re-rendered when the camera or scene changed
+        if np.any(getattr(self._view.camera, '_speed', 0)):
+            return
+        idx = self._objectManager.picking().pick_at(*pos)
+        self._objectManager.set_hovered(-1 if idx is None else idx)
+
+    def _on_hovered_changed(self, idx):
+        if idx >= 0:
+            self._canvas.native.setCursor(QtCore.Qt.CursorShape.PointingHandCursor)
+        else:
+            self._canvas.native.unsetCursor()
+
+    def _start_box_select(self, pos):
+        self._box_origin = QtCore.QPoint(int(pos[0]), int(pos[1]))
+        if self._rubber_band is None:
+            self._rubber_band = QRubberBand(QRubberBand.Shape.Rectangle, self._canvas.native)
+        self._rubber_band.setGeometry(QtCore.QRect(self._box_origin, QtCore.QSize()))
+        self._rubber_band.show()
+        self._view.camera.interactive = False
+
+    def _update_box_select(self, pos):
+        current = QtCore.QPoint(int(pos[0]), int(pos[1]))
+        self._rubber_band.setGeometry(QtCore.QRect(self._box_origin, current).normalized())
+
+    def _finish_box_select(self, pos):
+        origin = self._box_origin
+        self._box_origin = None
+        self._rubber_band.hide()
+        self._view.camera.interactive = True
+
+        om = self._objectManager
+        picked = om.picking().pick_rect(origin.x(), origin.y(), pos[0], pos[1])
+        if QApplication.keyboardModifiers() & QtCore.Qt.KeyboardModifier.ShiftModifier:
+            indices = om.selected_indices()
+            indices += [i for i in picked if i not in indices]
+            om.set_selection_state(indices, om.active_index())
+        else:
+            om.set_selection_state(picked, picked[0] if picked else None)
+        self._canvas.update()
+
     def _update_grid(self):
         cam_pos = self._view.camera.center
         self.grid.update_grid(cam_pos)
\ No newline at end of file
@@ -4,23 +4,14 @@ from ars_cmds.core_cmds.run_ext import run_ext
 from PyQt6.QtGui import QCursor
 
 
-import requests
-ckpt_list = []
-try:
-    response = requests.get("http://127.0.0.1:8188/system_stats", timeout=0.1)
-    if response.status_code == 200:
+from core.comfy_client import comfy_client
 
-        url = "http://127.0.0.1:8188/object_info"
-        response = requests.get(url)
-        data = response.json()
 
-        checkpoints = data['CheckpointLoaderSimple']['input']['required']['ckpt_name'][0]
-
-        ckpt_list=checkpoints
-        
-except:
-    pass
-    #print("Could not fetch ckpt list from ARS backend.")
+def get_ckpt_names(info):
+    try:
+        return info['input']['required']['ckpt_name'][0]
+    except (KeyError, IndexError, TypeError):
+        return []
 
 
 BBL_CKPTLIST_CONFIG={"symbol": ic.ICON_BRAIN}
@@ -28,6 +19,14 @@ def BBL_CKPTLIST(*args):
     run_ext(__file__)
 
 def execute_plugin(ars_window):
+    # The checkpoint list is fetched in the background; the menu opens once it arrives.
+    comfy_client().object_info(
+        "CheckpointLoaderSimple",
+        lambda info: open_ckpt_list(ars_window, get_ckpt_names(info)),
+        error_callback=lambda e: open_ckpt_list(ars_window, []),
+    )
+
+def open_ckpt_list(ars_window, ckpt_list):
     config = ContextMenuConfig()
     config.auto_close = False
     config.item_radius = 15
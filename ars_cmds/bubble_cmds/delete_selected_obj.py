@@ -46,8 +46,9 @@ def execute_plugin(ars_window):
         new_len = len(om._objects)
         om._active_idx = max(-1, min(om._active_idx, new_len - 1))
         
-        # Rebuild picking without removing visual yet
-        om._rebuild_picking()
+        # Drop its picking id and LOD levels; the visual stays for the delete animation
+        om.picking().unregister_object(obj)
+        om.lod().untrack(obj)
         
         # Emit signals
         om.object_removed.emit(index, obj)
@@ -40,7 +40,7 @@ def execute_plugin(ars_window):
         config2.close_on_outside = False
         config2.extra_distance = distance
 
-        items = [os.path.join(get_path("keyframes"),img) for img in os.listdir(get_path("keyframes"))]
+        items = [os.path.join(get_path("keyframes"),img) for img in os.listdir(get_path("keyframes")) if not img.startswith('.')]  # skip layer indices
 
         def define_img(img_path):
             ctx.update_item(keyframe, "image_path",  img_path)
@@ -9,8 +9,8 @@ import os
 from ars_cmds.util_cmds.delete_files import delete_all_files_in_folder
 from ars_cmds.render_cmds.check import check_queue
 from ars_cmds.core_cmds.key_check import key_check_continuous
-from PIL import Image
-from collections import Counter
+from core.frame_cache import FrameCache
+from core.tiff_layers import valid_layers
 
 BBL_VIDEO_CONFIG = {"symbol": ic.ICON_PLAYER_TRACK_NEXT}
 def BBL_VIDEO(*args):
@@ -33,26 +33,11 @@ def execute_plugin(ars_window):
         return False
 
     def get_valid_layers(tiff_path):
+        # Layers of the most common size, from the persisted layer index (no page walk)
         try:
-            img = Image.open(tiff_path)
-        except:
+            return valid_layers(tiff_path)
+        except Exception:
             return []
-        valid_layers = []
-        sizes = []
-        n_frames = getattr(img, 'n_frames', 1)
-        for i in range(n_frames):
-            img.seek(i)
-            sizes.append(img.size)
-        
-        if not sizes: return []
-        # Find most common size
-        most_common_size = Counter(sizes).most_common(1)[0][0]
-        
-        for i in range(n_frames):
-            if sizes[i] == most_common_size:
-                valid_layers.append(i)
-                
-        return valid_layers
 
     def get_cached_sequence():
         # Check for files first
@@ -98,6 +83,30 @@ def execute_plugin(ars_window):
             
         return None
 
+    def scan_frames():
+        # Runs when a watched folder changes, not on every frame
+        sequence = get_cached_sequence()
+        if sequence:
+            ars_window._frame_source = "tiff_sequence"
+            mtimes = {path: os.path.getmtime(path) for path, _ in sequence}
+            return [(path, layer, mtimes[path]) for path, layer in sequence]
+
+        images_path = get_path("video_frames") if os.listdir( get_path("video_frames") ) else get_path("frames")
+        ars_window._frame_source = images_path
+        with os.scandir(images_path) as it:
+            files = sorted((e.name, e.stat().st_mtime_ns) for e in it if e.name.lower().endswith(('.jpg', ".jpeg", ".png", ".webp")))
+        return [(os.path.join(images_path, name), None, mtime) for name, mtime in files]
+
+    # Decoded frames, read ahead on a worker thread while the player is open and playing
+    if getattr(ars_window, '_frame_cache', None) is None:
+        ars_window._frame_cache = FrameCache(scan_frames, [get_path("video_frames"), get_path("frames"), get_path("input")], parent=ars_window)
+    frames = ars_window._frame_cache
+    frames.resume()
+
+    def source_fps(fps):
+        # Dynamically adjust FPS based on directory
+        return fps / 4 if ars_window._frame_source == get_path("frames") else fps
+
 
     config = ContextMenuConfig()
     config.use_extended_shape_items = {"timeline": (ars_window.width() / (40), 1)} #40 stands for item diameter
@@ -138,6 +147,7 @@ def execute_plugin(ars_window):
         ic.ICON_SPEED_UP: 1,
     }
     config.per_item_radius = { "timeline": 20,}
+    config.callback_on_close = lambda: (pause_video(), frames.suspend())
 
 
     def pause_video():
@@ -146,6 +156,7 @@ def execute_plugin(ars_window):
             ars_window._loop_timer.stop()
             ars_window._loop_timer.deleteLater()
             ars_window._loop_timer = None
+            frames.suspend()  # no watching or read-ahead while paused
             print("Loop stopped")
             ctx.update_item(ic.ICON_PLAYER_PAUSE, "symbol", ic.ICON_PLAYER_PLAY)
 
@@ -158,29 +169,15 @@ def execute_plugin(ars_window):
         pause_video()
         
         val = int(val)
-
-        sequence = get_cached_sequence()
-        if sequence:
-            should_fit = check_source_changed("tiff_sequence")
-            max_index = len(sequence) - 1
-            image_index = int((val / 100) * max_index)
-            path, layer = sequence[image_index]
-            ars_window.img.open_image(path, layer=layer, auto_fit=should_fit)
-            ars_window._loop_index = image_index
+        frames.rescan()  # not watched while paused
+        if not len(frames):
             return
 
-        images_path = get_path("video_frames") if os.listdir( get_path("video_frames") ) else get_path("frames")
-        should_fit = check_source_changed(images_path)
-        images_list = os.listdir(images_path)
-        if not images_list:
-            return
-        
         # Map slider value (0-100) to image index (0 to len-1)
-        max_index = len(images_list) - 1
+        max_index = len(frames) - 1
         image_index = int((val / 100) * max_index)
-        selected_image = images_list[image_index]
-        image_path = os.path.join(images_path, selected_image)
-        ars_window.img.open_image(image_path, auto_fit=should_fit)
+        should_fit = check_source_changed(ars_window._frame_source)
+        ars_window.img.show_frame(frames.frame(image_index, wait=True), auto_fit=should_fit)
 
         ars_window._loop_index = image_index
 
@@ -193,58 +190,32 @@ def execute_plugin(ars_window):
         if pause_video(): return
 
         ctx.update_item(ic.ICON_PLAYER_PLAY, "symbol", ic.ICON_PLAYER_PAUSE)
+        frames.resume()
 
         fps = ctx.get_value(ic.ICON_SPEED_UP)
         
         
         def frame_next():
-            sequence = get_cached_sequence()
-            
-            if sequence:
-                should_fit = check_source_changed("tiff_sequence")
-                # Wrap index if list size changed
-                ars_window._loop_index = ars_window._loop_index % len(sequence)
-                
-                path, layer = sequence[ars_window._loop_index]
-                ars_window.img.open_image(path, layer=layer, auto_fit=should_fit)
-                ctx.update_item("timeline", "progress", (ars_window._loop_index / len(sequence)) * 100 )
-                
-                ars_window._loop_index = (ars_window._loop_index + 1) % len(sequence)
-                
-                current_fps = ctx.get_value(ic.ICON_SPEED_UP)
-                new_interval = int(1000 / current_fps)
-                if ars_window._loop_timer and ars_window._loop_timer.interval() != new_interval:
-                    ars_window._loop_timer.setInterval(new_interval)
+            if not len(frames):
                 return
 
-            images_path = get_path("video_frames") if os.listdir( get_path("video_frames") ) else get_path("frames")
-            should_fit = check_source_changed(images_path)
+            # Wrap index if list size changed
+            ars_window._loop_index = ars_window._loop_index % len(frames)
 
-            # Refresh image list every frame to detect changes
-            images_list = sorted([f for f in os.listdir(images_path) 
-                                 if f.lower().endswith(('.jpg', ".jpeg", ".png"))])
-            
-            if not images_list:
+            # Hold the current frame while the next one is still being decoded
+            image = frames.frame(ars_window._loop_index)
+            if image is None:
                 return
-            
-            # Wrap index if list size changed
-            ars_window._loop_index = ars_window._loop_index % len(images_list)
-            
-            # Load current frame
-            image_path = os.path.join(images_path, images_list[ars_window._loop_index])
-            ars_window.img.open_image(image_path, auto_fit=should_fit)
-            ctx.update_item("timeline", "progress", (ars_window._loop_index / len(images_list)) * 100 )
+
+            should_fit = check_source_changed(ars_window._frame_source)
+            ars_window.img.show_frame(image, auto_fit=should_fit)
+            ctx.update_item("timeline", "progress", (ars_window._loop_index / len(frames)) * 100 )
             
             # Move to next frame
-            ars_window._loop_index = (ars_window._loop_index + 1) % len(images_list)
+            ars_window._loop_index = (ars_window._loop_index + 1) % len(frames)
             
-            # Dynamically adjust FPS based on directory
-            current_fps = ctx.get_value(ic.ICON_SPEED_UP)
-            if images_path == get_path("frames"):
-                current_fps = ctx.get_value(ic.ICON_SPEED_UP) / 4
-
             # Update timer interval if it changed
-            new_interval = int(1000 / current_fps)
+            new_interval = int(1000 / source_fps(ctx.get_value(ic.ICON_SPEED_UP)))
             if ars_window._loop_timer and ars_window._loop_timer.interval() != new_interval:
                 ars_window._loop_timer.setInterval(new_interval)
         
@@ -253,19 +224,14 @@ def execute_plugin(ars_window):
         ars_window._loop_timer.timeout.connect(frame_next)
         
         # Initial interval calculation
-        sequence = get_cached_sequence()
-        if sequence:
-            initial_fps = fps
-        else:
-            initial_path = get_path("video_frames") if os.listdir( get_path("video_frames") ) else get_path("frames")
-            initial_fps = fps if initial_path != get_path("frames") else fps / 4
-        
+        initial_fps = source_fps(fps)
         interval = int(1000 / initial_fps)
         
         ars_window._loop_timer.start(interval)
         print(f"Loop started at {initial_fps} fps")
         
         # Show first frame immediately
+        frames.frame(ars_window._loop_index, wait=True)
         frame_next()
 
         
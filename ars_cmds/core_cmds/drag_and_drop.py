@@ -7,6 +7,7 @@ objs = ('.obj','.stl','.ply','.off','.dae','.glb','.gltf','.3mf')
 ars = (".arsp", ".arss",)
 
 from .run_ext import run_ext
+from .load_object import add_meshes
 
 def dd_drag(self, event):
 
@@ -43,11 +44,33 @@ def dd_drag(self, event):
 
 def dd_drop(self, event):
     files = [u.toLocalFile() for u in event.mimeData().urls()]
+    # Everything added synchronously lands as one batch (one tree update, one redraw);
+    # meshes come back from the importer afterwards and are added as a second batch
+    with self.viewport._objectManager.transaction():
+        drop_files(self, files)
+
+
+def drop_files(self, files):
+    ttip, sym = "", "?"
+
+    # Meshes load concurrently in worker processes and show up together
+    meshes = [f for f in files if f.endswith(objs)]
+    if meshes:
+        def on_progress(finished, total, failed):
+            if finished < total:
+                self.CF.UP("additional_text", f"Loading {finished + 1}/{total}", ic.ICON_FILE_3D, 0)
+            elif failed:
+                text = "Loading Failed!" if failed == total else f"{total - failed} Loaded, {failed} Failed!"
+                self.CF.UP("additional_text", text, ic.ICON_ALERT, 1000)
+            else:
+                self.CF.UP("additional_text", "Object Loaded!" if total == 1 else f"{total} Objects Loaded!", ic.ICON_FILE_CHECK, 1000)
+        add_meshes(meshes, animated=True, on_progress=on_progress)
+        ttip, sym = f"Loading 1/{len(meshes)}", ic.ICON_FILE_3D
+
     for f in files:
 
         if f.endswith(objs):
-            Bcmd.add_mesh(f, True)
-            ttip, sym = "Object Loaded!", ic.ICON_FILE_CHECK
+            continue
 
         elif f.endswith(imgs):
             Bcmd.load_bg_image(self,f)
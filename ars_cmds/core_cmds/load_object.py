@@ -4,8 +4,7 @@ from ars_3d_engine.mesh_objects.obj_mesh_loader import CMesh
 from ars_3d_engine.mesh_objects.obj_sprite import CSprite
 from ars_3d_engine.mesh_objects.obj_text import CText3D
 from ars_3d_engine.mesh_objects.obj_primitive import CPrimitive
-import trimesh 
-import tempfile
+from core.mesh_importer import mesh_importer
 from core.sound_manager import play_sound
 from PyQt6.QtCore import QTimer
 import time
@@ -16,89 +15,103 @@ from util_functions.ars_window import ars_window
 
 mesh_files = "(*.obj *.stl *.ply *.off *.dae *.glb *.gltf *.3mf)"
 
-def process_mesh_file(file_path):
-    ext = os.path.splitext(file_path)[1].lower()
-    
-    needs_conversion = True
-    if ext in ['.obj', '.stl', '.ply']:
-        if ext != '.obj': needs_conversion = False
-        else:
-            # Check if OBJ needs triangulation
-            needs_tri = False
-            with open(file_path, 'r') as f:
-                for line in f:
-                    if line.startswith('f '):
-                        parts = line.split()
-                        if len(parts) > 4:
-                            needs_tri = True
-                            break
-            needs_conversion = needs_tri
-    
-    if not needs_conversion:
-        return file_path
-    
-    # Load with trimesh (which handles triangulation) and export to temp OBJ
-    mesh = trimesh.load(file_path)
-    temp_fd, temp_path = tempfile.mkstemp(suffix='.obj')
-    os.close(temp_fd)
-    mesh.export(temp_path)
-    return temp_path
-
-def add_mesh(file_path=None, animated=False):
+def add_mesh(file_path=None, animated=False, callback=None):
+    """Add a mesh object, or a mesh file parsed in a worker process. Files are added
+    once parsed, callback(obj) then receives the object (None if it failed)."""
     window = ars_window()
     # Open file dialog for mesh selection
     if file_path is None:
         file_path, _ = QFileDialog.getOpenFileName(None, "Select Mesh", get_path("output"), f"Mesh Files {mesh_files}")
     
-    initial_y = 2 if animated else 0
-    if file_path is None:
+    if not file_path:
         print("No file path provided.")
         return
     
     elif isinstance(file_path, str):
-        # Process the file (triangulate or convert if needed)
-        processed_path = process_mesh_file(file_path)
-        name = os.path.splitext(os.path.basename(file_path))[0]
-        obj = CMesh.create(translate=(0, initial_y, 0), name=name, file_path=processed_path)
-    else:
-        obj = file_path
-        name = obj.name
+        # Parsed off the GUI thread, mapped from the mesh cache on every later load
+        add_meshes([file_path], animated=animated,
+                   callback=lambda objs: callback(objs[0] if objs else None) if callback else None)
+        return
+    
+    obj = file_path
         
     # Add to viewport
     window.viewport._objectManager.add_object(obj)
     window.viewport._view.camera.view_changed()
 
     if animated:
-        # Start the animation sequence after adding the object
-        def start_animation():
-            start_time = time.time()
-            duration = 0.150
-            
-            timer = QTimer()
-            
-            def update_position():
-                elapsed = time.time() - start_time
-                if elapsed >= duration:
-                    timer.stop()
-                    obj.set_position(0, 0, 0)
-                    play_sound("obj-drop-deep")
-                    window.viewport._view.camera.view_changed()
-                    return
-                
-                t = elapsed / duration
-                ease = t ** 2  # Ease-in quadratic
-                y = 2 - 2 * ease
-                obj.set_position(0, y, 0)
+        drop_animation(obj)
+
+    print(f"Added mesh: {obj.name}")
+    if callback: callback(obj)
+    return obj
+
+
+def drop_animation(obj):
+    window = ars_window()
+    # Start the animation sequence after adding the object
+    def start_animation():
+        start_time = time.time()
+        duration = 0.150
+        
+        timer = QTimer()
+        
+        def update_position():
+            elapsed = time.time() - start_time
+            if elapsed >= duration:
+                timer.stop()
+                obj.set_position(0, 0, 0)
+                play_sound("obj-drop-deep")
                 window.viewport._view.camera.view_changed()
+                return
             
-            timer.timeout.connect(update_position)
-            timer.start(10)  # Update every 10 ms for smooth animation
+            t = elapsed / duration
+            ease = t ** 2  # Ease-in quadratic
+            y = 2 - 2 * ease
+            obj.set_position(0, y, 0)
+            window.viewport._view.camera.view_changed()
         
-        # Wait 50 ms before starting the movement
-        QTimer.singleShot(50, start_animation)
+        timer.timeout.connect(update_position)
+        timer.start(10)  # Update every 10 ms for smooth animation
+    
+    # Wait 50 ms before starting the movement
+    QTimer.singleShot(50, start_animation)
 
-    print(f"Added mesh: {name}")
-    return obj
+
+def add_meshes(file_paths, animated=False, on_progress=None, callback=None):
+    """Load several mesh files concurrently in worker processes. Once the last one is done,
+    the parsed ones are added as one batch (one tree update, one redraw).
+    on_progress(finished, total, failed) is called on the GUI thread after every file,
+    callback(objs) with the added objects at the end."""
+    window = ars_window()
+    total, loaded, failed = len(file_paths), {}, []
+    if not total:
+        if callback: callback([])
+        return
+
+    def done(file_path, arrays=None):
+        if arrays is None:
+            failed.append(file_path)
+        else:
+            loaded[file_path] = arrays
+        finished = len(loaded) + len(failed)
+        if on_progress: on_progress(finished, total, len(failed))
+        if finished < total:
+            return
+
+        objs = [CMesh.from_arrays(loaded[f], translate=(0, 2 if animated else 0, 0), name=os.path.splitext(os.path.basename(f))[0])
+                for f in file_paths if f in loaded]
+        window.viewport._objectManager.add_objects(objs)
+        window.viewport._view.camera.view_changed()
+        for obj in objs:
+            if animated: drop_animation(obj)
+            print(f"Added mesh: {obj.name}")
+        if callback: callback(objs)
+
+    for file_path in file_paths:
+        mesh_importer().load(file_path,
+                             callback=lambda arrays, f=file_path: done(f, arrays),
+                             error_callback=lambda error, f=file_path: done(f))
 
 
 
@@ -48,8 +48,13 @@ def generate_mesh(self, ctx):
     queue_check_timer = QTimer()
     queue_check_timer.setInterval(1000)  # Check every 1 second
     
+    state = {'done': False, 'loading': False}
+
     def cleanup():
         """Clean up timers and watchers"""
+        if state['done']:
+            return
+        state['done'] = True
         try:
             self._mesh_watcher.directoryChanged.disconnect(on_directory_changed)
         except TypeError:
@@ -60,26 +65,46 @@ def generate_mesh(self, ctx):
         ctx.update_item(ic.ICON_RENDER, "progress_bar", 0)
         remove_bbox_loading_animation(timer)
     
-    def check_queue_status():
-        """Periodically check if queue is empty (generation completed or skipped)"""
-        if check_queue() == 0:
-            # Queue is empty, check if new file was created
-            current_files = set(os.listdir(mesh_dir))
-            new_files = current_files - initial_files
+    def on_queue_empty():
+        """Queue is empty (generation completed or skipped)"""
+        if state['done']:
+            return
+        # Queue is empty, check if new file was created
+        current_files = set(os.listdir(mesh_dir))
+        new_files = current_files - initial_files
+        
+        if new_files:
+            # New file was created; parsed in the background, a failed parse is retried on the next poll
+            if state['loading']:
+                return
+            new_file = new_files.pop()
+            print(f"New file detected: {new_file}")
+            state['loading'] = True
+            def loaded(mesh):
+                state['loading'] = False
+                if mesh: cleanup()
+            add_mesh(os.path.join(mesh_dir, new_file), animated=False, callback=loaded)
             
-            if new_files:
-                # New file was created
-                new_file = new_files.pop()
-                print(f"New file detected: {new_file}")
-                if add_mesh(os.path.join(mesh_dir, new_file), animated=False): cleanup()
-                
-            else:
-                # Queue is empty but no new file = generation was skipped
-                print("Generation skipped (likely duplicate prompt)")
-                cleanup()
+        else:
+            # Queue is empty but no new file = generation was skipped
+            print("Generation skipped (likely duplicate prompt)")
+            cleanup()
+
+    def check_queue_status():
+        """Periodically check if queue is empty (non-blocking, answered by on_queue_empty)"""
+        check_queue(callback=on_queue_empty, error_callback=on_queue_error)
+
+    def on_queue_error(error):
+        """Backend unreachable: stop waiting for a mesh that will not come"""
+        if state['done']:
+            return
+        cleanup()
+        self.msg("ComfyUI is not reachable")
     
     def on_directory_changed(path):
         """Handle directory changes (fast detection when file is created)"""
+        if state['loading']:
+            return  # the queue poll already picked it up
         current_files = set(os.listdir(mesh_dir))
         new_files = current_files - initial_files
         
@@ -88,8 +113,8 @@ def generate_mesh(self, ctx):
             new_file = new_files.pop()
             print(f"New file detected: {new_file}")
             cleanup()
-            mesh = add_mesh(os.path.join(mesh_dir, new_file), animated=False)
-            mesh.set_scale((2,2,2))
+            add_mesh(os.path.join(mesh_dir, new_file), animated=False,
+                     callback=lambda mesh: mesh.set_scale((2,2,2)) if mesh else None)
     # Connect signals
     self._mesh_watcher.directoryChanged.connect(on_directory_changed)
     queue_check_timer.timeout.connect(check_queue_status)
@@ -223,7 +223,7 @@ def obj_color(self, position, callback=None):
         if image_path == None:
             image_path, _ = QFileDialog.getOpenFileName(None, "Select Image", "", "Image Files (*.png *.jpg *.jpeg *.bmp)")
         if image_path:
-            obj.set_texture(image_path)
+            obj.set_texture_async(image_path)
             ctx.update_item(ic.ICON_IMAGE, "image_path", image_path)
 
 
@@ -4,7 +4,7 @@ from ars_cmds.core_cmds.key_check import key_check_continuous
 
 
 from PyQt6.QtGui import QCursor
-from PyQt6.QtCore import QPoint
+from PyQt6.QtCore import QPoint, QTimer
 
 def obj_primitive_ctx(self, position, callback):
 
@@ -82,18 +82,45 @@ def obj_primitive_ctx(self, position, callback):
     # ic.ICON_ANGLE:1,
     # }
 
-    config.callbackL = {
-        ic.ICON_AXIS_X: lambda val: obj.set_primitive_type(obj.primitive_type, width=val),
-        ic.ICON_AXIS_Y: lambda val: obj.set_primitive_type(obj.primitive_type, height=val),
-        ic.ICON_AXIS_Z: lambda val: obj.set_primitive_type(obj.primitive_type, depth=val),
-        ic.ICON_LOD3: lambda val: obj.set_primitive_type(obj.primitive_type, lod=int(val)),
-        ic.ICON_RADIUS: lambda val: obj.set_primitive_type(obj.primitive_type, radius=val),
-        ic.ICON_ANGLE: lambda val: obj.set_primitive_type(obj.primitive_type, slice_start=val),
-        ic.ICON_RADIUS_INNER: lambda val: obj.set_primitive_type(obj.primitive_type, radius_inner=val),
-
-        ic.ICON_CLOSE_RADIAL: lambda: (ctx.close(), callback(self)),
+    slider_params = {
+        ic.ICON_AXIS_X: 'width',
+        ic.ICON_AXIS_Y: 'height',
+        ic.ICON_AXIS_Z: 'depth',
+        ic.ICON_LOD3: 'lod',
+        ic.ICON_RADIUS: 'radius',
+        ic.ICON_ANGLE: 'slice_start',
+        ic.ICON_RADIUS_INNER: 'radius_inner',
     }
 
+    # While a slider is held: preview quality, at most one update per frame.
+    # On release: one full resolution rebuild.
+    pending = {}
+    frame_timer = QTimer(self.central_widget)
+    frame_timer.setSingleShot(True)
+    frame_timer.setInterval(16)
+
+    def flush_preview():
+        if pending:
+            obj.preview_primitive(**pending)
+            pending.clear()
+    frame_timer.timeout.connect(flush_preview)
+
+    def slider_value(key, val): return int(val) if key == 'lod' else val
+
+    def on_drag(key, val):
+        pending[key] = slider_value(key, val)
+        if not frame_timer.isActive(): frame_timer.start()
+
+    def on_release(key, val):
+        frame_timer.stop()
+        pending.clear()
+        obj.commit_primitive(**{key: slider_value(key, val)})
+
+    config.callbackL = {icon: (lambda val, key=key: on_drag(key, val)) for icon, key in slider_params.items()}
+    config.callbackL[ic.ICON_CLOSE_RADIAL] = lambda: (ctx.close(), callback(self))
+    config.callback_release = {icon: (lambda val, key=key: on_release(key, val)) for icon, key in slider_params.items()}
+    config.callback_on_close = lambda: (frame_timer.stop(), obj.commit_primitive())  # drop an unfinished preview
+
     def move_ctx():ctx.move(self.central_widget.mapFromGlobal(QCursor.pos())- QPoint(ctx.width()//2, ctx.height() - config.item_radius) )
     config.callbackR = { ic.ICON_CLOSE_RADIAL: lambda: key_check_continuous(callback=move_ctx, key='r', interval=4) }
 
@@ -9,7 +9,7 @@ from ars_cmds.mesh_gen.generate_mesh import generate_mesh
 from ars_cmds.render_cmds.check import check_queue
 from ars_cmds.render_cmds.generate_render import generate_render
 from ars_cmds.render_cmds.make_screenshot import make_screenshot
-from ars_cmds.render_cmds.render_pass import save_depth, save_render
+from ars_cmds.render_cmds.render_pass import save_passes
 from ars_cmds.util_cmds.copy_to import copy_file_to_dir
 from ars_cmds.util_cmds.delete_files import delete_all_files_in_folder
 from prefs.pref_controller import get_path
@@ -61,10 +61,12 @@ def prompt_ctx(self, position, default_object = None, callback = None):
 
 
     def start_render(seed_step = 0):
-        if check_queue(): 
-            print("Render queue is busy, cannot start a new render.")
-            return
-    
+        # The queue check is asynchronous; the render starts once the backend reports an empty queue.
+        check_queue(callback=lambda: queue_render(seed_step),
+                    busy_callback=lambda n: self.msg(f"Render queue is busy ({n} queued)"),
+                    error_callback=lambda e: self.msg("ComfyUI is not reachable"))
+
+    def queue_render(seed_step = 0):
         default_object.seed += seed_step
 
 
@@ -77,9 +79,14 @@ def prompt_ctx(self, position, default_object = None, callback = None):
             self.render_manager.set_workflow(os.path.join("extensions","comfyui","workflow", "bg.json")),
             
         else:
-            save_depth(self.viewport, x=int(ctx.get_value(ic.ICON_GIZMO_SCALE)), y=int(ctx.get_value(ic.ICON_GIZMO_SCALE)))
-            save_render(self.viewport, x=int(ctx.get_value(ic.ICON_GIZMO_SCALE)), y=int(ctx.get_value(ic.ICON_GIZMO_SCALE)))
             self.render_manager.set_workflow(os.path.join("extensions","comfyui","workflow", "render.json")),
+            # A new keyframe sequence takes its depth range from its first frame
+            if not [f for f in os.listdir(get_path('keyframes')) if not f.startswith('.')]:
+                self.render_manager.depth_range = None
+            # The G-buffer is an extra draw, only made for workflows that load it
+            self.render_manager.depth_range = save_passes(
+                self.viewport, x=int(ctx.get_value(ic.ICON_GIZMO_SCALE)), y=int(ctx.get_value(ic.ICON_GIZMO_SCALE)),
+                gbuffer=self.render_manager.uses_node("Airen_GBufferPass"), depth_range=self.render_manager.depth_range)
 
         self.render_manager.set_userdata("seed", default_object.seed)
         self.render_manager.set_userdata("steps", int(ctx.get_value(ic.ICON_STEPS))),
@@ -107,7 +114,7 @@ def prompt_ctx(self, position, default_object = None, callback = None):
         if self.viewport.isVisible():
             def post_screenshot():
                 ctx.update_item(ic.ICON_IMAGE, "image_path", image_path)
-                files = os.listdir(get_path('steps')) 
+                files = [f for f in os.listdir(get_path('steps')) if not f.startswith('.')]
                 full_paths = [os.path.join(get_path('steps'), f) for f in files]
                 if full_paths:
                     latest_file = max(full_paths, key=os.path.getmtime)
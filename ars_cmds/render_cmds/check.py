@@ -1,12 +1,22 @@
-import requests
+from core.comfy_client import comfy_client
 
-def check_queue(callback = None):
-    response = requests.get("http://127.0.0.1:8188/queue")
-    if response.status_code == 200:
-        queue_data = response.json()
-        queue_remaining = len(queue_data.get("queue_running", [])) + len(queue_data.get("queue_pending", []))
+def check_queue(callback = None, busy_callback = None, error_callback = None):
+    """Ask the backend for its queue size without blocking the GUI thread.
+
+    `callback` runs once the queue turns out to be empty, `busy_callback` receives
+    the remaining count otherwise and `error_callback` the error if the backend
+    can't be reached. Nothing is returned: the count is only known once the reply
+    arrives, through the callbacks.
+    """
+    def on_count(queue_remaining):
         print(f"Queue check: {queue_remaining} remaining")
         if queue_remaining == 0:
             if callback: callback()
-    
-    return queue_remaining
\ No newline at end of file
+        elif busy_callback: busy_callback(queue_remaining)
+
+    client = comfy_client()
+    def on_error(error):
+        print(f"Queue check failed: {error}")
+        if error_callback: error_callback(error)
+
+    client.check_queue(on_count, on_error)
@@ -1,108 +1,107 @@
 from theme.fonts import font_icons as ic
-from PyQt6.QtCore import QTimer
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtGui import QPixmap, QImage
 import os
 from prefs.pref_controller import get_path
+from core.comfy_socket import comfy_socket
+from core.texture_loader import texture_loader
 
 def generate_render(self, ctx, max_steps, default_object):
+    socket = comfy_socket()
 
-    self.render_manager.send_render()
-    
-    # Stop any existing timer before starting a new one
-    if hasattr(self, '_render_timer') and self._render_timer is not None:
-        self._render_timer.stop()
-        self._render_timer.deleteLater()
-    
-    # Create a timer to apply the latest file every 100ms
-    update_timer = QTimer()
-    final_attempts = {'count': 0, 'last_step': 0}
-    
-    def apply_latest_texture():
-        steps_path = get_path("steps")
-        if not os.path.exists(steps_path):
-            return
+    # Drop the listeners of any previous render before starting a new one
+    stop_listening(self)
 
-        all_files = os.listdir(steps_path)
-        valid_exts = ('.png', '.jpg', '.jpeg', '.tiff')
-        image_files = [f for f in all_files if f.lower().endswith(valid_exts)]
-        
-        if not image_files:
-            return
+    state = {'step': 0, 'prompt_id': None, 'final_file': None}
+    is_sprite = type(default_object).__name__ == "CSprite"
+
+    def step_alpha(step):
+        # Calculate alpha based on current step (0.1 to 0.99)
+        return min(0.1 + (0.89 * (step / (max_steps + 1))), 1.0)
 
-        full_paths = [os.path.join(steps_path, f) for f in image_files]
-        full_paths.sort(key=os.path.getmtime)
-        
-        current_step = len(full_paths)
-        last_file = full_paths[-1]
-        
-        # Reset counter if new files appear
-        if current_step > final_attempts['last_step']:
-            final_attempts['last_step'] = current_step
-            final_attempts['count'] = 0
+    def apply_preview(data):
+        # Step previews arrive over the websocket and are decoded in memory, no disk round-trip.
+        # Decoding runs on the texture loader's threads; a step that is superseded before
+        # its upload is skipped.
+        state['step'] += 1
+        try:
+            if is_sprite:
+                step = state['step']
+                default_object.set_texture_async(data, callback=lambda: default_object.set_alpha(step_alpha(step)))
+            elif type(default_object).__name__ == "CPoint":
+                texture_loader().load(self.viewport.bg, data, self.viewport.bg.set_image_data)
+            else:
+                pixmap = QPixmap.fromImage(QImage.fromData(data))
+                if pixmap.isNull():
+                    return
+                ctx.update_item(ic.ICON_IMAGE, "pixmap", pixmap)
+                if not self.viewport.isVisible() and hasattr(self, 'img') and self.img:
+                    self.img.show_pixmap(pixmap)
+        except Exception as e:
+            print(f"Error applying preview: {e}")
 
-        stop_rendering = False
+    def collect_output(node_id, output):
+        # Remember the last image of the final save node (category "steps"); it becomes the
+        # file-backed final texture. Other savers, e.g. the mesh input image, are ignored.
+        for image in output.get("images", []):
+            filename = image.get("filename", "")
+            if image.get("type", "output") == "output" and image.get("subfolder", "") == "steps" \
+                    and filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+                state['final_file'] = os.path.join(get_path("steps"), filename)
 
-        if last_file.lower().endswith('.tiff'):
-            stop_rendering = True
-        elif type(default_object).__name__ == "CSprite":
-            if current_step >= max_steps + 1:
-                stop_rendering = True
-        else:
-            # Image Render: Wait for stability after reaching max steps
-            if current_step >= max_steps + 1:
-                final_attempts['count'] += 1
-                if final_attempts['count'] >= 20: # Wait ~2 seconds of silence
-                    stop_rendering = True
+    def finish(prompt_id):
+        if state['prompt_id'] and prompt_id and prompt_id != state['prompt_id']:
+            return
+        stop_listening(self)
 
-        file_to_apply = None
-        if stop_rendering:
-            valid_candidates = [p for p in full_paths if p.lower().endswith(('.png', '.jpg', '.jpeg'))]
-            if valid_candidates:
-                file_to_apply = valid_candidates[-1]
-        else:
-            if len(full_paths) >= 2:
-                file_to_apply = full_paths[-2]
-        
-        if file_to_apply and not file_to_apply.lower().endswith(('.png', '.jpg', '.jpeg')):
+        file_to_apply = state['final_file']
+        if not (file_to_apply and os.path.exists(file_to_apply)):
             file_to_apply = None
 
-        if type(default_object).__name__ == "CSprite":
+        if is_sprite:
+            texture_loader().cancel(default_object)  # a late step preview must not replace the final texture
             try:
-                if file_to_apply:
-                    default_object.set_texture(file_to_apply)
-                    
-                    # Calculate alpha based on current step (0.1 to 0.99)
-                    alpha = 0.1 + (0.89 * (current_step / (max_steps + 1)))
-                    default_object.set_alpha(min(alpha, 1.0))
-                    
-                if stop_rendering:
+                if file_to_apply and default_object.set_texture(file_to_apply):
+                    default_object.set_alpha(step_alpha(max_steps + 1))
                     default_object.cutout()
-                    #print("finish")
-                    update_timer.stop()
-
             except Exception as e:
                 print(f"Error applying texture: {e}")
-            
-        else:
-            if file_to_apply and os.path.exists(file_to_apply):
-                try:
-                    pixmap = QPixmap(file_to_apply)
-                    if not pixmap.isNull():
-                        if type(default_object).__name__ == "CPoint":
-                            self.viewport.bg.set_image(file_to_apply)
-                        else:
-                            ctx.update_item(ic.ICON_IMAGE, "image_path", file_to_apply)
-                        if not self.viewport.isVisible() and hasattr(self, 'img') and self.img:
-                            self.img.open_image(file_to_apply)
-                except:
-                    pass
+        elif file_to_apply:
+            if type(default_object).__name__ == "CPoint":
+                texture_loader().cancel(self.viewport.bg)  # same for the background
+                self.viewport.bg.set_image(file_to_apply)
+            else:
+                ctx.update_item(ic.ICON_IMAGE, "image_path", file_to_apply)
+            if not self.viewport.isVisible() and hasattr(self, 'img') and self.img:
+                self.img.open_image(file_to_apply)
+
+    def failed(prompt_id, message):
+        if state['prompt_id'] and prompt_id and prompt_id != state['prompt_id']:
+            return
+        print(f"Render failed: {message}")
+        stop_listening(self)
+
+    listeners = [
+        (socket.preview_received, apply_preview),
+        (socket.executed, collect_output),
+        (socket.execution_finished, finish),
+        (socket.execution_failed, failed),
+    ]
+    for signal, slot in listeners:
+        signal.connect(slot)
+    self._render_listeners = listeners
+
+    def queued(result):
+        if isinstance(result, dict):
+            state['prompt_id'] = result.get('prompt_id')
+
+    # Make sure the socket is up before queueing so no early step is missed
+    socket.when_connected(lambda: self.render_manager.send_render(callback=queued))
+
 
-            if stop_rendering:
-                update_timer.stop()
-                return
-        
-    # Start the timer
-    update_timer.timeout.connect(apply_latest_texture)
-    update_timer.start(100)
-    
-    self._render_timer = update_timer
\ No newline at end of file
+def stop_listening(self):
+    for signal, slot in getattr(self, '_render_listeners', None) or []:
+        try:
+            signal.disconnect(slot)
+        except TypeError:
+            pass
+    self._render_listeners = None
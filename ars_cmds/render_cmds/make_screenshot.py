@@ -1,11 +1,13 @@
 import os
+from PIL import Image
 from prefs.pref_controller import get_path
-from .crop_img import crop_img
+from .render_pass import render_offscreen
 
 def make_screenshot(widget, callback=None, x=512, y=512, name = "screenshot.png"):
 
     path = os.path.join(    os.path.join(  get_path('input'), name))
-    if widget.viewport.isVisible(): widget.viewport._canvas.native.grab().save(path)
-    crop_img(path, path, int(x), int(y))
+    # Drawn offscreen at the final size, no window grab + crop + resample
+    if widget.viewport.isVisible():
+        Image.fromarray(render_offscreen(widget.viewport, int(x), int(y))['color']).save(path, optimize=True)
 
     callback()
@@ -0,0 +1,85 @@
+import mmap
+import os
+import struct
+import numpy as np
+
+# Raw render pass handoff shared with the Airen_RenderPass node.
+# Layout: fixed header followed by the C-contiguous pixel data (rows top-down).
+# The Airen nodes load this module by path (see Airen/ars_modules.py) for the readers.
+HEADER = struct.Struct("<4sHHIIIQffff")  # magic, version, dtype code, height, width, channels, generation, near, far, range min, range max
+MAGIC = b"ARSP"
+VERSION = 2
+DTYPES = {0: np.uint8, 1: np.float16, 2: np.float32}
+DTYPE_CODES = {np.dtype(t): code for code, t in DTYPES.items()}
+
+
+def read_header(path):
+    """Return (dtype, height, width, channels, generation, near_far, value_range)
+    or None if `path` is not a pass buffer."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            magic, version, code, height, width, channels, generation, near, far, lo, hi = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    if magic != MAGIC or version != VERSION or code not in DTYPES:
+        return None
+    return DTYPES[code], height, width, channels, generation, (near, far), (lo, hi)
+
+
+def read_generation(path):
+    """Return the generation counter stored in a pass buffer header (0 if missing).
+    Cheap change check: only the header is read."""
+    header = read_header(path)
+    return header[4] if header else 0
+
+
+def write_pass_buffer(path, array, generation=None, near_far=(0.0, 0.0), value_range=(0.0, 0.0)):
+    """Write `array` (H x W or H x W x C) into a memory-mapped pass buffer at `path`.
+
+    The file is reused in place while the shape stays the same, so repeated renders
+    only touch the OS page cache. The generation counter is bumped on every write and
+    is all the node needs to compare to know the pass changed.
+
+    `near_far` records the camera clip planes for linear depth passes and `value_range`
+    the range the node should normalize by; (0, 0) means "use the frame's own min/max".
+    """
+    array = np.ascontiguousarray(array)
+    if array.dtype not in DTYPE_CODES:
+        array = array.astype(np.float32)
+    height, width = array.shape[:2]
+    channels = array.shape[2] if array.ndim == 3 else 1
+
+    if generation is None:
+        generation = read_generation(path) + 1
+
+    size = HEADER.size + array.nbytes
+    mode = "r+b" if os.path.exists(path) else "w+b"
+    with open(path, mode) as f:
+        if os.fstat(f.fileno()).st_size != size:
+            f.truncate(size)
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_WRITE) as mm:
+            mm[HEADER.size:size] = memoryview(array).cast("B")
+            # Header last: a reader never sees a new generation with stale pixels
+            mm[:HEADER.size] = HEADER.pack(MAGIC, VERSION, DTYPE_CODES[array.dtype], height, width, channels, generation,
+                                          *near_far, *value_range)
+            mm.flush()
+    return generation
+
+
+def read_pass_float(path):
+    """Map the buffer and convert it straight to float32 (uint8 is scaled to 0-1).
+    Returns an H x W x C array, or None if there is no valid buffer."""
+    header = read_header(path)
+    if header is None:
+        return None
+    dtype, height, width, channels = header[:4]
+    count = height * width * channels
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = np.frombuffer(mm, dtype=dtype, count=count, offset=HEADER.size).reshape(height, width, channels)
+        result = view.astype(np.float32)
+        del view  # release the export before the mapping closes
+    if dtype == np.uint8:
+        result /= 255.0
+    return result
@@ -1,75 +1,180 @@
 import os
-import cv2
+from contextlib import nullcontext
 import numpy as np
-from vispy.io import write_png
-from vispy.gloo import gl
+from vispy import gloo
 from prefs.pref_controller import get_path
-
-def pre_proc(self):
-    # Disable picking filters to ensure normal rendering
-    self._objectManager.picking()._set_enabled(False)
-
-    # Temporarily hide for clean render
+from ars_3d_engine.logic.gbuffer_filter import unpack_gbuffer
+from .pass_buffer import write_pass_buffer
+
+# Desktop GL enums, not exposed by vispy.gloo.gl (ES2 names only)
+GL_DEPTH_COMPONENT24 = 0x81A6
+GL_RGBA32F = 0x8814
+
+
+def render_region(canvas, x, y):
+    # Centered canvas region with the target aspect, covering the shortest axis.
+    # Same framing the old window-size render + resize + center-crop produced.
+    cw, ch = canvas.size
+    if cw * y > ch * x:
+        rw, rh = ch * x / y, ch
+    else:
+        rw, rh = cw, cw * y / x
+    return ((cw - rw) / 2, (ch - rh) / 2, rw, rh)
+
+
+def render_offscreen(self, x: int = 512, y: int = 512, ids: bool = False, full_resolution: bool = True) -> dict:
+    """ Draw the scene into an offscreen framebuffer of exactly x by y pixels.
+    Returns {'color': HxWx3 uint8, 'depth': HxW float32 window depth} and with
+    ids=True also 'ids': HxW int32 object indices (-1 for background).
+    Independent of the window size and DPI, nothing is resampled.
+    full_resolution=False keeps the level of detail shown in the viewport."""
+    canvas = self._canvas
+    x, y = int(x), int(y)
+    region = render_region(canvas, x, y)
+
+    fbo = gloo.FrameBuffer(color=gloo.RenderBuffer((y, x), format='color'),
+                           depth=gloo.RenderBuffer((y, x), format=GL_DEPTH_COMPONENT24))
+
+    picking = self._objectManager.picking()
+    picking._set_enabled(False)
+
+    # Hide helpers for a clean render
     original_grid_visible = self.grid.visible
     original_gizmo_visible = self.gizmo_node.visible
     self.grid.visible = False
     self.gizmo_node.visible = False
 
-    self._canvas.render()    # Force a full render (without crop)
-
-    # Restore visibility
-    self.grid.visible = original_grid_visible
-    self.gizmo_node.visible = original_gizmo_visible
-
-    self._canvas.update()    # Force scene update if needed
-
-    ps = float(self._canvas.pixel_scale or 1.0)
-    w, h = int(self._canvas.size[0] * ps), int(self._canvas.size[1] * ps)
-
-    return w, h
-
-def post_proc(x, y, render_pass):
-    # Resize and crop to target dimensions (x, y)
-    scale_x = x / render_pass.shape[1]  # target_width / current_width
-    scale_y = y / render_pass.shape[0]  # target_height / current_height
-    scale = max(scale_x, scale_y)  # Use max to ensure we cover the target size (fit shortest axis)
-    new_w = round(render_pass.shape[1] * scale)
-    new_h = round(render_pass.shape[0] * scale)
-    resized = cv2.resize(render_pass, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
-    start_y = (new_h - y) // 2
-    start_x = (new_w - x) // 2
-    cropped = resized[start_y:start_y + y, start_x:start_x + x]
-
-    return cropped
-
-
-def save_depth(self, filename: str = 'depth.png', x: int = 512, y: int = 512) -> None:
-
-    w, h = pre_proc(self)
-
-    # Read buffer
-    raw_pass = gl.glReadPixels(0, 0, w, h, gl.GL_DEPTH_COMPONENT, gl.GL_FLOAT)
-    render_pass = np.flipud(np.frombuffer(raw_pass, np.float32).reshape((h, w)))
-    
-    min_d, max_d = np.nanmin(render_pass), np.nanmax(render_pass) # Normalize to [0, 1]
-    if max_d > min_d: render_pass = (render_pass - min_d) / (max_d - min_d)
-    else: render_pass = np.zeros_like(render_pass)
-    render_pass = 1 - render_pass #Invert for better visibility (closer = lighter)
-    render_pass = (render_pass * 255).astype(np.uint8) # Map to uint8 grayscale
-
-    cropped = post_proc(x, y, render_pass)
-    cropped = np.repeat(cropped[..., np.newaxis], 3, axis=2) # Convert to RGB for PNG (repeat channels)
-    write_png(os.path.join(os.path.join(get_path('input'), filename)), cropped)
-
-
-def save_render(self, filename: str = 'render.png', x: int = 512, y: int = 512) -> None:
-
-    w, h = pre_proc(self)
-
-    # Read buffer
-    raw_pass = gl.glReadPixels(0, 0, w, h, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
-    render_pass = np.flipud(np.frombuffer(raw_pass, np.uint8).reshape((h, w, 4)))[:, :, :3]
-        
-    cropped = post_proc(x, y, render_pass)
+    canvas.set_current()
+    canvas.push_fbo(fbo, region[:2], region[2:])
+    try:
+        with self._objectManager.lod().full_resolution() if full_resolution else nullcontext():
+            canvas._draw_scene()
+            passes = {
+                'color': np.ascontiguousarray(fbo.read(alpha=False)),
+                'depth': np.ascontiguousarray(gloo.read_pixels((0, 0, x, y), mode='depth', out_type='float')[..., 0]),
+            }
+            if ids:
+                picking._set_enabled(True)
+                try:
+                    canvas._draw_scene(bgcolor=(0, 0, 0, 0))
+                    passes['ids'] = picking.indices_from_ids(np.ascontiguousarray(fbo.read()))
+                finally:
+                    picking._set_enabled(False)
+    finally:
+        canvas.pop_fbo()
+        self.grid.visible = original_grid_visible
+        self.gizmo_node.visible = original_gizmo_visible
+
+    return passes
+
+
+def render_gbuffer(self, x: int = 512, y: int = 512, full_resolution: bool = True) -> dict:
+    """ One draw into a float framebuffer with the G-buffer filters enabled.
+    Returns 'normals' HxWx3 (view space, z towards the camera), 'uvs' HxWx2,
+    'ids' HxW object indices (-1 for background) and 'masks', a HxW bool
+    mask per object index that is visible."""
+    canvas = self._canvas
+    x, y = int(x), int(y)
+    region = render_region(canvas, x, y)
+
+    fbo = gloo.FrameBuffer(color=gloo.RenderBuffer((y, x), format=GL_RGBA32F),
+                           depth=gloo.RenderBuffer((y, x), format=GL_DEPTH_COMPONENT24))
+
+    picking = self._objectManager.picking()
+    picking._set_enabled(False)
+    rotation = np.linalg.inv(self._view.camera.transform.matrix[:3, :3]).T
+
+    # Only meshes with a G-buffer filter may write into the buffer
+    hidden = [self.grid, self.gizmo_node, self.bg]
+    hidden += [o.visual for o in self._objectManager._objects if not picking.has_gbuffer(o)]
+    hidden = [node for node in hidden if node.visible]
+    for node in hidden:
+        node.visible = False
+
+    canvas.set_current()
+    canvas.push_fbo(fbo, region[:2], region[2:])
+    picking._set_gbuffer_enabled(True, rotation)
+    try:
+        with self._objectManager.lod().full_resolution() if full_resolution else nullcontext():
+            canvas._draw_scene(bgcolor=(0, 0, 0, 0))
+            data = gloo.read_pixels((0, 0, x, y), alpha=True, out_type='float')
+    finally:
+        picking._set_gbuffer_enabled(False)
+        canvas.pop_fbo()
+        for node in hidden:
+            node.visible = True
+
+    normals, uvs, pids = unpack_gbuffer(data)
+    ids = picking.indices_from_pids(pids)
+    masks = {int(index): ids == index for index in np.unique(ids) if index >= 0}
+    return {'normals': normals, 'uvs': uvs, 'ids': ids, 'masks': masks}
+
+
+def save_gbuffer(self, filename: str = 'gbuffer.pass', x: int = 512, y: int = 512) -> None:
+    """ Batched export: one HxWx6 float32 buffer of (normal xyz, uv, object index).
+    Per-object masks are `ids == index` on the reading side."""
+    gbuffer = render_gbuffer(self, x, y)
+    data = np.concatenate([gbuffer['normals'], gbuffer['uvs'],
+                           gbuffer['ids'][..., None].astype(np.float32)], axis=-1)
+    write_pass_buffer(os.path.join(get_path('input'), filename), data.astype(np.float32))
+
+
+def save_depth(self, filename: str = 'depth.pass', x: int = 512, y: int = 512,
+               linear: bool = True, dtype=np.float32, depth_range=None, passes=None):
+    """ linear=True writes single channel camera distance (float16/float32) with the
+    near/far planes in the pass header; background pixels are inf. `depth_range`
+    fixes the (min, max) distance the node normalizes by, so a sequence doesn't
+    flicker; without it the frame's own visible range is written. Returns the range
+    written (None if nothing is visible), for the next frame of the sequence.
+    A filename ending in .npy saves the raw distances with numpy instead.
+    linear=False keeps the old per-frame normalized 8-bit depth.
+    `passes` reuses the result of render_offscreen instead of drawing again."""
+
+    render_pass = (passes or render_offscreen(self, x, y))['depth']
+    path = os.path.join(get_path('input'), filename)
+
+    if not linear:
+        min_d, max_d = np.nanmin(render_pass), np.nanmax(render_pass) # Normalize to [0, 1]
+        if max_d > min_d: render_pass = (render_pass - min_d) / (max_d - min_d)
+        else: render_pass = np.zeros_like(render_pass)
+        render_pass = 1 - render_pass #Invert for better visibility (closer = lighter)
+        render_pass = (render_pass * 255).astype(np.uint8) # Map to uint8 grayscale
+
+        # Single channel raw buffer; the node broadcasts it to RGB without copying
+        write_pass_buffer(path, render_pass)
+        return
+
+    # Window depth -> NDC -> eye distance
+    near, far = self._view.camera.get_near_far()
+    z_ndc = render_pass * 2.0 - 1.0
+    distance = (2.0 * near * far) / (far + near - z_ndc * (far - near))
+    distance[render_pass >= 1.0] = np.inf
+    distance = distance.astype(dtype)
+
+    if depth_range is None:
+        visible = distance[np.isfinite(distance)]
+        if visible.size:
+            depth_range = (float(visible.min()), float(visible.max()))
+
+    if filename.endswith('.npy'):
+        np.save(path, distance)
+        return depth_range
+    write_pass_buffer(path, distance, near_far=(near, far), value_range=depth_range or (0.0, 0.0))
+    return depth_range
+
+
+def save_render(self, filename: str = 'render.pass', x: int = 512, y: int = 512, passes=None) -> None:
+
+    render_pass = (passes or render_offscreen(self, x, y))['color']
+    write_pass_buffer(os.path.join(get_path('input'), filename), render_pass)
+
+
+def save_passes(self, x: int = 512, y: int = 512, gbuffer: bool = False, **depth_options):
+    # One offscreen draw feeds both the render and the depth pass. Returns the depth range.
+    passes = render_offscreen(self, x, y)
+    depth_range = save_depth(self, x=x, y=y, passes=passes, **depth_options)
+    save_render(self, x=x, y=y, passes=passes)
+    if gbuffer:
+        save_gbuffer(self, x=x, y=y)
+    return depth_range
 
-    write_png(os.path.join(os.path.join(get_path('input'), filename)), cropped)
\ No newline at end of file
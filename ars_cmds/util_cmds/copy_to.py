@@ -4,6 +4,8 @@ import shutil
 def copy_file_to_dir(file_path, destination_dir, copy_as=None, incremental=False):
     """
     Copies a file from file_path to destination_dir.
+    The copy is a hard link where the filesystem allows it (step histories are large
+    and never modified in place), a real copy otherwise.
 
     Args:
         file_path (str): Path to the source file.
@@ -25,14 +27,20 @@ def copy_file_to_dir(file_path, destination_dir, copy_as=None, incremental=False
         name = copy_as  # use provided name
 
     if incremental:
-        file_count = len([f for f in os.listdir(destination_dir) if os.path.isfile(os.path.join(destination_dir, f))])
+        file_count = len([f for f in os.listdir(destination_dir)
+                          if not f.startswith('.') and os.path.isfile(os.path.join(destination_dir, f))])  # hidden: layer stores and indices
         name = f"{name}_{file_count}"
 
     new_filename = name + ext
     destination_path = os.path.join(destination_dir, new_filename)
 
     try:
-        shutil.copy2(file_path, destination_path)
+        if os.path.lexists(destination_path):
+            os.remove(destination_path)  # writing through it would change the linked file too
+        try:
+            os.link(file_path, destination_path)
+        except OSError:
+            shutil.copy2(file_path, destination_path)
         print(f"File copied to: {destination_path}")
         return destination_path
     except Exception as e:
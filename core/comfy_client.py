@@ -0,0 +1,152 @@
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+COMFY_URL = "http://127.0.0.1:8188"
+
+
+class _RequestSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class _Request(QRunnable):
+    """Runs a single HTTP round-trip on the client's thread pool."""
+
+    def __init__(self, session, method, url, payload, timeout):
+        super().__init__()
+        self.signals = _RequestSignals()
+        self._session = session
+        self._method = method
+        self._url = url
+        self._payload = payload
+        self._timeout = timeout
+
+    def run(self):
+        try:
+            response = self._session.request(self._method, self._url, json=self._payload, timeout=self._timeout)
+            response.raise_for_status()
+            try:
+                result = response.json()
+            except ValueError:
+                result = response.content
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+class ComfyClient(QObject):
+    """Shared, non-blocking client for the ComfyUI backend.
+
+    Every round-trip runs on a small thread pool over one keep-alive session,
+    so the GUI thread never waits on the network. Results are delivered on the
+    GUI thread through callbacks and the signals below.
+    """
+
+    prompt_queued = pyqtSignal(dict)
+    queue_changed = pyqtSignal(int)
+    request_failed = pyqtSignal(str, str)  # path, error
+
+    def __init__(self, base_url=COMFY_URL, timeout=(0.5, 10.0), retries=2, max_workers=4, parent=None):
+        super().__init__(parent)
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.client_id = uuid.uuid4().hex
+        self.queue_remaining = 0  # count of the last finished check_queue(), may be stale
+
+        retry = Retry(total=retries, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset({"GET"}))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+        self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_workers)
+        self._inflight = {}  # GET path -> list of (callback, error_callback)
+        self._running = set()  # keeps runnables (and their signals) alive until they report back
+
+    def get(self, path, callback=None, error_callback=None, timeout=None):
+        """GET ``path`` asynchronously. Identical GETs already in flight are coalesced."""
+        waiters = self._inflight.get(path)
+        if waiters is not None:
+            waiters.append((callback, error_callback))
+            return
+        self._inflight[path] = [(callback, error_callback)]
+
+        def done(result):
+            for cb, _ in self._inflight.pop(path, []):
+                if cb: cb(result)
+
+        def failed(error):
+            self.request_failed.emit(path, error)
+            for _, err_cb in self._inflight.pop(path, []):
+                if err_cb: err_cb(error)
+
+        self._start("GET", path, None, timeout, done, failed)
+
+    def post(self, path, payload, callback=None, error_callback=None, timeout=None):
+        """POST ``payload`` as JSON to ``path`` asynchronously."""
+        def failed(error):
+            self.request_failed.emit(path, error)
+            if error_callback: error_callback(error)
+
+        self._start("POST", path, payload, timeout, callback, failed)
+
+    def _start(self, method, path, payload, timeout, callback, error_callback):
+        job = _Request(self._session, method, self.base_url + path, payload, timeout or self.timeout)
+        job.setAutoDelete(False)
+        self._running.add(job)
+
+        def finish(handler, value):
+            self._running.discard(job)
+            if handler: handler(value)
+
+        job.signals.finished.connect(lambda result: finish(callback, result))
+        job.signals.failed.connect(lambda error: finish(error_callback, error))
+        self._pool.start(job)
+
+    def queue_prompt(self, workflow, callback=None):
+        """Submit a workflow to ``/prompt``. Previews for it are routed to ``client_id``."""
+        def queued(result):
+            if isinstance(result, dict):
+                self.prompt_queued.emit(result)
+            if callback: callback(result)
+
+        payload = {"prompt": workflow, "client_id": self.client_id}
+        self.post("/prompt", payload, callback=queued,
+                  error_callback=lambda e: print(f"Failed to queue prompt: {e}"))
+
+    def check_queue(self, callback=None, error_callback=None):
+        """Refresh the number of running + pending prompts; ``callback`` receives the count,
+        ``error_callback`` the error when the backend can't be reached."""
+        def counted(queue_data):
+            remaining = 0
+            if isinstance(queue_data, dict):
+                remaining = len(queue_data.get("queue_running", [])) + len(queue_data.get("queue_pending", []))
+            self.queue_remaining = remaining
+            self.queue_changed.emit(remaining)
+            if callback: callback(remaining)
+
+        self.get("/queue", callback=counted, error_callback=error_callback)
+
+    def object_info(self, node_class, callback, error_callback=None):
+        """Fetch ``/object_info`` for a single node class (much smaller than the full dump)."""
+        self.get(f"/object_info/{node_class}",
+                 callback=lambda data: callback(data.get(node_class, {}) if isinstance(data, dict) else {}),
+                 error_callback=error_callback)
+
+
+_client = None
+
+
+def comfy_client() -> ComfyClient:
+    """Return the process-wide :class:`ComfyClient`, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = ComfyClient()
+    return _client
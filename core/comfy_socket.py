@@ -0,0 +1,139 @@
+import io
+import json
+import struct
+
+import numpy as np
+from PIL import Image
+from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSignal
+from PyQt6.QtWebSockets import QWebSocket
+
+from core.comfy_client import comfy_client
+
+# Binary event types sent by ComfyUI's PromptServer
+PREVIEW_IMAGE = 1
+PREVIEW_IMAGE_WITH_METADATA = 4
+
+JPEG_MAGIC = b"\xff\xd8"
+PNG_MAGIC = b"\x89PNG"
+
+
+def preview_to_array(data: bytes) -> np.ndarray:
+    """Decode encoded preview bytes (JPEG/PNG) in memory into an RGBA uint8 array."""
+    return np.asarray(Image.open(io.BytesIO(data)).convert("RGBA"))
+
+
+class ComfySocket(QObject):
+    """Listens to ComfyUI's ``/ws`` channel for progress and in-memory previews.
+
+    Previews are routed to this app because prompts are queued with the
+    shared client's ``client_id`` (see :mod:`core.comfy_client`).
+    """
+
+    connected = pyqtSignal()
+    progress = pyqtSignal(int, int)  # value, max
+    preview_received = pyqtSignal(bytes)  # encoded step preview (JPEG/PNG)
+    executed = pyqtSignal(str, dict)  # node id, ui output
+    execution_finished = pyqtSignal(str)  # prompt id
+    execution_failed = pyqtSignal(str, str)  # prompt id, message
+
+    def __init__(self, reconnect_interval=2000, parent=None):
+        super().__init__(parent)
+        self._client = comfy_client()
+        self._socket = QWebSocket()
+        self._socket.connected.connect(self._on_connected)
+        self._socket.textMessageReceived.connect(self._on_text)
+        self._socket.binaryMessageReceived.connect(self._on_binary)
+        self._is_connected = False
+        self._last_finished = None
+
+        self._reconnect_timer = QTimer(self)
+        self._reconnect_timer.setInterval(reconnect_interval)
+        self._reconnect_timer.timeout.connect(self.open)
+        self._socket.disconnected.connect(self._on_disconnected)
+
+    @property
+    def is_connected(self) -> bool:
+        return self._is_connected
+
+    def open(self):
+        ws_url = self._client.base_url.replace("http", "ws", 1)
+        self._socket.open(QUrl(f"{ws_url}/ws?clientId={self._client.client_id}"))
+
+    def when_connected(self, callback, timeout=1000):
+        """Run ``callback`` once the socket is up (or after ``timeout`` ms regardless)."""
+        if self._is_connected:
+            callback()
+            return
+        state = {'done': False}
+
+        def run():
+            if state['done']:
+                return
+            state['done'] = True
+            try:
+                self.connected.disconnect(run)
+            except TypeError:
+                pass
+            callback()
+
+        self.connected.connect(run)
+        QTimer.singleShot(timeout, run)
+        self.open()
+
+    def _on_connected(self):
+        self._is_connected = True
+        self._reconnect_timer.stop()
+        self.connected.emit()
+
+    def _on_disconnected(self):
+        self._is_connected = False
+        if not self._reconnect_timer.isActive():
+            self._reconnect_timer.start()
+
+    def _on_text(self, message):
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            return
+        msg_type = msg.get("type")
+        data = msg.get("data") or {}
+        prompt_id = data.get("prompt_id") or ""
+
+        if msg_type == "progress":
+            self.progress.emit(int(data.get("value", 0)), int(data.get("max", 0)))
+        elif msg_type == "executed":
+            self.executed.emit(str(data.get("node")), data.get("output") or {})
+        elif msg_type == "execution_success" or (msg_type == "executing" and data.get("node") is None):
+            # Older servers only send "executing" with node=None, newer ones send both
+            if prompt_id != self._last_finished:
+                self._last_finished = prompt_id
+                self.execution_finished.emit(prompt_id)
+        elif msg_type in ("execution_error", "execution_interrupted"):
+            self.execution_failed.emit(prompt_id, str(data.get("exception_message", msg_type)))
+
+    def _on_binary(self, message):
+        data = bytes(message)
+        if len(data) < 8:
+            return
+        event_type = struct.unpack(">I", data[:4])[0]
+
+        if event_type == PREVIEW_IMAGE:
+            payload = data[8:]  # skip the image format word
+            # Animated frames from ARS_Preview_Saver carry a header instead; the player reads them from disk
+            if payload[:2] == JPEG_MAGIC or payload[:4] == PNG_MAGIC:
+                self.preview_received.emit(payload)
+        elif event_type == PREVIEW_IMAGE_WITH_METADATA:
+            meta_len = struct.unpack(">I", data[4:8])[0]
+            self.preview_received.emit(data[8 + meta_len:])
+
+
+_socket = None
+
+
+def comfy_socket() -> ComfySocket:
+    """Return the process-wide :class:`ComfySocket`, connecting it on first use."""
+    global _socket
+    if _socket is None:
+        _socket = ComfySocket()
+        _socket.open()
+    return _socket
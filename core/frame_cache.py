@@ -0,0 +1,168 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from PyQt6.QtGui import QImage
+from core.tiff_layers import read_layer
+
+
+def decode_frame(entry) -> QImage:
+    """Decode one frame; safe off the GUI thread (QImage, not QPixmap).
+    `entry` is (path, layer, mtime) with layer a TIFF page index or None."""
+    path, layer, _ = entry
+    if layer is None:
+        image = QImage(path)
+    else:
+        frame = read_layer(path, layer).convert("RGBA")
+        data = frame.tobytes("raw", "RGBA")
+        image = QImage(data, frame.width, frame.height, frame.width * 4, QImage.Format.Format_RGBA8888).copy()
+    if image.isNull():
+        raise ValueError(f"Could not decode {os.path.basename(path)}")
+    return image
+
+
+class FrameCache(QObject):
+    """Decoded frames of an image sequence, read ahead of playback.
+
+    ``scan`` returns the sequence as (path, layer, mtime) entries; it runs again only
+    when one of the watched directories changes, never per frame. One worker thread
+    decodes the ``ahead`` frames after the play position into a ring of at most
+    ``size`` QImages (the frame needed last in play order goes first). Entries carry the
+    mtime, so a frame rewritten under the same name is decoded again. While suspended
+    (player closed or paused) nothing is watched or read ahead and no frames are kept.
+    """
+
+    changed = pyqtSignal()  # the rescanned sequence differs
+    _decoded = pyqtSignal(object)  # (entry, future), hops from the worker thread to the GUI thread
+
+    def __init__(self, scan, directories, size=64, ahead=48, parent=None):
+        super().__init__(parent)
+        self._scan = scan
+        self._size = size
+        self._ahead = min(ahead, size - 1)
+        self._frames = {}  # entry -> QImage
+        self._index = {}  # entry -> position in entries
+        self._failed = set()  # entries that did not decode (still being written), retried once the sequence changes
+        self._busy = None  # entry being decoded
+        self._position = 0
+        self._suspended = False
+        self._directories = list(directories)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frames")
+        self.entries = []
+
+        # Rescans are coalesced: a render writing frames changes the folder many times a second
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.timeout.connect(self.rescan)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(lambda _: self._rescan_timer.start(100))
+        self._decoded.connect(self._collect)
+        self.rescan()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _watch(self):
+        # A folder that does not exist yet is watched through its nearest existing
+        # parent, so its creation triggers a rescan that starts watching it
+        paths = set()
+        for d in self._directories:
+            while d and not os.path.isdir(d):
+                d = os.path.dirname(d) if os.path.dirname(d) != d else None
+            if d:
+                paths.add(d)
+        watched = set(self._watcher.directories())
+        if paths - watched:
+            self._watcher.addPaths(list(paths - watched))
+        if watched - paths:
+            self._watcher.removePaths(list(watched - paths))
+
+    def rescan(self):
+        if not self._suspended:
+            self._watch()
+        entries = self._scan()
+        if entries == self.entries:
+            return
+        self.entries = entries
+        self._failed.clear()
+        self._index = {entry: i for i, entry in enumerate(entries)}
+        for entry in [e for e in self._frames if e not in self._index]:
+            del self._frames[entry]
+        self.changed.emit()
+        self._prefetch()
+
+    def frame(self, index, wait=False):
+        """The frame at `index` (wrapped) and move the read-ahead there. None while it is
+        still being decoded, unless `wait` decodes it right here (scrubbing)."""
+        if not self.entries:
+            return None
+        index %= len(self.entries)
+        entry = self.entries[index]
+        self._position = index
+        image = self._frames.get(entry)
+        if image is None and wait:
+            try:
+                image = decode_frame(entry)
+            except Exception as e:
+                print(f"Error loading frame: {e}")
+                return None
+            self._store(entry, image)
+        self._prefetch()
+        return image
+
+    def _store(self, entry, image):
+        self._frames[entry] = image
+        count = len(self.entries)
+        while len(self._frames) > self._size:
+            # Just played means furthest away in play order
+            del self._frames[max(self._frames, key=lambda e: (self._index[e] - self._position) % count)]
+
+    def _prefetch(self):
+        # One decode at a time, always the next missing frame from the play position,
+        # so a seek never leaves a queue of stale jobs behind
+        if self._busy is not None or self._suspended or not self.entries:
+            return
+        count = len(self.entries)
+        for i in range(min(self._ahead, count)):
+            entry = self.entries[(self._position + i) % count]
+            if entry not in self._frames and entry not in self._failed:
+                self._busy = entry
+                future = self._executor.submit(decode_frame, entry)
+                future.add_done_callback(lambda f, entry=entry: self._decoded.emit((entry, f)))
+                return
+
+    def _collect(self, item):
+        entry, future = item
+        self._busy = None
+        try:
+            image = future.result()
+        except Exception:
+            self._failed.add(entry)
+            if not self._suspended:
+                self._rescan_timer.start(500)  # probably half written; its mtime changes once it is done
+        else:
+            if entry in self._index and not self._suspended:
+                self._store(entry, image)
+        self._prefetch()
+
+    def clear(self):
+        self._frames.clear()
+        self._failed.clear()
+
+    def suspend(self):
+        """Stop watching and reading ahead and drop the decoded frames."""
+        self._suspended = True
+        self._rescan_timer.stop()
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self.clear()
+
+    def resume(self):
+        """Watch and read ahead again, from a fresh scan."""
+        self._suspended = False
+        self.rescan()
+        self._prefetch()
+
+    def shutdown(self):
+        self._watcher.directoryChanged.disconnect()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,91 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.mesh_worker import build_lods, load_mesh_arrays, read_mesh_arrays
+from prefs.pref_controller import get_path
+
+
+class MeshImporter(QObject):
+    """Parses (and decimates) mesh files in worker processes, several at a time.
+
+    Parsing, triangulation and normals happen off the GUI thread (and off the GIL);
+    the GUI only copies the finished arrays in. Callbacks and signals are delivered
+    on the GUI thread.
+    """
+
+    file_started = pyqtSignal(str)
+    file_loaded = pyqtSignal(str, dict)  # path, {'vertices', 'faces', 'normals'[, 'texcoords']}
+    file_failed = pyqtSignal(str, str)  # path, error
+    _finished = pyqtSignal(object)  # future, hops from the executor thread to the GUI thread
+
+    def __init__(self, max_workers=None, cache_dir=None, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir  # content-hashed .npy cache, see core.mesh_worker
+        self._max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._executor = None  # started on first use, spawning workers is not free
+        self._jobs = {}  # future -> (path, callback, error_callback)
+        self._finished.connect(self._collect)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def pending(self) -> int:
+        return len(self._jobs)
+
+    def load(self, path, callback=None, error_callback=None):
+        """Parse ``path`` in the background; ``callback`` receives the arrays dict."""
+        def loaded(arrays):
+            self.file_loaded.emit(path, arrays)
+            if callback: callback(arrays)
+
+        def failed(error):
+            self.file_failed.emit(path, error)
+            if error_callback: error_callback(error)
+
+        self.file_started.emit(path)
+        self._submit(path, lambda result: read_mesh_arrays(*result), loaded, failed, load_mesh_arrays, path, self.cache_dir)
+
+    def build_lods(self, source, callback, error_callback=None):
+        """Decimate a mesh in the background (see core.mesh_worker.build_lods);
+        ``callback`` receives one arrays dict per level, finest first."""
+        label = source if isinstance(source, str) else "mesh"
+        self._submit(label, lambda results: [read_mesh_arrays(*r) for r in results], callback, error_callback,
+                     build_lods, source)
+
+    def _submit(self, label, read, callback, error_callback, fn, *args):
+        future = self._pool().submit(fn, *args)
+        self._jobs[future] = (label, read, callback, error_callback)
+        future.add_done_callback(self._finished.emit)
+
+    def _collect(self, future):
+        label, read, callback, error_callback = self._jobs.pop(future)
+        try:
+            result = read(future.result())
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                self._executor = None  # a worker died; the next job starts a fresh pool
+            error = str(e) or type(e).__name__
+            print(f"Mesh worker failed on {label}: {error}")
+            if error_callback: error_callback(error)
+            return
+        if callback: callback(result)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_importer = None
+
+
+def mesh_importer() -> MeshImporter:
+    """Return the process-wide :class:`MeshImporter`, creating it on first use."""
+    global _importer
+    if _importer is None:
+        _importer = MeshImporter(cache_dir=get_path("mesh_cache"))
+    return _importer
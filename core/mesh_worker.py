@@ -0,0 +1,200 @@
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+import numpy as np
+import trimesh
+
+# Runs inside the mesh import worker processes (see core.mesh_importer), so it
+# must stay importable without Qt. Arrays travel back through a memory-mapped
+# temp file rather than the result pipe: the worker writes them once, the GUI
+# copies them straight out of the page cache. With a cache directory, parsed
+# meshes are also kept there as .npy files keyed by content hash, and opening
+# the same file (or a copy) again maps them instead of parsing.
+
+CACHE_VERSION = b"1"  # bump when parse_mesh output changes, old entries are then never hit
+CACHE_BUDGET = 2 * 1024 ** 3  # bytes kept in the mesh cache before the least recently used entries go
+MESH_ARRAYS = ('vertices', 'faces', 'normals', 'texcoords')
+LOD_RATIOS = (0.4, 0.15, 0.05)  # fraction of the original faces kept by each decimated level
+
+
+def parse_mesh(path: str) -> dict:
+    """Load any trimesh-readable file as one triangle mesh.
+    Returns float32 vertices/normals/texcoords and uint32 faces (texcoords may be missing)."""
+    mesh = trimesh.load(path, force='mesh', process=False)  # process=False keeps UV seams split
+    if len(mesh.faces) == 0:
+        raise ValueError(f"No triangles in {os.path.basename(path)}")
+
+    arrays = {
+        'vertices': np.ascontiguousarray(mesh.vertices, dtype=np.float32),
+        'faces': np.ascontiguousarray(mesh.faces, dtype=np.uint32),
+        'normals': np.ascontiguousarray(mesh.vertex_normals, dtype=np.float32),
+    }
+    uv = getattr(mesh.visual, 'uv', None)
+    if uv is not None and len(uv) == len(mesh.vertices):
+        arrays['texcoords'] = np.ascontiguousarray(uv, dtype=np.float32)
+    return arrays
+
+
+def mesh_key(path: str) -> str:
+    """Content hash of a mesh file; duplicates under another name share the key."""
+    h = hashlib.blake2b(CACHE_VERSION, digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_cached(entry: str):
+    """Memory-map a cache entry's arrays (read-only, nothing is parsed). None if missing."""
+    try:
+        arrays = {name: np.load(os.path.join(entry, name + '.npy'), mmap_mode='r')
+                  for name in MESH_ARRAYS if os.path.exists(os.path.join(entry, name + '.npy'))}
+    except (OSError, ValueError):
+        return None
+    if 'vertices' not in arrays or 'faces' not in arrays:
+        return None
+    os.utime(entry)  # recently used, see prune_cache
+    return arrays
+
+
+def write_cached(entry: str, arrays: dict) -> None:
+    # Written next to the entry and renamed in place, so a reader never sees half an entry
+    tmp = tempfile.mkdtemp(prefix='.tmp_', dir=os.path.dirname(entry))
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp, name + '.npy'), array)
+        os.replace(tmp, entry)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)  # another process stored the same mesh first
+
+
+def prune_cache(cache_dir: str, budget: int = CACHE_BUDGET) -> None:
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, name)
+        if name.startswith('.') or not os.path.isdir(entry):
+            continue
+        size = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(entry) for f in files)
+        entries.append((os.path.getmtime(entry), size, entry))
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= budget:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+
+
+def parse_mesh_cached(path: str, cache_dir=None) -> dict:
+    """parse_mesh through the on-disk cache: a file seen before (or a copy of it)
+    comes back as memory-mapped arrays without being parsed."""
+    if not cache_dir:
+        return parse_mesh(path)
+    entry = os.path.join(cache_dir, mesh_key(path))
+    arrays = read_cached(entry)
+    if arrays is None:
+        arrays = parse_mesh(path)
+        write_cached(entry, arrays)
+        prune_cache(cache_dir)
+    return arrays
+
+
+def load_mesh_arrays(path: str, cache_dir=None) -> tuple[str, dict]:
+    """Worker entry point: parse `path` and park the arrays in a mapped temp file.
+    Returns (temp file, {name: (offset, shape, dtype)}) for read_mesh_arrays.
+    With a cache, returns (cache entry, None) instead and the GUI maps the entry itself."""
+    if cache_dir:
+        entry = os.path.join(cache_dir, mesh_key(path))
+        if read_cached(entry) is None:
+            write_cached(entry, parse_mesh(path))
+            prune_cache(cache_dir)
+        return entry, None
+
+    return _export(parse_mesh(path))
+
+
+def _export(arrays: dict) -> tuple[str, dict]:
+    layout, size = {}, 0
+    for name, array in arrays.items():
+        layout[name] = (size, array.shape, array.dtype.str)
+        size += array.nbytes
+
+    fd, out = tempfile.mkstemp(suffix='.mesh')
+    with os.fdopen(fd, 'w+b') as f:
+        f.truncate(size)
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_WRITE) as mm:
+            for name, array in arrays.items():
+                offset = layout[name][0]
+                mm[offset:offset + array.nbytes] = memoryview(array).cast('B')
+    return out, layout
+
+
+def vertex_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Area weighted vertex normals."""
+    tri = vertices[faces]
+    fn = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    idx = faces.ravel()
+    normals = np.stack([np.bincount(idx, np.repeat(fn[:, k], 3), minlength=len(vertices)) for k in range(3)], axis=1)
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+    return normals.astype(np.float32)
+
+
+def decimate_mesh(arrays: dict, ratio: float) -> dict:
+    """Quadric decimation (VTK) down to about `ratio` of the faces.
+    UVs are carried over from the nearest original vertex."""
+    import pyvista as pv
+    from scipy.spatial import cKDTree
+
+    vertices, faces = np.asarray(arrays['vertices']), np.asarray(arrays['faces'])
+    cells = np.hstack([np.full((len(faces), 1), 3, dtype=np.int64), faces.astype(np.int64)])
+    low = pv.PolyData(vertices.astype(np.float32), cells).decimate(1.0 - ratio).triangulate()
+
+    low_vertices = np.ascontiguousarray(low.points, dtype=np.float32)
+    low_faces = np.ascontiguousarray(low.faces.reshape(-1, 4)[:, 1:], dtype=np.uint32)
+    result = {'vertices': low_vertices, 'faces': low_faces, 'normals': vertex_normals(low_vertices, low_faces)}
+    texcoords = arrays.get('texcoords')
+    if texcoords is not None:
+        nearest = cKDTree(vertices).query(low_vertices)[1]
+        result['texcoords'] = np.ascontiguousarray(np.asarray(texcoords)[nearest], dtype=np.float32)
+    return result
+
+
+def build_lods(source, ratios=LOD_RATIOS) -> list:
+    """Worker entry point: decimated levels of a mesh, each built from the previous one.
+    `source` is a cache entry (levels are stored inside it as lod1, lod2, ...) or an arrays dict.
+    Returns one read_mesh_arrays argument tuple per level."""
+    entry = source if isinstance(source, str) else None
+    arrays = read_cached(entry) if entry else source
+    if arrays is None:
+        raise OSError(f"Mesh cache entry missing: {entry}")
+
+    levels, previous = [], 1.0
+    for i, ratio in enumerate(ratios, 1):
+        level_entry = os.path.join(entry, f"lod{i}") if entry else None
+        cached = read_cached(level_entry) if level_entry else None
+        arrays = cached if cached is not None else decimate_mesh(arrays, ratio / previous)
+        previous = ratio
+        if level_entry is None:
+            levels.append(_export(arrays))
+            continue
+        if cached is None:
+            write_cached(level_entry, arrays)
+        levels.append((level_entry, None))
+    return levels
+
+
+def read_mesh_arrays(out: str, layout) -> dict:
+    """GUI side: copy the arrays out of the worker's temp file and delete it,
+    or map them from the cache entry the worker filled."""
+    if layout is None:
+        arrays = read_cached(out)
+        if arrays is None:
+            raise OSError(f"Mesh cache entry missing: {out}")
+        return arrays
+    try:
+        with open(out, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return {name: np.frombuffer(mm, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape).copy()
+                    for name, (offset, shape, dtype) in layout.items()}
+    finally:
+        os.remove(out)
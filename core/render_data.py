@@ -1,8 +1,8 @@
 # core/render_data.py
 import json
 import os
-from urllib import request
 from PyQt6.QtCore import QObject
+from core.comfy_client import comfy_client
 
 class RenderDataManager(QObject):
     """Manages render data settings, storage, and sending to backend."""
@@ -12,6 +12,11 @@ class RenderDataManager(QObject):
         
         self.workflow_name = ""
 
+        # Fixed (min, max) camera distance the depth pass is normalized by, shared by
+        # the frames of one keyframe sequence so their depth maps match. None: the
+        # next render picks its own range.
+        self.depth_range = None
+
         # Load default workflow JSON if provided (like your default.json)
         self.workflow_template = None
         if default_workflow_path and os.path.exists(default_workflow_path):
@@ -33,6 +38,12 @@ class RenderDataManager(QObject):
         print(f"Userdata node with ud_name '{key}' not found.")
 
 
+    def uses_node(self, class_type):
+        """True if the current workflow contains a node of this class (e.g. a pass loader)."""
+        if self.workflow_template is None: return False
+        return any(node.get("class_type") == class_type for node in self.workflow_template.values())
+
+
     def get_userdata(self, key):
         for _, node in self.workflow_template.items():
             inputs = node.get("inputs", {})
@@ -55,9 +66,8 @@ class RenderDataManager(QObject):
         return percentage_values
 
 
-    def send_render(self):
+    def send_render(self, callback=None):
+        """Queue the current workflow on the backend without blocking the GUI."""
         if self.workflow_template is None: return
 
-        data = json.dumps({"prompt": self.workflow_template}).encode('utf-8')
-        req = request.Request("http://127.0.0.1:8188/prompt", data=data)
-        request.urlopen(req)
+        comfy_client().queue_prompt(self.workflow_template, callback=callback)
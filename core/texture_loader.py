@@ -0,0 +1,89 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+def decode_image(source, flip=False) -> np.ndarray:
+    """Decode an image file path or encoded bytes (PNG/JPEG) into a uint8 array.
+    Gray, RGB and RGBA are kept as stored; with ``flip`` the rows come bottom-up,
+    ready for a GL texture."""
+    img = Image.open(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+    if img.mode not in ('L', 'RGB', 'RGBA'):
+        img = img.convert('RGBA')
+    image = np.asarray(img)
+    return np.ascontiguousarray(image[::-1]) if flip else image
+
+
+class TextureLoader(QObject):
+    """Decodes texture images on worker threads (PIL releases the GIL while decoding).
+
+    Requests are keyed, usually by the object the texture is for. Each key has at
+    most one decode in flight and one waiting; a newer request replaces the waiting
+    one (the stale frame is dropped), so a steady stream still shows every decode
+    that finishes. Callbacks are delivered on the GUI thread, where the upload happens.
+    """
+
+    _finished = pyqtSignal(object)  # (key, request, future), hops from the worker thread to the GUI thread
+
+    def __init__(self, max_workers=2, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="texture")
+        self._busy = set()  # keys with a decode in flight
+        self._waiting = {}  # key -> newest request not started yet
+        self._cancelled = set()  # keys whose decode in flight is discarded
+        self._finished.connect(self._collect)
+
+    def load(self, key, source, callback, error_callback=None, flip=False):
+        """Decode ``source`` (path or bytes) in the background; ``callback`` receives the array."""
+        request = (source, callback, error_callback, flip)
+        if key in self._busy:
+            self._waiting[key] = request  # a stale waiting frame is dropped here
+            return
+        self._start(key, request)
+
+    def cancel(self, key):
+        """Drop every request for ``key`` that has not been delivered yet."""
+        self._waiting.pop(key, None)
+        if key in self._busy:
+            self._cancelled.add(key)  # the decode in flight is discarded when it finishes
+
+    def _start(self, key, request):
+        self._busy.add(key)
+        future = self._executor.submit(decode_image, request[0], request[3])
+        future.add_done_callback(lambda f: self._finished.emit((key, request, f)))
+
+    def _collect(self, item):
+        key, (source, callback, error_callback, _), future = item
+        self._busy.discard(key)
+        newer = self._waiting.pop(key, None)
+        if newer is not None:
+            self._start(key, newer)  # decodes while this one is uploaded
+        if key in self._cancelled:
+            self._cancelled.discard(key)
+            return
+        try:
+            image = future.result()
+        except Exception as e:
+            label = source if isinstance(source, str) else "image data"
+            print(f"Error reading texture {label}: {e}")
+            if error_callback: error_callback(str(e))
+            return
+        callback(image)
+
+    def shutdown(self):
+        self._waiting.clear()
+        self._cancelled.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_loader = None
+
+
+def texture_loader() -> TextureLoader:
+    """Return the process-wide :class:`TextureLoader`, creating it on first use."""
+    global _loader
+    if _loader is None:
+        _loader = TextureLoader()
+    return _loader
@@ -0,0 +1,151 @@
+import io
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+import PIL
+from PIL import Image, ImageChops
+
+# Random access to the layers (pages) of the step TIFFs.
+# Walking the IFD chain is the O(layers) part of opening a page, so it is done
+# once: the page offsets, sizes and modes are kept in a hidden JSON index next
+# to the TIFF, keyed by its mtime and size. Opening a page then seeks straight
+# to its IFD. Decoded layers are kept in a small LRU.
+# A step may be stored as a delta page: its difference (mod 256) to the layer
+# below, marked by DELTA_TAG in the page description. Reading it adds the layer
+# below, which playback has in the LRU already; writers keep a full page every
+# few steps and at the top, so random access stays short and the final image
+# reads as is everywhere.
+# Also used by the Airen ComfyUI nodes (loaded by path, see Airen/ars_modules.py).
+
+INDEX_VERSION = 2
+DELTA_TAG = "ars:delta"
+LAYER_BUDGET = 256 * 1024 * 1024  # bytes of decoded layers kept
+
+_lock = threading.Lock()  # layers are read from worker threads too
+_indices = {}  # path -> index
+_layers = OrderedDict()  # (path, mtime_ns, layer) -> (PIL image, nbytes)
+_layers_size = 0
+
+
+def _can_seek_by_offset():
+    # Seeking by offset sets TiffImageFile._frame_pos / _n_frames, which are private to
+    # PIL: probe a two-page TIFF once, and walk the pages sequentially where they are gone.
+    try:
+        buffer = io.BytesIO()
+        Image.new('L', (1, 1)).save(buffer, format='TIFF', save_all=True, append_images=[Image.new('L', (1, 1))])
+        with Image.open(buffer) as img:
+            img.seek(1)
+            return isinstance(getattr(img, '_frame_pos', None), list) and hasattr(img, '_n_frames')
+    except Exception:
+        return False
+
+
+SEEK_BY_OFFSET = _can_seek_by_offset()
+if not SEEK_BY_OFFSET:
+    print(f"Pillow {PIL.__version__}: TIFF layers are read by sequential seeking")
+
+
+def _index_path(path):
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, f".{name}.layers.json")
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _build_index(path, stamp):
+    pages = []
+    with Image.open(path) as img:
+        for i in range(getattr(img, 'n_frames', 1)):
+            img.seek(i)
+            offset = img._frame_pos[i] if SEEK_BY_OFFSET else None
+            delta = img.tag_v2.get(270) == DELTA_TAG
+            pages.append({'offset': offset, 'size': list(img.size), 'mode': img.mode, 'delta': delta})
+    return {'version': INDEX_VERSION, 'mtime_ns': stamp[0], 'bytes': stamp[1], 'pages': pages}
+
+
+def layer_index(path):
+    """{'pages': [{'offset', 'size', 'mode', 'delta'}, ...]} of a TIFF, from memory, the
+    index file next to it, or (if the TIFF changed) a fresh walk that is saved."""
+    path = os.path.abspath(path)
+    stamp = _stamp(path)
+    with _lock:
+        index = _indices.get(path)
+    if index is not None and (index['mtime_ns'], index['bytes']) == stamp:
+        return index
+
+    index = None
+    try:
+        with open(_index_path(path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != INDEX_VERSION or (index.get('mtime_ns'), index.get('bytes')) != stamp:
+            index = None
+    except (OSError, ValueError):
+        pass
+    if index is None:
+        index = _build_index(path, stamp)
+        try:
+            tmp = _index_path(path) + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(tmp, _index_path(path))
+        except OSError:
+            pass  # read-only folder: the index is still kept in memory
+    with _lock:
+        _indices[path] = index
+    return index
+
+
+def layer_count(path):
+    return len(layer_index(path)['pages'])
+
+
+def valid_layers(path):
+    """Indices of the layers with the most common size (steps of one render)."""
+    pages = layer_index(path)['pages']
+    if not pages:
+        return []
+    size = Counter(tuple(p['size']) for p in pages).most_common(1)[0][0]
+    return [i for i, p in enumerate(pages) if tuple(p['size']) == size]
+
+
+def read_layer(path, layer=-1):
+    """Decoded layer `layer` (negative counts from the top) as a loaded PIL image.
+    The image is shared with the LRU, so copy it before drawing into it."""
+    global _layers_size
+    path = os.path.abspath(path)
+    index = layer_index(path)
+    pages = index['pages']
+    layer = range(len(pages))[layer]  # IndexError when out of range
+    key = (path, index['mtime_ns'], layer)
+    with _lock:
+        cached = _layers.get(key)
+        if cached is not None:
+            _layers.move_to_end(key)
+            return cached[0]
+
+    with Image.open(path) as img:
+        offsets = [p['offset'] for p in pages]
+        if SEEK_BY_OFFSET and None not in offsets:
+            # Known IFD offsets: seek() goes straight to the page instead of walking the chain
+            img._frame_pos = offsets
+            img._n_frames = len(offsets)
+        img.seek(layer)
+        img.load()
+        image = img.copy()
+    if pages[layer].get('delta') and layer > 0:
+        image = ImageChops.add_modulo(read_layer(path, layer - 1).convert(image.mode), image)
+
+    nbytes = image.width * image.height * len(image.getbands())
+    with _lock:
+        if key in _layers:  # decoded by another thread meanwhile
+            return _layers[key][0]
+        _layers[key] = (image, nbytes)
+        _layers_size += nbytes
+        while _layers_size > LAYER_BUDGET and len(_layers) > 1:
+            _, (_, size) = _layers.popitem(last=False)
+            _layers_size -= size
+    return image
@@ -358,12 +358,16 @@ def save_current_image(image_dir, node = None, folder = sd_saved_render):
     if not os.listdir(image_dir):
         return True
 
+    # The steps folder also holds the hidden step history; take its newest image
+    if image_dir == sd_steps_path: pic_dir = last_step_path()
+    else:                          pic_dir = os.path.join(image_dir, os.listdir(image_dir)[-1])
+    if not pic_dir:
+        return True
+
     key_bc = c4d.BaseContainer()
     if c4d.gui.GetInputState(c4d.BFM_INPUT_KEYBOARD, c4d.BFM_INPUT_CHANNEL, key_bc):
         if not key_bc[c4d.BFM_INPUT_QUALIFIER] & c4d.QSHIFT:
             
-            pic_dir = os.path.join(image_dir, os.listdir(image_dir)[-1])
-            
             if not os.listdir(folder):
                 new_pic_name = "0.png"
             
@@ -380,7 +384,6 @@ def save_current_image(image_dir, node = None, folder = sd_saved_render):
         
         else: 
             folder = c4d.storage.LoadDialog(type=c4d.FILESELECTTYPE_IMAGES,title="Save Image", flags=c4d.FILESELECT_SAVE)
-            pic_dir = os.path.join(image_dir, os.listdir(image_dir)[-1])
             shutil.copy(pic_dir, folder+"_image.png")
 
 
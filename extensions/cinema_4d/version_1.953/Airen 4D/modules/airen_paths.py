@@ -50,6 +50,13 @@ if not os.path.exists(sd_chpoint_path): os.mkdir(sd_chpoint_path)
 sd_steps_path     = os.path.join (sd_output_path  ,"steps"          ,)
 if not os.path.exists(sd_steps_path  ): os.mkdir(sd_steps_path  )
 
+
+def last_step_path():
+    # Newest image in the steps folder: latest.jpeg while sampling, the final image after.
+    # Hidden files are the step history and temporary writes.
+    files = [os.path.join(sd_steps_path, f) for f in os.listdir(sd_steps_path) if not f.startswith('.')]
+    return max(files, key=os.path.getmtime) if files else ""
+
 sd_txt2img_path   = os.path.join (sd_output_path  ,"txt2img-images" ,)
 if not os.path.exists(sd_txt2img_path): os.mkdir(sd_txt2img_path)
 
@@ -305,9 +305,8 @@ def MSG_DESCRIPTION_GETBITMAP_msg(data, dir, node):
 
     if data['id'][0].id == RNDR_IMAGE:
         if node[IMAGE_PATH]: bmp_init(node[IMAGE_PATH])
-        elif os.listdir( sd_steps_path ):
-                fullpath = os.path.join( sd_steps_path, os.listdir( sd_steps_path )[-1] )
-                bmp_init(fullpath)
+        elif last_step_path():
+                bmp_init(last_step_path())
 
 
     else: return True
@@ -147,8 +147,8 @@ class ai_render_window(c4d.gui.GeDialog):
             return
         self.last_image_check = current_time
         try:
-            if os.listdir(sd_steps_path):
-                img = os.path.join(sd_steps_path, os.listdir(sd_steps_path)[-1])
+            img = last_step_path()
+            if img:
                 bmp = c4d.bitmaps.BaseBitmap()
                 bmp.InitWith(img)
                 self.main_render_image.SetImage(bmp, copybmp=True, secondstate=False)
@@ -175,8 +175,8 @@ class ai_render_window(c4d.gui.GeDialog):
             stage[RANDOM_SEED] = stage[RANDOM_SEED] + 1
 
         elif id == 100004:
-            if os.listdir(sd_steps_path):
-                pic_dir = os.path.join(sd_steps_path, os.listdir(sd_steps_path)[-1])
+            pic_dir = last_step_path()
+            if pic_dir:
                 c4d.documents.LoadFile(pic_dir)
 
         elif id == 100005:
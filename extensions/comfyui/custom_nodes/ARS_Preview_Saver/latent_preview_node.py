@@ -1,13 +1,15 @@
 # ARS Preview Saver for ComfyUI
 # Unified preview saver with two independent systems:
-# 1. Step Preview Saver - Saves each sampling step to output/steps/
+# 1. Step Preview Saver - Appends each sampling step to one layered TIFF in output/steps/
+#    and keeps the newest step as output/steps/latest.jpeg
 # 2. Animated Frame Saver - Saves video frames to output/frames/TIMESTAMP_NodeID/
 
 from PIL import Image
 import time
 import io
 import struct
-from threading import Thread
+from threading import Event, Lock, Thread
+import importlib.util
 import functools
 import torch.nn.functional as F
 import torch
@@ -27,6 +29,23 @@ args.preview_method = LatentPreviewMethod.Latent2RGB
 STEPS_DIR = os.path.join(folder_paths.get_output_directory(), "steps")
 FRAMES_DIR = os.path.join(folder_paths.get_output_directory(), "frames")
 
+
+def _load_layer_store():
+    # Same writer (compressions, codec fallback, delta layers) as Airen_SaveImage,
+    # which puts the final image on top; custom node packages can't import each other
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Airen", "layer_store.py")
+    spec = importlib.util.spec_from_file_location("airen_layer_store", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+layer_store = _load_layer_store()
+# Steps are appended to this layered TIFF as they arrive
+LAYER_STORE = os.path.join(STEPS_DIR, layer_store.LAYER_STORE)
+# The newest step is also kept as one image, replaced every step
+LATEST_STEP = os.path.join(STEPS_DIR, layer_store.LATEST_STEP)
+
 # Video model frame rates
 FRAME_RATES = {
     "Mochi": 24//6, 
@@ -37,6 +56,10 @@ FRAME_RATES = {
     "Wan22": 24//4
 }
 
+# Animated frame encodings (file extension per PIL format); each frame is encoded
+# once and the same bytes go to disk and to the browser
+FRAME_FORMATS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp"}
+
 serv = server.PromptServer.instance
 
 
@@ -45,12 +68,56 @@ serv = server.PromptServer.instance
 # Saves video preview frames to output/frames/TIMESTAMP_NodeID/
 # ============================================================================
 
+class FrameWriter:
+    """Single worker thread that decodes, encodes and writes animated frame batches.
+
+    Each saver has at most one batch waiting; a newer batch replaces it, so a slow
+    decode or disk never piles work up behind the sampler. Frames of a dropped batch
+    come round again on the next loop of the animation."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._wake = Event()
+        self._waiting = {}  # saver -> (frames, start_index, total_frames)
+        self._thread = None
+        self.dropped = 0
+
+    def submit(self, saver, frames, start_index, total_frames):
+        with self._lock:
+            if saver in self._waiting:
+                self.dropped += 1
+            self._waiting[saver] = (frames, start_index, total_frames)
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="ARS frame writer", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                if not self._waiting:
+                    self._wake.clear()
+                    continue
+                saver = next(iter(self._waiting))
+                batch = self._waiting.pop(saver)
+            try:
+                saver._save_frames(*batch)
+            except Exception as e:
+                print(f"[ARS Preview Saver] Failed to save frames: {e}")
+
+
+frame_writer = FrameWriter()
+
+
 class AnimatedFrameSaver(latent_preview.LatentPreviewer):
     """Handles saving animated preview frames during video generation"""
     
-    def __init__(self, base_previewer, frame_rate=8):
+    def __init__(self, base_previewer, frame_rate=8, frame_format="JPEG", frame_quality=95):
         self.base_previewer = base_previewer
         self.frame_rate = frame_rate
+        self.frame_format = frame_format if frame_format in FRAME_FORMATS else "JPEG"
+        self.frame_quality = frame_quality
         self.first_preview = True
         self.last_time = 0
         self.current_index = 0
@@ -103,8 +170,8 @@ class AnimatedFrameSaver(latent_preview.LatentPreviewer):
         else:
             frames = x0[self.current_index:self.current_index + num_previews]
         
-        # Process and save frames
-        Thread(target=self._save_frames, args=(frames, self.current_index, num_frames)).start()
+        # Process and save frames (on the writer thread, replacing a batch still waiting)
+        frame_writer.submit(self, frames, self.current_index, num_frames)
         self.current_index = (self.current_index + num_previews) % num_frames
         
         return None
@@ -135,20 +202,29 @@ class AnimatedFrameSaver(latent_preview.LatentPreviewer):
         # Convert to uint8
         frames_uint8 = (((decoded + 1.0) / 2.0).clamp(0, 1).mul(0xFF)).to(device="cpu", dtype=torch.uint8)
         
-        # Save each frame
+        # Encode each frame once, stream it, and keep the bytes for the disk
+        extension = FRAME_FORMATS[self.frame_format]
+        files = []
         frame_index = start_index
         for frame in frames_uint8:
             img = Image.fromarray(frame.numpy())
-            
-            # Save to disk
-            if self.session_dir:
-                save_path = os.path.join(self.session_dir, f"frame_{frame_index:05d}.jpg")
-                img.save(save_path, format="JPEG", quality=95)
+            encoded = io.BytesIO()
+            img.save(encoded, format=self.frame_format, quality=self.frame_quality, compress_level=1)
+            data = encoded.getvalue()
             
             # Stream to browser
-            self._stream_to_browser(img, frame_index)
+            self._stream_to_browser(data, frame_index)
+            
+            if self.session_dir:
+                files.append((os.path.join(self.session_dir, f"frame_{frame_index:05d}.{extension}"), data))
             
             frame_index = (frame_index + 1) % total_frames
+        
+        # Write the batch in one go; each file appears complete under its final name
+        for save_path, data in files:
+            with open(save_path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(save_path + ".tmp", save_path)
     
     def _decode_latent(self, x0):
         """Decode latent tensor to RGB"""
@@ -171,14 +247,16 @@ class AnimatedFrameSaver(latent_preview.LatentPreviewer):
             frames = F.interpolate(frames, (512, width), mode="bilinear")
         return frames.movedim(0, -1)
     
-    def _stream_to_browser(self, image, index):
-        """Send frame to browser via WebSocket"""
+    def _stream_to_browser(self, data, index):
+        """Send encoded frame bytes to browser via WebSocket"""
         message = io.BytesIO()
-        message.write((1).to_bytes(length=4, byteorder="big") * 2)
+        image_type = 2 if self.frame_format == "PNG" else 1  # the browser sniffs WEBP itself
+        message.write(image_type.to_bytes(length=4, byteorder="big"))
+        message.write((1).to_bytes(length=4, byteorder="big"))
         message.write(index.to_bytes(length=4, byteorder="big"))
         node_id_bytes = (serv.last_node_id or "unknown").encode("ascii")
         message.write(struct.pack("16p", node_id_bytes))
-        image.save(message, format="JPEG", quality=95, compress_level=1)
+        message.write(data)
         serv.send_sync(server.BinaryEventTypes.PREVIEW_IMAGE, message.getvalue(), serv.client_id)
 
 
@@ -192,6 +270,14 @@ def create_step_saver_callback(model, steps, x0_output_dict=None):
     preview_format = "JPEG"
     previewer = latent_preview.get_previewer(model.load_device, model.model.latent_format)
     pbar = comfy.utils.ProgressBar(steps)
+    try:
+        workflow_extra = next(serv.prompt_queue.currently_running.values().__iter__())[3]["extra_pnginfo"]["workflow"]["extra"]
+        compression = workflow_extra.get("ARS_PreviewSaver_layercompression", "lzw")
+        delta = workflow_extra.get("ARS_PreviewSaver_stepdelta", False)
+    except:
+        compression = "lzw"
+        delta = False
+    last_layer = [None]  # the step below, for delta layers
     
     def callback(step, x0, x, total_steps):
         # Update output dict if provided
@@ -203,9 +289,15 @@ def create_step_saver_callback(model, steps, x0_output_dict=None):
         if previewer:
             preview_bytes = previewer.decode_latent_to_preview_image(preview_format, x0)
         
-        # Save step preview to disk
+        # Append the step to the step history and replace the latest step image;
+        # a separate file per step only if appending fails
         if preview_bytes:
-            _save_step_preview(preview_bytes, step, preview_format)
+            previous = None if not delta or step % layer_store.DELTA_KEY_INTERVAL == 0 else last_layer[0]
+            last_layer[0] = _append_step_layer(preview_bytes, step, compression, previous)
+            if last_layer[0] is None:
+                _save_step_preview(preview_bytes, step, os.path.join(STEPS_DIR, f"{step:04d}.{preview_format.lower()}"), preview_format)
+            else:
+                _save_step_preview(preview_bytes, step, LATEST_STEP, preview_format)
         
         # Update progress bar
         pbar.update_absolute(step + 1, total_steps, preview_bytes)
@@ -213,35 +305,52 @@ def create_step_saver_callback(model, steps, x0_output_dict=None):
     return callback
 
 
-def _save_step_preview(preview_bytes, step, preview_format):
-    """Save a single step preview to output/steps/"""
+def _save_step_preview(preview_bytes, step, output_path, preview_format):
+    """Save a single step preview to `output_path` in output/steps/. Written under a
+    hidden temporary name first, so pollers never read half a file."""
     try:
         os.makedirs(STEPS_DIR, exist_ok=True)
-        output_path = os.path.join(STEPS_DIR, f"{step:04d}.{preview_format.lower()}")
+        temp_path = os.path.join(STEPS_DIR, f".{os.path.basename(output_path)}.tmp")
         
         # Handle different preview_bytes formats
         if isinstance(preview_bytes, tuple) and len(preview_bytes) >= 2:
             # Tuple: (format, data)
             data = preview_bytes[1]
             if isinstance(data, bytes):
-                with open(output_path, "wb") as f:
+                with open(temp_path, "wb") as f:
                     f.write(data)
             else:
-                data.save(output_path, preview_format)
+                data.save(temp_path, preview_format)
         elif isinstance(preview_bytes, bytes):
             # Raw bytes
-            with open(output_path, "wb") as f:
+            with open(temp_path, "wb") as f:
                 f.write(preview_bytes)
         elif hasattr(preview_bytes, "save"):
             # PIL Image
-            preview_bytes.save(output_path, preview_format)
+            preview_bytes.save(temp_path, preview_format)
         else:
             print(f"[ARS Preview Saver] Unknown preview format: {type(preview_bytes)}")
+            return
+        os.replace(temp_path, output_path)
             
     except Exception as e:
         print(f"[ARS Preview Saver] Failed to save step {step}: {e}")
 
 
+def _append_step_layer(preview_bytes, step, compression, previous=None):
+    """Append a step preview to the layer store (a new store on step 0), as a delta
+    to `previous` when given. Earlier layers are never read back, so each step costs
+    one encode. Returns the appended step as RGBA, None if it could not be written."""
+    try:
+        data = preview_bytes[1] if isinstance(preview_bytes, tuple) else preview_bytes
+        img = Image.open(io.BytesIO(data)) if isinstance(data, bytes) else data
+        os.makedirs(STEPS_DIR, exist_ok=True)
+        return layer_store.append_layer(LAYER_STORE, img, compression, new=step == 0, previous=previous)
+    except Exception as e:
+        print(f"[ARS Preview Saver] Failed to append step {step} layer: {e}")
+        return None
+
+
 # ============================================================================
 # HOOK SYSTEM - Integrate with ComfyUI
 # ============================================================================
@@ -265,6 +374,8 @@ def get_previewer_with_frame_saver(device, latent_format, *args, **kwargs):
         workflow_extra = next(serv.prompt_queue.currently_running.values().__iter__())[3]["extra_pnginfo"]["workflow"]["extra"]
         enable_animated = workflow_extra.get("ARS_PreviewSaver_latentpreview", True)
         frame_rate = workflow_extra.get("ARS_PreviewSaver_latentpreviewrate", 0)
+        frame_format = workflow_extra.get("ARS_PreviewSaver_frameformat", "JPEG")
+        frame_quality = workflow_extra.get("ARS_PreviewSaver_framequality", 95)
         
         if frame_rate == 0:
             # Auto-detect frame rate based on model
@@ -273,10 +384,12 @@ def get_previewer_with_frame_saver(device, latent_format, *args, **kwargs):
         # Defaults
         enable_animated = True
         frame_rate = 8
+        frame_format = "JPEG"
+        frame_quality = 95
     
     # Wrap with frame saver if enabled
     if enable_animated and hasattr(base_previewer, "decode_latent_to_preview"):
-        return AnimatedFrameSaver(base_previewer, frame_rate)
+        return AnimatedFrameSaver(base_previewer, frame_rate, frame_format, frame_quality)
     
     return base_previewer
 
@@ -50,6 +50,45 @@ app.registerExtension({
             tooltip: 'Force a specific frame rate for the playback of latent frames. This should not be confused with the output frame rate and will not match for video models.',
             defaultValue: 0,
         },
+        {
+            id: "ARS_PreviewSaver.FrameFormat",
+            category: ['🎨 ARS Preview Saver', 'Sampling', 'Frame Format'],
+            name: "Animated frame format",
+            type: 'combo',
+            options: ['JPEG', 'WEBP', 'PNG'],
+            tooltip: 'Encoding of the saved and streamed animated frames. Each frame is encoded once for both.',
+            defaultValue: 'JPEG',
+        },
+        {
+            id: "ARS_PreviewSaver.FrameQuality",
+            category: ['🎨 ARS Preview Saver', 'Sampling', 'Frame Quality'],
+            name: "Animated frame quality",
+            type: 'number',
+            attrs: {
+                min: 1,
+                step: 1,
+                max: 100
+            },
+            tooltip: 'JPEG/WEBP quality of the animated frames. Lower encodes faster and smaller.',
+            defaultValue: 95,
+        },
+        {
+            id: "ARS_PreviewSaver.LayerCompression",
+            category: ['🎨 ARS Preview Saver', 'Step History', 'Layer Compression'],
+            name: "Step history compression",
+            type: 'combo',
+            options: ['lzw', 'zstd', 'none', 'deflate'],
+            tooltip: 'Compression of the step layers. LZW and zstd write fast; none is fastest but largest.',
+            defaultValue: 'lzw',
+        },
+        {
+            id: "ARS_PreviewSaver.StepDelta",
+            category: ['🎨 ARS Preview Saver', 'Step History', 'Delta Layers'],
+            name: "Store steps as differences to the previous step",
+            type: 'boolean',
+            tooltip: 'Smaller step histories. Other image editors show these layers as noise; the final image is always stored in full.',
+            defaultValue: false,
+        },
     ],
     async setup() {
         let originalGraphToPrompt = app.graphToPrompt
@@ -57,6 +96,10 @@ app.registerExtension({
             let res = await originalGraphToPrompt.apply(this, arguments);
             res.workflow.extra['ARS_PreviewSaver_latentpreview'] = app.ui.settings.getSettingValue("ARS_PreviewSaver.LatentPreview")
             res.workflow.extra['ARS_PreviewSaver_latentpreviewrate'] = app.ui.settings.getSettingValue("ARS_PreviewSaver.LatentPreviewRate")
+            res.workflow.extra['ARS_PreviewSaver_frameformat'] = app.ui.settings.getSettingValue("ARS_PreviewSaver.FrameFormat")
+            res.workflow.extra['ARS_PreviewSaver_framequality'] = app.ui.settings.getSettingValue("ARS_PreviewSaver.FrameQuality")
+            res.workflow.extra['ARS_PreviewSaver_layercompression'] = app.ui.settings.getSettingValue("ARS_PreviewSaver.LayerCompression")
+            res.workflow.extra['ARS_PreviewSaver_stepdelta'] = app.ui.settings.getSettingValue("ARS_PreviewSaver.StepDelta")
             return res
         }
         app.graphToPrompt = graphToPrompt
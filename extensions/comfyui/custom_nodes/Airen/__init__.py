@@ -7,8 +7,9 @@ import folder_paths
 from PIL import Image
 import numpy as np
 import torch
-import hashlib
 from .convert_layer import save_images_as_layers
+from .layer_store import append_layer, COMPRESSIONS, LAYER_STORE
+from .ars_modules import pass_buffer, tiff_layers
 
 
 class Airen_Str:
@@ -119,6 +120,18 @@ class Airen_Lora:
     def execute(self, ud_name, lora_name):
         return (lora_name,)
 
+# Next file number per output folder, kept in memory instead of listing the folder per image
+_file_numbers = {}
+
+
+def next_file_number(folder):
+    number = _file_numbers.get(folder)
+    if number is None:
+        number = len(os.listdir(folder))
+    _file_numbers[folder] = number + 1
+    return number
+
+
 class Airen_SaveImage:
     @classmethod
     def INPUT_TYPES(cls):
@@ -128,6 +141,10 @@ class Airen_SaveImage:
                 "images": ("IMAGE", ),
                 "category": (["keyframes", "3d", "bg", "dome", "mesh", "sprite", "steps", "texture"], ),
                 "save_layers": ("BOOLEAN", {"default": True}),
+            },
+            "optional": {
+                "layer_compression": (list(COMPRESSIONS), {"default": "lzw"}),
+                "step_delta": ("BOOLEAN", {"default": False}),
             }
         }
 
@@ -136,7 +153,7 @@ class Airen_SaveImage:
     OUTPUT_NODE = True
     CATEGORY = "Airen_Studio/Image Processing"
 
-    def save_images(self, ud_name, images, category, save_layers):
+    def save_images(self, ud_name, images, category, save_layers, layer_compression="lzw", step_delta=False):
         if category in ["keyframes", "3d", "bg", "dome", "sprite", "steps", "texture"]:
             output_dir = folder_paths.get_output_directory()
             filename_prefix = f"{category}/0"
@@ -147,7 +164,7 @@ class Airen_SaveImage:
             for image in images:
                 i = 255. * image.cpu().numpy()
                 img = Image.fromarray(np.clip(i, 0, 255).astype(np.uint8))
-                file = f"{filename}{len(os.listdir(full_output_folder)):03d}.png"
+                file = f"{filename}{next_file_number(full_output_folder):03d}.png"
                 full_path = os.path.join(full_output_folder, file)
                 img.save(full_path, compress_level=4)
                 saved_files.append(full_path)
@@ -160,11 +177,17 @@ class Airen_SaveImage:
                     steps_folder = full_output_folder
                     
                     # Create TIFF filename based on the last saved image
-                    tiff_filename = f"{filename}{len(os.listdir(full_output_folder)):03d}.tiff"
+                    tiff_filename = f"{filename}{next_file_number(full_output_folder):03d}.tiff"
                     tiff_path = os.path.join(full_output_folder, tiff_filename)
                     
-                    # Call convert_layer to save all steps as layers
-                    save_images_as_layers(last_image_path, steps_folder, tiff_path)
+                    layer_store = os.path.join(steps_folder, LAYER_STORE)
+                    if os.path.exists(layer_store):
+                        # Steps were appended as they arrived; only the final image goes on top
+                        append_layer(layer_store, img, layer_compression)
+                        os.replace(layer_store, tiff_path)
+                    else:
+                        # Call convert_layer to save all steps as layers
+                        save_images_as_layers(last_image_path, steps_folder, tiff_path, layer_compression, step_delta)
                     
                     # Add the TIFF to results
                     results.append({"filename": tiff_filename, "subfolder": subfolder, "type": "output"})
@@ -218,24 +241,52 @@ class Airen_RenderPass:
     FUNCTION = "load_passes"
     CATEGORY = "Airen_Studio/Image Processing"
 
+    PASSES = ("render", "depth")
+
     @classmethod
     def IS_CHANGED(cls, ud_name):
+        """ The viewport bumps a generation counter in each pass buffer header,
+        so only the headers are read here (no hashing of pixel data). Legacy PNG
+        passes fall back to their modification time."""
         input_dir = folder_paths.get_input_directory()
-        render_path = os.path.join(input_dir, "render.png")
-        depth_path = os.path.join(input_dir, "depth.png")
-
-        def get_file_hash(filepath):
-            if not os.path.exists(filepath):
-                return "0"
-            hash_md5 = hashlib.md5()
-            with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-
-        render_hash = get_file_hash(render_path)
-        depth_hash = get_file_hash(depth_path)
-        return f"{render_hash}_{depth_hash}"
+        stamps = []
+        for name in cls.PASSES:
+            generation = pass_buffer.read_generation(os.path.join(input_dir, f"{name}.pass"))
+            if not generation:
+                png_path = os.path.join(input_dir, f"{name}.png")
+                generation = os.path.getmtime(png_path) if os.path.exists(png_path) else 0
+            stamps.append(str(generation))
+        return "_".join(stamps)
+
+    def load_pass_as_tensor(self, input_dir, name):
+        path = os.path.join(input_dir, f"{name}.pass")
+        data = pass_buffer.read_pass_float(path)
+        if data is None:
+            return self.load_image_as_tensor(os.path.join(input_dir, f"{name}.png"))
+        header = pass_buffer.read_header(path)
+        if header[0] != np.uint8 and header[5][1] > 0:
+            data = self.normalize_linear_depth(data, header[6])
+        tensor = torch.from_numpy(data)[None,]
+        if tensor.shape[-1] == 1:
+            tensor = tensor.expand(-1, -1, -1, 3)  # Single channel pass -> RGB view, no copy
+        return tensor[..., :3]
+
+    def normalize_linear_depth(self, distance, value_range):
+        """ Linear camera distance -> inverted 0-1 depth map (closer = lighter).
+        Uses the fixed range from the pass header when the viewport set one,
+        otherwise the min/max of the visible pixels. Background (inf) is black."""
+        valid = np.isfinite(distance)
+        lo, hi = value_range
+        if hi <= lo:
+            if not valid.any():
+                return np.zeros_like(distance)
+            lo, hi = float(distance[valid].min()), float(distance[valid].max())
+        depth = np.zeros_like(distance)
+        if hi > lo:
+            depth[valid] = 1.0 - np.clip((distance[valid] - lo) / (hi - lo), 0.0, 1.0)
+        else:
+            depth[valid] = 1.0
+        return depth
 
     def load_image_as_tensor(self, path):
         if not os.path.exists(path):
@@ -247,11 +298,73 @@ class Airen_RenderPass:
     def load_passes(self, ud_name):
         input_dir = folder_paths.get_input_directory()
 
-        render_tensor = self.load_image_as_tensor(os.path.join(input_dir, "render.png"))
-        depth_tensor = self.load_image_as_tensor(os.path.join(input_dir, "depth.png"))
+        render_tensor = self.load_pass_as_tensor(input_dir, "render")
+        depth_tensor = self.load_pass_as_tensor(input_dir, "depth")
         return (render_tensor, depth_tensor)
 
 
+class Airen_GBufferPass:
+    """ Normals, segmentation, per-object masks and UVs of the viewport render.
+    Not in the shipped workflows (they need extra ControlNet models). To use it,
+    add this node to a workflow in extensions/comfyui/workflow, e.g. render.json,
+    and connect its outputs (normal -> a normal ControlNet, masks -> regional
+    prompts). The app exports gbuffer.pass before queueing any workflow that
+    contains the node (RenderDataManager.uses_node)."""
+
+    DESCRIPTION = ("G-buffer of the ARS viewport: normal, segmentation, object masks, UV. "
+                   "The viewport only writes it for workflows that contain this node.")
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "ud_name": ("STRING", {"default": "", "multiline": False}),
+            }
+        }
+
+    RETURN_TYPES = ("IMAGE", "IMAGE", "MASK", "IMAGE")  # Normal, Segmentation, Object masks, UV
+    RETURN_NAMES = ("normal", "segmentation", "masks", "uv")
+    FUNCTION = "load_gbuffer"
+    CATEGORY = "Airen_Studio/Image Processing"
+
+    @classmethod
+    def IS_CHANGED(cls, ud_name):
+        return str(pass_buffer.read_generation(os.path.join(folder_paths.get_input_directory(), "gbuffer.pass")))
+
+    def segmentation_colors(self, count):
+        # Fixed pseudo random palette, so an object keeps its color between renders
+        rng = np.random.default_rng(12345)
+        return rng.uniform(0.2, 1.0, size=(count, 3)).astype(np.float32)
+
+    def load_gbuffer(self, ud_name):
+        """ The viewport writes normals xyz, uv and the object index into one
+        6 channel buffer (ars_cmds/render_cmds/render_pass.py save_gbuffer)."""
+        data = pass_buffer.read_pass_float(os.path.join(folder_paths.get_input_directory(), "gbuffer.pass"))
+        if data is None or data.shape[-1] != 6:
+            empty = torch.zeros((1, 64, 64, 3), dtype=torch.float32)
+            return (empty, empty, torch.zeros((1, 64, 64), dtype=torch.float32), empty)
+
+        ids = np.rint(data[..., 5]).astype(np.int64)
+        background = ids < 0
+
+        normal = data[..., :3] * 0.5 + 0.5
+        normal[background] = (0.5, 0.5, 1.0)  # Flat, facing the camera
+
+        indices = np.unique(ids[~background])
+        segmentation = np.zeros(ids.shape + (3,), dtype=np.float32)
+        if len(indices):
+            segmentation[~background] = self.segmentation_colors(int(indices.max()) + 1)[ids[~background]]
+            masks = (ids[None] == indices[:, None, None]).astype(np.float32)
+        else:
+            masks = np.zeros((1,) + ids.shape, dtype=np.float32)
+
+        uv = np.zeros(ids.shape + (3,), dtype=np.float32)
+        uv[..., :2] = data[..., 3:5]
+
+        return (torch.from_numpy(normal)[None,], torch.from_numpy(segmentation)[None,],
+                torch.from_numpy(masks), torch.from_numpy(uv)[None,])
+
+
 class Airen_LoadKeyframe:
     @classmethod
     def INPUT_TYPES(cls):
@@ -283,15 +396,12 @@ class Airen_LoadKeyframe:
             # Return empty black image if not found
             return (torch.zeros((1, 64, 64, 3), dtype=torch.float32),)
             
-        img = Image.open(image_path)
-        
-        # Get the latest layer (last frame of TIFF)
+        # Get the latest layer (last frame of TIFF), straight from the layer index
         try:
-            if hasattr(img, 'n_frames') and img.n_frames > 1:
-                img.seek(img.n_frames - 1)
+            img = tiff_layers.read_layer(image_path, -1)
         except Exception as e:
             print(f"Error seeking TIFF frame: {e}")
-            pass
+            img = Image.open(image_path)
             
         img = img.convert("RGB")
         image_tensor = torch.from_numpy(np.array(img).astype(np.float32) / 255.0)[None,]
@@ -309,5 +419,6 @@ NODE_CLASS_MAPPINGS = {
     "Airen_SaveImage": Airen_SaveImage,
     "Airen_Progress_Reader": Airen_Progress_Reader,
     "Airen_RenderPass": Airen_RenderPass,
+    "Airen_GBufferPass": Airen_GBufferPass,
     "Airen_LoadKeyframe": Airen_LoadKeyframe,
 }
@@ -0,0 +1,22 @@
+import importlib.util
+import os
+import sys
+
+# Airen Studio modules the nodes share with the app (same files on disk, same formats).
+# Custom node packages can't import the app's packages, so they are loaded by path
+# from the Airen Studio tree this folder lives in; there is one copy of each.
+ARS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+
+
+def _load(name, *parts):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ARS_ROOT, *parts))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # one LRU / index cache for every node that uses it
+    spec.loader.exec_module(module)
+    return module
+
+
+tiff_layers = _load("ars_tiff_layers", "core", "tiff_layers.py")
+pass_buffer = _load("ars_pass_buffer", "ars_cmds", "render_cmds", "pass_buffer.py")
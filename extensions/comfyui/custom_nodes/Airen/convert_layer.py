@@ -1,56 +1,54 @@
-from PIL import Image, ImageSequence
+from PIL import Image
 from pathlib import Path
+from .layer_store import DELTA_KEY_INTERVAL, LATEST_STEP, append_layer
+from .ars_modules import tiff_layers
 
-def save_images_as_layers(base_image_path, steps_folder, output_path="image.tiff"):
+
+def save_images_as_layers(base_image_path, steps_folder, output_path="image.tiff", compression="lzw", delta=False):
     """
     Saves all images in `steps_folder` + base image (on top) into one TIFF file with layers (frames).
-    Layer 0 = first step, last layer = final image (base).
+    Layer 0 = first step, last layer = final image (base, always stored in full).
+    Layers are appended one at a time, so only one image is held in memory
+    (two with `delta`, which stores steps as differences to the step below).
     """
-    base = Image.open(base_image_path).convert("RGBA")
     base_path = Path(base_image_path)
     steps = sorted(Path(steps_folder).glob("*.*"))
-    layers = []
+    new = True
+    previous = None
+    count = 0
 
     for step in steps:
         # Skip the base image itself to avoid duplication
-        if step.resolve() == base_path.resolve():
+        if step.resolve() == base_path.resolve() or step.name == LATEST_STEP:
             continue
         # Skip non-image files (like .tiff outputs)
         if step.suffix.lower() not in ['.png', '.jpg', '.jpeg', '.bmp']:
             continue
         try:
-            img = Image.open(step).convert("RGBA")
-            layers.append(img)
+            with Image.open(step) as img:
+                key = not delta or count % DELTA_KEY_INTERVAL == 0
+                previous = append_layer(output_path, img, compression, new, None if key else previous)
+            new = False
+            count += 1
         except Exception as e:
             print(f"Skipping {step}: {e}")
     
     # Add base image as the last layer (top layer)
-    layers.append(base)
-
-    # Save as multi-layer TIFF
-    if layers:
-        layers[0].save(
-            output_path,
-            save_all=True,
-            append_images=layers[1:],
-            compression="tiff_deflate"
-        )
-        print(f"✅ Saved {len(layers)} layers to {output_path}")
-    else:
-        print("⚠️ No layers to save")
+    with Image.open(base_image_path) as base:
+        append_layer(output_path, base, compression, new)
+    print(f"✅ Saved layers to {output_path}")
 
 def extract_layers(tiff_path, output_folder="extracted_layers"):
     """
     Extracts each layer from a multi-layer TIFF and saves as separate PNGs.
     Layers are named 0, 1, 2, ...
     """
-    im = Image.open(tiff_path)
     outdir = Path(output_folder)
     outdir.mkdir(exist_ok=True)
 
-    for i, page in enumerate(ImageSequence.Iterator(im)):
+    for i in range(tiff_layers.layer_count(tiff_path)):
         out_path = outdir / f"{i}.png"
-        page.save(out_path)
+        tiff_layers.read_layer(tiff_path, i).save(out_path)  # delta layers come out rebuilt
         print(f"🖼️ Extracted layer {i} -> {out_path}")
 
 """
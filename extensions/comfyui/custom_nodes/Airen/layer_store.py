@@ -0,0 +1,55 @@
+import io
+import os
+from PIL import Image, ImageChops, TiffImagePlugin
+
+# Writing side of the step history, shared by Airen_SaveImage and the ARS Preview
+# Saver (which loads this file by path, so it imports nothing from the package).
+
+# Layer compression choices for the step history; LZW and zstd write and read
+# much faster than deflate, "none" fastest of all at the largest size.
+COMPRESSIONS = {"none": None, "lzw": "tiff_lzw", "zstd": "zstd", "deflate": "tiff_deflate"}
+# Layer store the ARS Preview Saver appends sampling steps to, in the steps folder.
+LAYER_STORE = ".layers.tiff"
+# Newest step as a plain image next to it, overwritten every step, for viewers
+# that poll the steps folder (the Cinema 4D plugin). Not a layer of the history.
+LATEST_STEP = "latest.jpeg"
+# With delta layers every DELTA_KEY_INTERVAL-th step is still stored in full,
+# so reading any step rebuilds at most this many pages.
+DELTA_KEY_INTERVAL = 8
+# Must match DELTA_TAG in core/tiff_layers.py
+DELTA_TAG = "ars:delta"
+
+_supported = {}
+
+
+def compression_for(name):
+    """PIL compression for a choice, falling back to LZW where libtiff lacks the codec."""
+    compression = COMPRESSIONS.get(name, "tiff_lzw")
+    if compression not in _supported:
+        try:
+            Image.new("RGB", (1, 1)).save(io.BytesIO(), format="TIFF", compression=compression)
+            _supported[compression] = True
+        except Exception:
+            _supported[compression] = False
+            print(f"⚠️ Layer compression '{name}' is not supported by this libtiff, using LZW")
+    return compression if _supported[compression] else "tiff_lzw"
+
+
+def append_layer(tiff_path, image, compression="lzw", new=False, previous=None):
+    """
+    Appends `image` as the new top layer of a multi-layer TIFF (created if missing, or if `new`).
+    Earlier layers are neither read nor rewritten, only their headers are skipped.
+    With `previous` (the layer below, same size) the layer is stored as a delta to it.
+    Returns the appended image as RGBA, to pass as `previous` next time.
+    """
+    image = image.convert("RGBA")
+    if new and os.path.exists(tiff_path):
+        os.remove(tiff_path)  # never truncate in place: the old file may be hard-linked as a keyframe
+    mode = "r+b" if os.path.exists(tiff_path) else "w+b"
+    layer, info = image, {}
+    if previous is not None and previous.size == image.size:
+        layer, info = ImageChops.subtract_modulo(image, previous.convert("RGBA")), {270: DELTA_TAG}
+    with open(tiff_path, mode) as f, TiffImagePlugin.AppendingTiffWriter(f) as tf:
+        layer.save(tf, format="TIFF", compression=compression_for(compression), tiffinfo=info)
+        tf.newFrame()
+    return image
@@ -11,7 +11,6 @@ from core.cursor_modifier import set_default_cursor
 from ui.main_window import MainWindow
 
 import pygame
-pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)  # Standard settings for short sounds
 
 class Application:
 
@@ -29,6 +28,8 @@ class Application:
         sys.exit(self._app.exec())
 
 def main() -> None:
+    # Here rather than at import: mesh import workers re-import this module when they spawn
+    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)  # Standard settings for short sounds
     app = Application()
     app.run()
     set_default_cursor("cursor")
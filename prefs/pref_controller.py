@@ -94,7 +94,7 @@ def get_path(key = "image"):
 
     last_step_path = ""
     if os.path.exists(opj(output,"steps")):
-        files = [f for f in os.listdir(opj(output,"steps"))]
+        files = [f for f in os.listdir(opj(output,"steps")) if not f.startswith('.')]  # hidden: layer store and indices
         if files:
             full_paths = [opj(opj(output,"steps"), f) for f in files]
             last_step_path = max(full_paths, key=os.path.getmtime)
@@ -103,6 +103,7 @@ def get_path(key = "image"):
 
     if key == "input":            res = opj(cui,"input")
     if key == "mesh":             res = opj(output,"mesh")
+    if key == "mesh_cache":       res = opj(output,"mesh_cache")
     if key == "steps":            res = opj(output,"steps")
     if key == "frames":           res = opj(output,"frames")
     if key == "video_frames":     res = opj(output,"video_frames")
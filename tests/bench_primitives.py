@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ars_3d_engine.mesh_objects.obj_primitive import CPrimitive
+
+# NumPy generators vs the PyVista/VTK path, uncached, across LOD 4-256.
+# Run from anywhere: python tests/bench_primitives.py
+
+TYPES = ['sphere', 'cube', 'plane', 'cylinder', 'cone', 'pyramid', 'disc', 'torus']
+LODS = [4, 8, 16, 32, 64, 128, 256]
+
+
+def best_of(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best * 1000.0
+
+
+def main():
+    t = time.perf_counter()
+    import pyvista  # noqa: F401
+    print(f"pyvista import: {(time.perf_counter() - t) * 1000.0:.0f} ms\n")
+
+    print(f"{'type':<10}{'lod':>5}{'numpy ms':>11}{'pyvista ms':>12}{'speedup':>9}{'faces np/pv':>16}")
+    for ptype in TYPES:
+        for lod in LODS:
+            params = {'lod': lod, 'radius_inner': 0.3 if ptype in ('cylinder', 'torus') else 0.0}
+            np_ms = best_of(lambda: CPrimitive._build_mesh(ptype, **params))
+            pv_ms = best_of(lambda: CPrimitive._build_mesh_pyvista(ptype, **params))
+            n_np = CPrimitive._build_mesh(ptype, **params).n_faces
+            n_pv = CPrimitive._build_mesh_pyvista(ptype, **params).n_faces
+            print(f"{ptype:<10}{lod:>5}{np_ms:>11.2f}{pv_ms:>12.2f}{pv_ms / np_ms:>8.1f}x{f'{n_np}/{n_pv}':>16}")
+
+
+if __name__ == '__main__':
+    main()
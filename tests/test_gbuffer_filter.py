@@ -0,0 +1,32 @@
+"""G-buffer normals follow the normal matrix, not the model matrix."""
+
+import numpy as np
+from vispy.visuals.transforms import ChainTransform, MatrixTransform
+
+from ars_3d_engine.logic.gbuffer_filter import normal_matrix
+
+
+def test_normal_matrix_is_inverse_transpose_under_non_uniform_scale():
+    scale = MatrixTransform()
+    scale.scale((2.0, 1.0, 1.0))
+    move = MatrixTransform()
+    move.rotate(30, (0, 0, 1))
+    move.translate((5.0, -3.0, 1.0))
+    transform = ChainTransform([move, scale])
+
+    # Surface of a 45 degree slope in the xy plane
+    normal = np.array([1.0, 1.0, 0.0]) / np.sqrt(2.0)
+    tangent = np.array([1.0, -1.0, 0.0])
+
+    points = transform.map(np.array([[0.0, 0.0, 0.0], tangent]))
+    tangent_scene = points[1, :3] / points[1, 3] - points[0, :3] / points[0, 3]
+    normal_scene = normal_matrix(transform) @ normal
+
+    assert abs(np.dot(normal_scene, tangent_scene)) < 1e-6
+
+
+def test_normal_matrix_keeps_rotations():
+    rotate = MatrixTransform()
+    rotate.rotate(90, (0, 0, 1))
+    rotate.translate((1.0, 2.0, 3.0))
+    np.testing.assert_allclose(normal_matrix(rotate) @ [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], atol=1e-6)
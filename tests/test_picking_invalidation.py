@@ -0,0 +1,77 @@
+"""The cached ID buffer survives redraws but not geometry, transform or visibility changes."""
+
+import numpy as np
+from types import SimpleNamespace
+from vispy import scene
+from vispy.geometry import create_sphere
+from vispy.scene import transforms
+from vispy.scene.subscene import SubScene
+
+from ars_3d_engine.logic.picking_manager import CPickingManager
+from ars_3d_engine.mesh_objects.shared_mesh import SharedMesh
+
+
+def _picking_with_mesh():
+    # Same layout as CGeometry: a translation node with the mesh below it
+    node = scene.Node(parent=SubScene())
+    node.transform = transforms.MatrixTransform()
+    visual = SharedMesh(meshdata=create_sphere(4, 4), parent=node)
+    visual.transform = transforms.MatrixTransform()
+    picking = CPickingManager(canvas=None)
+    obj = SimpleNamespace(visual=node)
+    picking.register_object(obj)
+    picking._id_buffer = np.zeros((2, 2), dtype=np.int64)  # as if rendered
+    return picking, visual, obj
+
+
+def test_unregistered_object_is_not_watched():
+    picking, visual, obj = _picking_with_mesh()
+    picking.unregister_object(obj)
+    picking._id_buffer = np.zeros((2, 2), dtype=np.int64)
+    visual.transform.translate((1.0, 0.0, 0.0))
+    visual.visible = False
+    assert picking._id_buffer is not None
+
+
+def test_redraw_keeps_buffer():
+    picking, visual, _ = _picking_with_mesh()
+    visual.update()  # e.g. a texture preview upload
+    assert picking._id_buffer is not None
+
+
+def test_transform_change_invalidates():
+    picking, visual, _ = _picking_with_mesh()
+    visual.transform.matrix = np.diag([2.0, 1.0, 1.0, 1.0])
+    assert picking._id_buffer is None
+
+
+def test_parent_transform_change_invalidates():
+    picking, visual, _ = _picking_with_mesh()
+    visual.parent.transform.translate((1.0, 0.0, 0.0))
+    assert picking._id_buffer is None
+
+
+def test_visibility_change_invalidates():
+    picking, visual, _ = _picking_with_mesh()
+    visual.visible = False
+    assert picking._id_buffer is None
+
+
+def test_mesh_data_change_invalidates():
+    picking, visual, _ = _picking_with_mesh()
+    visual.set_data(meshdata=create_sphere(6, 6))
+    visual._update_data()  # runs on the next draw
+    assert picking._id_buffer is None
+
+
+def test_replaced_transform_is_watched():
+    picking, visual, _ = _picking_with_mesh()
+    old = visual.transform
+    visual.transform = transforms.MatrixTransform()
+    assert picking._id_buffer is None
+
+    picking._id_buffer = np.zeros((2, 2), dtype=np.int64)
+    old.translate((1.0, 0.0, 0.0))  # no longer shown
+    assert picking._id_buffer is not None
+    visual.transform.translate((1.0, 0.0, 0.0))
+    assert picking._id_buffer is None
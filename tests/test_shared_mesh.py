@@ -0,0 +1,24 @@
+"""Geometry swaps on a share group reach every member's filters."""
+
+import numpy as np
+from vispy.geometry import create_sphere
+from vispy.visuals.filters import ShadingFilter
+
+from ars_3d_engine.mesh_objects.shared_mesh import SharedMesh
+
+
+def test_set_shared_data_rebuilds_filters_of_every_member():
+    leader = SharedMesh(meshdata=create_sphere(8, 8))
+    clone = SharedMesh()
+    clone.share_geometry(leader)
+    filters = [ShadingFilter(), ShadingFilter()]
+    leader.attach(filters[0])
+    clone.attach(filters[1])
+
+    lower = create_sphere(4, 4)
+    leader.set_shared_data(lower)
+
+    vertex_count = lower.n_faces * 3
+    assert clone.is_shared and clone.mesh_data is lower
+    for flt in filters:
+        assert flt._normals.size == vertex_count
@@ -0,0 +1,48 @@
+"""set_texture_data writes a same-sized image into the existing GPU texture."""
+
+import numpy as np
+from vispy.geometry import MeshData
+
+from ars_3d_engine.mesh_objects.scene_objects import CGeometry
+from ars_3d_engine.mesh_objects.shared_mesh import SharedMesh
+
+
+def _textured_quad():
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32)
+    faces = np.array([[0, 1, 2], [0, 2, 3]], dtype=np.uint32)
+    meshdata = MeshData(vertices=vertices, faces=faces)
+    meshdata._vertex_tex_coords = vertices[:, :2].copy()
+    return CGeometry(SharedMesh(meshdata=meshdata))
+
+
+def test_same_size_image_is_uploaded_in_place():
+    obj = _textured_quad()
+    first = np.zeros((4, 4, 4), dtype=np.uint8)
+    assert obj.set_texture_data(first)
+    flt = obj.texture_filter
+    texture = flt.fshader['u_texture'].value
+
+    for value in (128, 255):  # twice through the in-place branch
+        assert obj.set_texture_data(np.full((4, 4, 4), value, dtype=np.uint8))
+        assert obj.texture_filter is flt
+        assert flt.fshader['u_texture'].value is texture
+
+
+def test_other_size_image_gets_a_new_texture():
+    obj = _textured_quad()
+    assert obj.set_texture_data(np.zeros((4, 4, 4), dtype=np.uint8))
+    flt = obj.texture_filter
+    assert obj.set_texture_data(np.zeros((8, 8, 4), dtype=np.uint8))
+    assert obj.texture_filter is not flt
+
+
+def test_clone_draws_from_the_same_texture():
+    obj = _textured_quad()
+    assert obj.set_texture_data(np.zeros((4, 4, 4), dtype=np.uint8))
+    clone = _textured_quad()
+    clone.share_texture(obj)
+    assert clone.texture_filter.fshader['u_texture'].value is obj.texture_filter.fshader['u_texture'].value
+
+    # The shared texture is never written into through the clone
+    assert clone.set_texture_data(np.full((4, 4, 4), 255, dtype=np.uint8))
+    assert clone.texture_filter.fshader['u_texture'].value is not obj.texture_filter.fshader['u_texture'].value
@@ -5,7 +5,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QPixmap, QWheelEvent, QMouseEvent, QPen, QColor, QPainter, QBrush, QImage
 from PyQt6.QtCore import Qt, QRectF, QPointF
-from PIL import Image, ImageSequence
+from core.tiff_layers import layer_count, read_layer
 
 class ImageViewer(QGraphicsView):
     def __init__(self, scene, parent=None):
@@ -120,6 +120,7 @@ class ImageViewerWidget(QWidget):
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
         self.layout.addWidget(self.view)
+        self.item = None  # pixmap item shown, reused by show_frame
 
     def fit_image(self):
         self.view.fitInView(self.view.image_rect, Qt.AspectRatioMode.KeepAspectRatio)
@@ -133,10 +134,8 @@ class ImageViewerWidget(QWidget):
             # Check if it's a multi-layer image (TIFF)
             if file_path.lower().endswith(('.tif', '.tiff')):
                 try:
-                    pil_image = Image.open(file_path)
-                    
-                    # Count total frames/layers
-                    n_frames = getattr(pil_image, 'n_frames', 1)
+                    # Count total frames/layers (from the layer index, no page walk)
+                    n_frames = layer_count(file_path)
                     
                     # Handle layer index
                     layer_index = layer
@@ -145,11 +144,8 @@ class ImageViewerWidget(QWidget):
                     elif layer_index >= n_frames:
                         layer_index = 0  # Default to first if out of range
                     
-                    # Seek to the correct frame
-                    pil_image.seek(layer_index)
-                    
-                    # Copy the current frame to avoid reference issues
-                    selected_layer = pil_image.copy()
+                    # Decoded through the index, cached
+                    selected_layer = read_layer(file_path, layer_index)
                     
                     # Convert PIL image to QPixmap
                     if selected_layer.mode == "RGBA":
@@ -171,19 +167,34 @@ class ImageViewerWidget(QWidget):
                 # Regular image loading
                 pixmap = QPixmap(file_path)
             
-            if pixmap is None or pixmap.isNull():
-                return
-            
-            self.scene.clear()
-            item = QGraphicsPixmapItem(pixmap)
-            item.setPos(-pixmap.width() / 2, -pixmap.height() / 2)
-            self.scene.addItem(item)
-            padding = 500.0
-            self.scene.setSceneRect(-padding - pixmap.width() / 2, -padding - pixmap.height() / 2, pixmap.width() + 2 * padding, pixmap.height() + 2 * padding)
-            self.view.image_rect = item.sceneBoundingRect()
-            if auto_fit:
-                self.view.fitInView(self.view.image_rect, Qt.AspectRatioMode.KeepAspectRatio)
-            self.view._user_interacted = False  # Reset flag on new load
+            self.show_pixmap(pixmap, auto_fit)
+
+    def show_pixmap(self, pixmap, auto_fit=True):
+        """Display an already decoded pixmap (e.g. an in-memory render preview)."""
+        if pixmap is None or pixmap.isNull():
+            return
+
+        self.scene.clear()
+        item = self.item = QGraphicsPixmapItem(pixmap)
+        item.setPos(-pixmap.width() / 2, -pixmap.height() / 2)
+        self.scene.addItem(item)
+        padding = 500.0
+        self.scene.setSceneRect(-padding - pixmap.width() / 2, -padding - pixmap.height() / 2, pixmap.width() + 2 * padding, pixmap.height() + 2 * padding)
+        self.view.image_rect = item.sceneBoundingRect()
+        if auto_fit:
+            self.view.fitInView(self.view.image_rect, Qt.AspectRatioMode.KeepAspectRatio)
+        self.view._user_interacted = False  # Reset flag on new load
+
+    def show_frame(self, image, auto_fit=False):
+        """Playback: swap the shown pixmap for a frame (QImage) of the same size in place,
+        without rebuilding the scene or touching the view."""
+        if image is None or image.isNull():
+            return
+        pixmap = QPixmap.fromImage(image)
+        if auto_fit or self.item is None or self.item.pixmap().size() != pixmap.size():
+            self.show_pixmap(pixmap, auto_fit)
+            return
+        self.item.setPixmap(pixmap)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
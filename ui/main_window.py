@@ -8,6 +8,7 @@ from ars_cmds.core_cmds.distribute_bubbles import distribute_bubbles
 from ars_cmds.core_cmds.drag_and_drop import dd_drag, dd_drop
 from core.cursor_modifier import set_default_cursor
 from core.render_data import RenderDataManager
+from core.comfy_socket import comfy_socket
 from core.sound_manager import play_sound
 from hotkeys.hotkey_manager import HotkeyManager
 from ui.widgets.bubble_layout import FloatingBubblesManager
@@ -82,6 +83,7 @@ class MainWindow(QMainWindow):
         self.render_manager = RenderDataManager(
             default_workflow_path=os.path.join("extensions","comfyui","workflow", "render.json")
         )
+        comfy_socket()  # Connect the progress/preview channel early so no step of the first render is missed
 
         # Cursor follower
         self.CF = CursorFollowerWidget(self.central_widget)
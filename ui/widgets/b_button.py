@@ -74,6 +74,8 @@ class SliderHandle(QGraphicsRectItem):
 
             if event.button() != Qt.MouseButton.LeftButton:
                 self.parent_button._trigger_callback()
+            elif self._drag_button == Qt.MouseButton.LeftButton:
+                self.parent_button._trigger_release()
 
             self._is_dragging = False
             self._drag_button = None
@@ -144,6 +146,7 @@ class BButtonConfig:
     callbackM: Optional[Callable] = None
     callback_hover_in: Optional[Callable] = None
     callback_hover_out: Optional[Callable] = None
+    callback_release: Optional[Callable] = None
     additional_text: Optional[str] = None
     hotkey_text: Optional[str] = None
     use_extended_shape: bool = False
@@ -678,6 +681,8 @@ class BButton(QGraphicsObject):
         if not self.editable:
             return
         if self._is_dragging:
+            if self._drag_button == Qt.MouseButton.LeftButton:
+                self._trigger_release()
             self._is_dragging = False
             self._drag_button = None
             
@@ -741,6 +746,11 @@ class BButton(QGraphicsObject):
         
         self.update()    # Update visuals and trigger related logic
 
+    def _trigger_release(self):
+        """Slider let go: hand the final value to callback_release (full quality updates)."""
+        if self.config.callback_release and self._slider_value is not None:
+            self.config.callback_release(self._slider_value)
+
     def _trigger_callback(self):
         """Helper method to trigger the appropriate callback based on drag button."""
         if self._drag_button == Qt.MouseButton.LeftButton and self.callbackL:
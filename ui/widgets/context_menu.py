@@ -47,6 +47,7 @@ class ContextMenuConfig:
         self.callbackM = {}
         self.callback_hover_in = {}
         self.callback_hover_out = {}
+        self.callback_release = {}  # slider items: called once with the final value on release
         self.callback_on_close = None
         self.symbol_colors = {}
         self.color = {}
@@ -164,6 +165,7 @@ class ContextButtonWindow(QWidget):
                         "callbackM": config.callbackM.get(action),
                         "callback_hover_in": config.callback_hover_in.get(action),
                         "callback_hover_out": config.callback_hover_out.get(action),
+                        "callback_release": config.callback_release.get(action),
                         "use_extended_shape": config.use_extended_shape_items.get(action, config.use_extended_shape),
                         "auto_close": config.auto_close,
                         "slider_values": config.slider_values.get(action),
@@ -72,6 +72,7 @@ class ObjectHierarchyWindow(QWidget):
         # Connect signals
         self.manager.object_added.connect(self.on_object_added)
         self.manager.object_removed.connect(self.on_object_removed)
+        self.manager.objects_changed.connect(self.on_objects_changed)
         self.manager.active_changed.connect(self.on_active_changed)
         self.tree.itemSelectionChanged.connect(self.on_tree_selection_changed)
         self.tree.itemChanged.connect(self.on_item_renamed)
@@ -126,6 +127,19 @@ class ObjectHierarchyWindow(QWidget):
         
         self.add_tree_item(top_level_index, obj, uid)
 
+    def on_objects_changed(self, added, removed):
+        # A batch from CObjectManager.transaction(): apply it with tree repaints suspended
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for obj in removed:
+                self.on_object_removed(-1, obj)
+            position = {id(o): i for i, o in enumerate(self.manager._objects)}
+            for obj in added:
+                if id(obj) in position:
+                    self.on_object_added(position[id(obj)], obj)
+        finally:
+            self.tree.setUpdatesEnabled(True)
+
     def find_item_by_uid(self, uid):
         def search(parent_item=None):
             if parent_item is None:
@@ -224,4 +238,4 @@ class ObjectHierarchyWindow(QWidget):
             collect_objs(self.tree.topLevelItem(i), all_objs)
 
         self.manager._objects = all_objs
-        self.manager._rebuild_picking()
\ No newline at end of file
+        self.manager.order_changed()
\ No newline at end of file
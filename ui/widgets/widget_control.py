@@ -304,6 +304,12 @@ def set_updated_config(widget, key: str, value):
             widget.update()
 
 
+        elif key == "pixmap":
+            # In-memory image (e.g. a render preview); no file behind it
+            widget.pixmap = value if value is not None and not value.isNull() else None
+            widget.update()
+
+
         elif key == "toggle_values":
             if value is True:
                 widget.toggle_values = (0, 1, 1)